@@ -0,0 +1,48 @@
+"""Benchmark the time to drain many kernels against the bulk concurrency setting.
+
+For each concurrency value, start the kernels, then time
+AsyncMultiKernelManager.shutdown_kernels on all of them::
+
+    python benchmarks/bulk_drain.py --kernels 100 --concurrency 1 4 16 64 0
+
+A concurrency of 0 means no limit.
+"""
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import argparse
+import asyncio
+import time
+
+from jupyter_client.multikernelmanager import AsyncMultiKernelManager
+
+
+async def drain(kernels: int, concurrency: int, now: bool) -> tuple[float, float]:
+    """Start and then shut down kernels, returning the time taken by each step."""
+    km = AsyncMultiKernelManager()
+    start = time.perf_counter()
+    kernel_ids = await km.start_kernels([{}] * kernels, concurrency=concurrency)
+    started = time.perf_counter()
+    failed = [kid for kid in kernel_ids if isinstance(kid, Exception)]
+    if failed:
+        raise failed[0]
+    await km.shutdown_kernels(kernel_ids, now=now, concurrency=concurrency)
+    return started - start, time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--kernels", type=int, default=50, help="number of kernels")
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 4, 16, 0], help="values to compare"
+    )
+    parser.add_argument("--now", action="store_true", help="kill kernels instead of asking")
+    args = parser.parse_args()
+
+    print(f"{'concurrency':>11}  {'start (s)':>9}  {'drain (s)':>9}")
+    for concurrency in args.concurrency:
+        start_time, drain_time = await drain(args.kernels, concurrency, args.now)
+        print(f"{concurrency or 'unlimited':>11}  {start_time:9.2f}  {drain_time:9.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
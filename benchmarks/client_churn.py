@@ -0,0 +1,80 @@
+"""Benchmark short-lived clients of a MultiKernelManager kernel.
+
+Each client makes one kernel_info request on a shell socket, with an iopub
+socket connected meanwhile, as a client per websocket connection would::
+
+    python benchmarks/client_churn.py --clients 1000
+
+"client" creates a BlockingKernelClient with its own zmq context per client,
+"connect" connects new sockets with connect_shell and connect_iopub and
+"pool" leases pooled sockets with lease_socket.
+"""
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import argparse
+import time
+
+from jupyter_client.blocking import BlockingKernelClient
+from jupyter_client.multikernelmanager import MultiKernelManager
+
+
+def kernel_info(session, sock) -> None:
+    session.send(sock, "kernel_info_request")
+    if not sock.poll(10000):
+        msg = "No kernel_info reply"
+        raise TimeoutError(msg)
+    sock.recv_multipart()
+
+
+def churn(mode: str, clients: int) -> float:
+    """Return the number of clients served per second."""
+    mkm = MultiKernelManager(
+        kernel_manager_class="jupyter_client.manager.KernelManager",
+        socket_pool_size=4 if mode == "pool" else 0,
+    )
+    kid = mkm.start_kernel()
+    km = mkm.get_kernel(kid)
+    try:
+        kc = km.client()
+        kc.start_channels()
+        kc.wait_for_ready(timeout=60)
+        kc.stop_channels()
+        start = time.perf_counter()
+        for _ in range(clients):
+            if mode == "client":
+                kc = BlockingKernelClient(**km.get_connection_info(session=True))
+                iopub = kc.connect_iopub()
+                shell = kc.connect_shell()
+                kernel_info(km.session, shell)
+                shell.close()
+                iopub.close()
+                kc.context.destroy()
+            elif mode == "connect":
+                iopub = mkm.connect_iopub(kid)
+                shell = mkm.connect_shell(kid)
+                kernel_info(km.session, shell)
+                shell.close()
+                iopub.close()
+            else:
+                with mkm.leased_socket(kid, "iopub"), mkm.leased_socket(kid, "shell") as shell:
+                    kernel_info(km.session, shell)
+        return clients / (time.perf_counter() - start)
+    finally:
+        mkm.shutdown_all(now=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=1000, help="clients per mode")
+    parser.add_argument(
+        "--modes", nargs="+", default=["client", "connect", "pool"], help="modes to compare"
+    )
+    args = parser.parse_args()
+
+    print(f"{'mode':>8}  {'clients/s':>9}")
+    for mode in args.modes:
+        print(f"{mode:>8}  {churn(mode, args.clients):9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Benchmark concurrent requests sharing one AsyncKernelClient.
+
+Sends complete requests concurrently and awaits all of their replies::
+
+    python benchmarks/concurrent_requests.py --requests 100 1000
+"""
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import argparse
+import asyncio
+import time
+
+from jupyter_client.manager import AsyncKernelManager
+
+
+async def complete(kc, requests: int) -> float:
+    """Return the number of replies received per second."""
+    start = time.perf_counter()
+    replies = await asyncio.gather(
+        *(kc.complete(f"code{i}", reply=True, timeout=60) for i in range(requests))
+    )
+    elapsed = time.perf_counter() - start
+    assert len({reply["parent_header"]["msg_id"] for reply in replies}) == requests
+    return requests / elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, nargs="+", default=[100, 1000])
+    args = parser.parse_args()
+
+    km = AsyncKernelManager()
+    await km.start_kernel()
+    kc = km.client()
+    kc.start_channels()
+    try:
+        await kc.wait_for_ready(timeout=60)
+        print(f"{'requests':>8}  {'replies/s':>9}")
+        for requests in args.requests:
+            print(f"{requests:8}  {await complete(kc, requests):9.0f}")
+    finally:
+        kc.stop_channels()
+        await km.shutdown_kernel(now=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""Benchmark IOPub fan-out to many consumers of one kernel.
+
+Runs code printing many lines and times until every consumer has received
+the kernel's idle status::
+
+    python benchmarks/iopub_fanout.py --consumers 1 10 50 --lines 2000
+
+"clients" gives each consumer an AsyncKernelClient with its own IOPub socket,
+"hub" gives each consumer a subscription from subscribe_iopub.
+"""
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import argparse
+import asyncio
+import time
+
+from jupyter_client.manager import AsyncKernelManager
+
+
+def is_idle(msg: dict, msg_id: str) -> bool:
+    return (
+        msg["msg_type"] == "status"
+        and msg["parent_header"].get("msg_id") == msg_id
+        and msg["content"]["execution_state"] == "idle"
+    )
+
+
+async def consume(get, msg_id_future: asyncio.Future) -> None:
+    msg_id = await msg_id_future
+    while not is_idle(await get(), msg_id):
+        pass
+
+
+async def fanout(km: AsyncKernelManager, mode: str, consumers: int, lines: int) -> float:
+    """Return the seconds until all consumers have received the output."""
+    kc = km.client()
+    kc.start_channels(iopub=False, stdin=False, hb=False, control=False)
+    await kc.wait_for_ready(timeout=60)
+    clients, subscriptions = [], []
+    for _ in range(consumers):
+        if mode == "clients":
+            client = km.client()
+            client.start_channels(shell=False, stdin=False, hb=False, control=False)
+            clients.append(client)
+        else:
+            subscriptions.append(km.subscribe_iopub(maxsize=0))
+    gets = [c.get_iopub_msg for c in clients] + [s.get for s in subscriptions]
+    # let slow-joining subscribers connect
+    await asyncio.sleep(1)
+    msg_id_future = asyncio.get_running_loop().create_future()
+    tasks = [asyncio.ensure_future(consume(get, msg_id_future)) for get in gets]
+    start = time.perf_counter()
+    msg_id_future.set_result(kc.execute(f"for i in range({lines}): print(i, flush=True)"))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    for client in clients:
+        client.stop_channels()
+    for subscription in subscriptions:
+        subscription.close()
+    kc.stop_channels()
+    return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--consumers", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--lines", type=int, default=2000, help="lines printed")
+    args = parser.parse_args()
+
+    km = AsyncKernelManager()
+    await km.start_kernel()
+    try:
+        print(f"{'consumers':>9}  {'clients (s)':>11}  {'hub (s)':>7}")
+        for consumers in args.consumers:
+            clients = await fanout(km, "clients", consumers, args.lines)
+            hub = await fanout(km, "hub", consumers, args.lines)
+            print(f"{consumers:9}  {clients:11.2f}  {hub:7.2f}")
+    finally:
+        await km.shutdown_kernel(now=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
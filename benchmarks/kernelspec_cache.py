@@ -0,0 +1,67 @@
+"""Benchmark kernelspec lookups with and without the kernelspec cache and index.
+
+Installs N kernelspecs in a temporary directory, then times
+get_all_specs, find_kernel_specs and get_kernel_spec::
+
+    python benchmarks/kernelspec_cache.py --kernels 200
+"""
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import argparse
+import json
+import os
+import tempfile
+import timeit
+
+from jupyter_client.kernelspec import KernelSpecManager
+
+
+def install_specs(kernels_dir: str, kernels: int) -> None:
+    """Install kernels specs named kernel-0 ... kernel-N in kernels_dir."""
+    for i in range(kernels):
+        kernel_dir = os.path.join(kernels_dir, f"kernel-{i}")
+        os.makedirs(kernel_dir)
+        with open(os.path.join(kernel_dir, "kernel.json"), "w") as f:
+            json.dump(
+                {
+                    "argv": ["python", "-m", "ipykernel_launcher", "-f", "{connection_file}"],
+                    "display_name": f"Kernel {i}",
+                    "language": "python",
+                    "env": {"KERNEL_INDEX": str(i)},
+                },
+                f,
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--kernels", type=int, default=200, help="number of kernelspecs")
+    parser.add_argument("--repeat", type=int, default=20, help="calls per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as kernels_dir:
+        install_specs(kernels_dir, args.kernels)
+        last = f"kernel-{args.kernels - 1}"
+        print(f"{'':>20}  {'uncached (ms)':>13}  {'cached (ms)':>11}  {'watched (ms)':>12}")
+        for name, call in [
+            ("get_all_specs", lambda ksm: ksm.get_all_specs()),
+            ("find_kernel_specs", lambda ksm: ksm.find_kernel_specs()),
+            ("get_kernel_spec", lambda ksm: ksm.get_kernel_spec(last)),
+        ]:
+            times = []
+            for cache, watch in [(False, False), (True, False), (True, True)]:
+                ksm = KernelSpecManager(
+                    kernel_dirs=[kernels_dir],
+                    ensure_native_kernel=False,
+                    cache_kernel_specs=cache,
+                    watch_kernel_specs=watch,
+                )
+                # fill the cache
+                call(ksm)
+                seconds = timeit.timeit(lambda: call(ksm), number=args.repeat)  # noqa: B023
+                times.append(1000 * seconds / args.repeat)
+            print(f"{name:>20}  {times[0]:13.2f}  {times[1]:11.2f}  {times[2]:12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Benchmark the per-message hot paths of Session.
+
+Times each case against the code path it replaced::
+
+    python benchmarks/session_messages.py --number 5000 --cases header_dates
+
+Wall-clock comparisons are too noisy for the test suite, so they live here.
+"""
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import argparse
+import hashlib
+import hmac
+import itertools
+import random
+import timeit
+from datetime import datetime, timezone
+from typing import Callable, Dict, Tuple
+
+import zmq
+
+from jupyter_client import jsonutil
+from jupyter_client.session import HMACSigner, Session
+
+Case = Tuple[Callable[[], object], Callable[[], object]]
+
+
+def header_dates() -> Case:
+    """extract_dates on a whole header vs extract_header_dates."""
+    header = {
+        "msg_id": "a1b2c3d4-e5f6a7b8c9d0e1f2_1234_5",
+        "msg_type": "stream",
+        "username": "user",
+        "session": "a1b2c3d4-e5f6a7b8c9d0e1f2",
+        "date": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "version": "5.3",
+    }
+    return (
+        lambda: jsonutil.extract_dates(header),
+        lambda: jsonutil.extract_header_dates(header),
+    )
+
+
+def _sign(frame_size: int) -> Case:
+    """Signing with HMAC.copy() vs HMACSigner."""
+    key = b"secret"
+    parts = [b"h" * 200, b"p" * 200, b"{}", b"c" * frame_size]
+    auth = hmac.HMAC(key, digestmod=hashlib.sha256)
+    signer = HMACSigner(key, hashlib.sha256)
+
+    def hmac_copy() -> bytes:
+        h = auth.copy()
+        for part in parts:
+            h.update(part)
+        return h.hexdigest().encode()
+
+    return hmac_copy, lambda: signer.sign(parts)
+
+
+def sign_small() -> Case:
+    """Signing a message with a 100B content frame."""
+    return _sign(100)
+
+
+def sign_large() -> Case:
+    """Signing a message with a 1MB content frame."""
+    return _sign(1_000_000)
+
+
+def digest_history() -> Case:
+    """Recording a signature with the sort-and-sample cull vs the FIFO one.
+
+    Run with --number above digest_history_size, so the history is culled.
+    """
+    old = Session(key=b"secret")
+    new = Session(key=b"secret")
+    size = old.digest_history_size
+    # distinct 64-char hex signatures, like hmac-sha256 digests
+    signatures = (b"%064x" % i for i in itertools.count())
+
+    def sample_cull() -> None:
+        history = old.digest_history
+        history.add(next(signatures))
+        if len(history) > size:
+            current = len(history)
+            n_to_cull = max(current // 10, current - size)
+            history.difference_update(random.sample(tuple(sorted(history)), n_to_cull))
+
+    return sample_cull, lambda: new._add_digest(next(signatures))
+
+
+def template() -> Case:
+    """Sending stream messages with Session.send vs a MessageTemplate."""
+    # a PUB socket without subscribers never blocks
+    pub = zmq.Context.instance().socket(zmq.PUB)
+    session = Session()
+    parent = session.msg("execute_request")
+    content = {"name": "stdout", "text": "hello\n"}
+    stream = session.message_template("stream", parent=parent)
+    return (
+        lambda: session.send(pub, "stream", content, parent=parent),
+        lambda: stream.send(pub, content),
+    )
+
+
+CASES: Dict[str, Callable[[], Case]] = {
+    "header_dates": header_dates,
+    "sign_small": sign_small,
+    "sign_large": sign_large,
+    "digest_history": digest_history,
+    "template": template,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=5000, help="calls per timing")
+    parser.add_argument("--repeat", type=int, default=3, help="timings per case (best is kept)")
+    parser.add_argument(
+        "--cases", nargs="+", default=list(CASES), choices=list(CASES), help="cases to run"
+    )
+    args = parser.parse_args()
+
+    print(f"{'case':>14}  {'before (us)':>11}  {'after (us)':>10}  {'speedup':>7}")
+    for name in args.cases:
+        before, after = CASES[name]()
+        times = [
+            min(timeit.repeat(func, number=args.number, repeat=args.repeat)) / args.number
+            for func in (before, after)
+        ]
+        print(
+            f"{name:>14}  {1e6 * times[0]:11.2f}  {1e6 * times[1]:10.2f}"
+            f"  {times[0] / times[1]:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark kernel_info round trips over the tcp and ipc transports.
+
+Starts a kernel per transport and times kernel_info requests from a
+blocking client::
+
+    python benchmarks/transport_latency.py --requests 1000 --transports tcp auto
+
+"auto" uses ipc for local kernels where available.
+"""
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import argparse
+import statistics
+import time
+
+from jupyter_client.manager import KernelManager
+
+
+def round_trips(transport: str, requests: int) -> tuple[str, list[float]]:
+    """Return the transport used and the kernel_info round trip times in seconds."""
+    km = KernelManager(transport=transport)
+    km.start_kernel()
+    kc = km.client()
+    kc.start_channels()
+    try:
+        kc.wait_for_ready(timeout=60)
+        used = km.transport
+        times = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            kc.kernel_info(reply=True, timeout=10)
+            times.append(time.perf_counter() - start)
+    finally:
+        kc.stop_channels()
+        km.shutdown_kernel(now=True)
+    return used, times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000, help="kernel_info requests")
+    parser.add_argument(
+        "--transports", nargs="+", default=["tcp", "auto"], help="transports to compare"
+    )
+    args = parser.parse_args()
+
+    print(f"{'transport':>12}  {'mean (us)':>9}  {'p50 (us)':>8}  {'p99 (us)':>8}")
+    for transport in args.transports:
+        used, times = round_trips(transport, args.requests)
+        times.sort()
+        name = transport if used == transport else f"{transport}/{used}"
+        mean = 1e6 * statistics.mean(times)
+        p50 = 1e6 * times[len(times) // 2]
+        p99 = 1e6 * times[int(len(times) * 0.99)]
+        print(f"{name:>12}  {mean:9.0f}  {p50:8.0f}  {p99:8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""Watch directories and their immediate subdirectories for changes.
+
+Used to keep in-memory indexes of files on disk, such as the kernel spec
+index of :class:`~jupyter_client.kernelspec.KernelSpecManager`, up to date.
+"""
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+from __future__ import annotations
+
+import ctypes
+import errno
+import os
+import struct
+import sys
+import time
+import typing as t
+
+# from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+# changes to the entries of a directory, or the directory itself
+_DIR_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+# a missing directory being created in one of its ancestors
+_ANCESTOR_MASK = IN_CREATE | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+
+_EVENT = struct.Struct("iIII")
+
+
+def _stat_key(path: str) -> tuple[int, int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _subdirs(path: str) -> list[str]:
+    try:
+        with os.scandir(path) as entries:
+            return [entry.path for entry in entries if entry.is_dir()]
+    except OSError:
+        return []
+
+
+class PollingWatcher:
+    """Detect changes by comparing stat results, at most every ``interval`` seconds.
+
+    Watches each directory in ``dirs``, its subdirectories and the ``files``
+    named within those subdirectories.
+    """
+
+    def __init__(self, dirs: t.Sequence[str], interval: float, files: t.Sequence[str] = ()):
+        self.dirs = list(dirs)
+        self.interval = interval
+        self.files = list(files)
+        self._snapshot = self._take_snapshot()
+        self._checked = time.monotonic()
+
+    def _take_snapshot(self) -> dict[str, dict[str, t.Any]]:
+        snapshot = {}
+        for path in self.dirs:
+            dir_snapshot = snapshot[path] = {path: _stat_key(path)}
+            for subdir in _subdirs(path):
+                dir_snapshot[subdir] = _stat_key(subdir)
+                for name in self.files:
+                    file = os.path.join(subdir, name)
+                    dir_snapshot[file] = _stat_key(file)
+        return snapshot
+
+    def changed(self) -> bool:
+        """Whether anything changed since the last call."""
+        return bool(self.changed_dirs())
+
+    def changed_dirs(self) -> set[str]:
+        """The directories of ``dirs`` in which anything changed since the last call."""
+        now = time.monotonic()
+        if now - self._checked < self.interval:
+            return set()
+        self._checked = now
+        snapshot = self._take_snapshot()
+        changed = {path for path in self.dirs if snapshot[path] != self._snapshot.get(path)}
+        self._snapshot = snapshot
+        return changed
+
+    def close(self) -> None:
+        """Stop watching."""
+
+
+class InotifyWatcher:
+    """Detect changes as they are reported by inotify (Linux only).
+
+    Watches each directory in ``dirs`` and its subdirectories. Missing
+    directories are watched for by their nearest existing ancestor.
+    Checking for changes is a single non-blocking read.
+    """
+
+    def __init__(self, dirs: t.Sequence[str]):
+        libc = _load_libc()
+        if libc is None:
+            msg = "inotify is not available"
+            raise OSError(errno.ENOSYS, msg)
+        self._libc = libc
+        self.dirs = list(dirs)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        # path -> watch descriptor
+        self._watches: dict[str, int] = {}
+        # watch descriptor -> the directories of dirs it is watched for
+        self._owners: dict[int, set[str]] = {}
+        try:
+            self._sync_watches()
+        except BaseException:
+            self.close()
+            raise
+
+    def _add_watch(self, path: str, mask: int) -> int | None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                # gone meanwhile, or not for us to watch
+                return None
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def _sync_watches(self) -> None:
+        """Watch the directories which exist now, and stop watching the rest."""
+        watches = {}
+        owners: dict[int, set[str]] = {}
+        for path in self.dirs:
+            if os.path.isdir(path):
+                wanted = [(path, _DIR_MASK)] + [(subdir, _DIR_MASK) for subdir in _subdirs(path)]
+            else:
+                ancestor = os.path.dirname(os.path.abspath(path))
+                while not os.path.isdir(ancestor) and os.path.dirname(ancestor) != ancestor:
+                    ancestor = os.path.dirname(ancestor)
+                wanted = [(ancestor, _ANCESTOR_MASK)]
+            for watch_path, mask in wanted:
+                if watch_path in watches:
+                    owners[watches[watch_path]].add(path)
+                    continue
+                wd = self._add_watch(watch_path, mask)
+                if wd is not None:
+                    watches[watch_path] = wd
+                    owners.setdefault(wd, set()).add(path)
+        current = set(watches.values())
+        for wd in set(self._watches.values()) - current:
+            self._libc.inotify_rm_watch(self._fd, wd)
+        self._watches = watches
+        self._owners = owners
+
+    def changed(self) -> bool:
+        """Whether anything changed since the last call.
+
+        Raises OSError if changes can no longer be watched for.
+        """
+        return bool(self.changed_dirs())
+
+    def changed_dirs(self) -> set[str]:
+        """The directories of ``dirs`` in which anything changed since the last call.
+
+        Raises OSError if changes can no longer be watched for.
+        """
+        changed: set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    # events were lost
+                    changed.update(self.dirs)
+                elif mask != IN_IGNORED:
+                    changed.update(self._owners.get(wd, ()))
+        if changed:
+            self._sync_watches()
+        return changed
+
+    def close(self, _close: t.Callable[[int], None] = os.close) -> None:
+        """Stop watching."""
+        if self._fd >= 0:
+            # os.close may be gone when called from __del__ at shutdown
+            _close(self._fd)
+            self._fd = -1
+
+    def __del__(self) -> None:
+        if getattr(self, "_fd", -1) >= 0:
+            self.close()
+
+
+_libc: t.Any = None
+
+
+def _load_libc() -> t.Any:
+    """Load the C library with its inotify functions, or return None."""
+    global _libc
+    if _libc is None and sys.platform.startswith("linux"):
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        except (OSError, AttributeError):
+            _libc = False
+        else:
+            _libc = libc
+    return _libc or None
+
+
+def watch_directories(
+    dirs: t.Sequence[str], interval: float, files: t.Sequence[str] = ()
+) -> PollingWatcher | InotifyWatcher:
+    """Watch dirs with inotify where available, else by polling every interval seconds."""
+    try:
+        return InotifyWatcher(dirs)
+    except OSError:
+        return PollingWatcher(dirs, interval, files)
@@ -3,13 +3,19 @@
 # Distributed under the terms of the Modified BSD License.
 import asyncio
 import atexit
+import bisect
+import heapq
+import itertools
+import math
 import time
 import typing as t
+from collections import deque
 from queue import Empty
-from threading import Event, Thread
+from threading import Event, Lock, Thread, current_thread
 
 import zmq.asyncio
 from jupyter_core.utils import ensure_async
+from traitlets.log import get_logger
 
 from ._version import protocol_version_info
 from .channelsabc import HBChannelABC
@@ -31,12 +37,65 @@ class InvalidPortNumber(Exception):  # noqa
     pass
 
 
+class RTTStats:
+    """Round-trip time statistics of a kernel's heartbeat.
+
+    Keeps a histogram of the round-trip times, in buckets doubling from
+    0.1ms, and a smoothed estimate of the round-trip time and its variation,
+    from which the heartbeat deadlines are derived (as TCP does, RFC 6298).
+
+    .. versionadded:: 8.7
+    """
+
+    bounds = tuple(0.0001 * 2**i for i in range(16))
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.min = math.inf
+        self.max = 0.0
+        self.srtt: t.Optional[float] = None
+        self.rttvar = 0.0
+
+    def record(self, rtt: float) -> None:
+        """Record a round-trip time, in seconds."""
+        self.counts[bisect.bisect_left(self.bounds, rtt)] += 1
+        self.count += 1
+        self.min = min(self.min, rtt)
+        self.max = max(self.max, rtt)
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+
+    def deadline(self, minimum: float, maximum: float) -> float:
+        """How long to wait for a reply, in seconds.
+
+        ``maximum`` until a round-trip time has been recorded.
+        """
+        if self.srtt is None:
+            return maximum
+        return min(max(self.srtt + 4 * self.rttvar, minimum), maximum)
+
+    def histogram(self) -> t.Dict[float, int]:
+        """The number of round-trip times up to each bucket's upper bound, in seconds"""
+        return dict(zip((*self.bounds, math.inf), self.counts))
+
+
 class HBChannel(Thread):
     """The heartbeat channel which monitors the kernel heartbeat.
 
     Note that the heartbeat channel is paused by default. As long as you start
     this channel, the kernel manager will ensure that it is paused and un-paused
     as appropriate.
+
+    In adaptive mode, the channel still pings every ``time_to_dead`` seconds,
+    but wakes up as soon as the reply arrives, and declares heart failure
+    after ``max_missed`` consecutive deadlines scaled from the measured
+    round-trip times (see :class:`RTTStats`), instead of after a fixed
+    ``time_to_dead``.
     """
 
     session = None
@@ -45,6 +104,12 @@ class HBChannel(Thread):
     _exiting = False
 
     time_to_dead: float = 1.0
+    # adaptive heart-failure detection
+    adaptive: bool = False
+    max_missed: int = 3
+    # the shortest deadline, however fast the round trips were,
+    # so scheduling hiccups on either side aren't mistaken for heart failure
+    min_deadline: float = 0.1
     _running = None
     _pause = None
     _beating = None
@@ -86,6 +151,7 @@ class HBChannel(Thread):
         # don't start paused
         self._pause = False
         self.poller = zmq.Poller()
+        self.rtt_stats = RTTStats()
 
     @staticmethod
     @atexit.register
@@ -111,7 +177,6 @@ class HBChannel(Thread):
     async def _async_run(self) -> None:
         """The thread's main activity.  Call start() instead."""
         self._create_socket()
-        self._running = True
         self._beating = True
         assert self.socket is not None
 
@@ -121,6 +186,10 @@ class HBChannel(Thread):
                 self._exit.wait(self.time_to_dead)
                 continue
 
+            if self.adaptive:
+                await self._adaptive_beat()
+                continue
+
             since_last_heartbeat = 0.0
             # no need to catch EFSM here, because the previous event was
             # either a recv or connect, which cannot be followed by EFSM)
@@ -142,12 +211,47 @@ class HBChannel(Thread):
                 self._create_socket()
                 continue
 
+    async def _adaptive_beat(self) -> None:
+        """Ping, and wait for the reply until too many deadlines are missed."""
+        assert self.socket is not None
+        await ensure_async(self.socket.send(b"ping"))
+        request_time = time.monotonic()
+        missed = 0
+        while self._running:
+            deadline = self.rtt_stats.deadline(self.min_deadline, self.time_to_dead)
+            # returns as soon as the reply arrives
+            if self.poller.poll(math.ceil(1000 * deadline)):
+                await ensure_async(self.socket.recv())
+                rtt = time.monotonic() - request_time
+                self.rtt_stats.record(rtt)
+                self._beating = True
+                # wait for the next ping
+                self._exit.wait(max(0.0, self.time_to_dead - rtt))
+                return
+            missed += 1
+            if missed >= self.max_missed:
+                # signal heart failure
+                self._beating = False
+                self.call_handlers(time.monotonic() - request_time)
+                # and close/reopen the socket, because the REQ/REP cycle has been broken
+                self._create_socket()
+                return
+
+    def start(self) -> None:
+        """Start the heartbeat thread."""
+        # set before the thread runs, so that a stop() right after start()
+        # isn't undone and the thread can't spin on its set _exit Event
+        self._running = True
+        super().start()
+
     def run(self) -> None:
         """Run the heartbeat thread."""
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        loop.run_until_complete(self._async_run())
-        loop.close()
+        try:
+            loop.run_until_complete(self._async_run())
+        finally:
+            loop.close()
 
     def pause(self) -> None:
         """Pause the heartbeat."""
@@ -194,6 +298,286 @@ class HBChannel(Thread):
 HBChannelABC.register(HBChannel)
 
 
+class _HeartState:
+    """The heartbeat service's bookkeeping for one channel"""
+
+    __slots__ = ("channel", "pending", "replied", "request_time", "socket")
+
+    def __init__(self, channel: "SharedHBChannel") -> None:
+        self.channel = channel
+        self.socket: t.Optional[zmq.Socket] = None
+        self.pending = False
+        self.replied = False
+        self.request_time = 0.0
+
+
+class HeartbeatService:
+    """Monitor the heartbeats of many kernels from a single thread.
+
+    Every registered :class:`SharedHBChannel` is pinged once per
+    ``time_to_dead`` seconds. The next check of each channel is kept in a
+    heap, so the thread only wakes up when a reply arrives, a check is due,
+    or a channel is (un)registered. Heart failures are reported through
+    the channel's ``call_handlers``, from the service thread.
+
+    The thread is started on the first registration and exits
+    when the last channel is unregistered. A channel whose socket fails,
+    e.g. because its context was closed, is logged and no longer monitored,
+    without affecting the other channels.
+
+    .. versionadded:: 8.7
+    """
+
+    _instance: t.Optional["HeartbeatService"] = None
+    _instance_lock = Lock()
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._commands: t.Deque[t.Tuple[str, SharedHBChannel, Event]] = deque()
+        self._thread: t.Optional[Thread] = None
+        # an inproc pair wakes up the thread when commands are queued,
+        # it lives as long as the thread
+        self._runs = itertools.count()
+        self._waker: t.Optional[zmq.Socket] = None
+        self._wakee: t.Optional[zmq.Socket] = None
+
+    @classmethod
+    def instance(cls) -> "HeartbeatService":
+        """The process-wide heartbeat service"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def register(self, channel: "SharedHBChannel") -> None:
+        """Start monitoring a channel's heartbeat"""
+        self._submit("register", channel)
+
+    def unregister(self, channel: "SharedHBChannel") -> None:
+        """Stop monitoring a channel's heartbeat, and close its socket"""
+        done = self._submit("unregister", channel)
+        if current_thread() is not self._thread:
+            # don't return before the socket is closed
+            done.wait(timeout=5)
+
+    def _submit(self, action: str, channel: "SharedHBChannel") -> Event:
+        done = Event()
+        with self._lock:
+            self._commands.append((action, channel, done))
+            if self._thread is None:
+                self._start_thread()
+            assert self._waker is not None
+            self._waker.send(b"")
+        return done
+
+    def _start_thread(self) -> None:
+        """Start the thread, with the lock held"""
+        url = f"inproc://heartbeat-service-{id(self)}-{next(self._runs)}"
+        context: zmq.Context = zmq.Context.instance()
+        self._waker = context.socket(zmq.PAIR)
+        self._waker.bind(url)
+        self._wakee = context.socket(zmq.PAIR)
+        self._wakee.connect(url)
+        self._thread = Thread(target=self._run, name="HeartbeatService", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        """The thread's main activity"""
+        wakee = self._wakee
+        assert wakee is not None
+        poller = zmq.Poller()
+        poller.register(wakee, zmq.POLLIN)
+        states: t.Dict[SharedHBChannel, _HeartState] = {}
+        by_socket: t.Dict[zmq.Socket, _HeartState] = {}
+        # (next check, tie-breaker, state)
+        heap: t.List[t.Tuple[float, int, _HeartState]] = []
+        counter = itertools.count()
+
+        def connect(state: _HeartState) -> None:
+            channel = state.channel
+            assert channel.context is not None
+            assert channel.address is not None
+            socket = channel.context.socket(zmq.REQ)
+            socket.linger = 1000
+            socket.connect(channel.address)
+            poller.register(socket, zmq.POLLIN)
+            state.socket = channel.socket = socket
+            by_socket[socket] = state
+
+        def disconnect(state: _HeartState) -> None:
+            if state.socket is None:
+                return
+            poller.unregister(state.socket)
+            del by_socket[state.socket]
+            state.socket.close(linger=0)
+            state.socket = state.channel.socket = None
+            state.pending = False
+
+        def drop(state: _HeartState) -> None:
+            # stop monitoring a channel whose socket failed,
+            # e.g. because its context was closed, and keep monitoring the others
+            get_logger().exception(
+                "Error in heartbeat of %s, no longer monitoring it", state.channel
+            )
+            states.pop(state.channel, None)
+            state.channel._beating = False
+            try:
+                disconnect(state)
+            except Exception:
+                state.socket = state.channel.socket = None
+
+        def is_broken(state: _HeartState) -> bool:
+            if state.socket is None:
+                return False
+            try:
+                state.socket.poll(0)
+            except zmq.ZMQError:
+                return True
+            return False
+
+        def check(state: _HeartState, now: float) -> None:
+            channel = state.channel
+            if state.pending:
+                channel._beating = state.replied
+                if not state.replied and channel._running:
+                    # nothing was received within the time limit, signal heart failure
+                    try:
+                        channel.call_handlers(now - state.request_time)
+                    except Exception:
+                        get_logger().exception("Error in heartbeat handler of %s", channel)
+                    # and close/reopen the socket, because the REQ/REP cycle has been broken
+                    disconnect(state)
+                    connect(state)
+            state.pending = False
+            if not channel._pause:
+                assert state.socket is not None
+                state.socket.send(b"ping")
+                state.request_time = time.monotonic()
+                state.pending = True
+                state.replied = False
+            heapq.heappush(heap, (now + channel.time_to_dead, next(counter), state))
+
+        try:
+            while True:
+                timeout = None
+                if heap:
+                    timeout = max(0, math.ceil(1000 * (heap[0][0] - time.monotonic())))
+                try:
+                    events = dict(poller.poll(timeout))
+                except zmq.ZMQError:
+                    # one of the sockets can't be polled anymore, find it
+                    broken = [state for state in states.values() if is_broken(state)]
+                    if not broken:
+                        raise
+                    for state in broken:
+                        drop(state)
+                    continue
+
+                if wakee in events:
+                    while wakee.poll(0):
+                        wakee.recv()
+                while self._commands:
+                    action, channel, done = self._commands.popleft()
+                    if action == "register" and channel not in states:
+                        state = states[channel] = _HeartState(channel)
+                        try:
+                            connect(state)
+                            check(state, time.monotonic())
+                        except Exception:
+                            drop(state)
+                    elif action == "unregister" and channel in states:
+                        disconnect(states.pop(channel))
+                    done.set()
+
+                for socket in events:
+                    hb_state = by_socket.get(socket)
+                    if hb_state is not None:
+                        try:
+                            # the poll above guarantees we have something to recv
+                            socket.recv()
+                        except zmq.ZMQError:
+                            drop(hb_state)
+                            continue
+                        hb_state.replied = True
+                        hb_state.channel.rtt_stats.record(
+                            time.monotonic() - hb_state.request_time
+                        )
+
+                now = time.monotonic()
+                while heap and heap[0][0] <= now:
+                    _, _, state = heapq.heappop(heap)
+                    if state.socket is not None:
+                        try:
+                            check(state, now)
+                        except Exception:
+                            drop(state)
+
+                with self._lock:
+                    if not states and not self._commands:
+                        return
+        except Exception:
+            get_logger().exception("Heartbeat service failed")
+        finally:
+            for state in list(states.values()):
+                state.channel._beating = False
+                try:
+                    disconnect(state)
+                except Exception:
+                    pass
+            with self._lock:
+                assert self._waker is not None
+                self._waker.close(linger=0)
+                wakee.close(linger=0)
+                self._waker = self._wakee = self._thread = None
+                if self._commands:
+                    # submitted while the thread was exiting
+                    self._start_thread()
+
+
+class SharedHBChannel(HBChannel):
+    """A heartbeat channel monitored by the shared :class:`HeartbeatService`.
+
+    It has the same interface as :class:`HBChannel`, but doesn't run a thread
+    of its own, so monitoring many kernels doesn't take a thread per kernel.
+    Use it as a client's ``hb_channel_class``.
+    Adaptive mode is not supported, use :class:`HBChannel` for it.
+
+    .. versionadded:: 8.7
+    """
+
+    service: t.Optional[HeartbeatService] = None
+
+    def _get_service(self) -> HeartbeatService:
+        if self.service is None:
+            self.service = HeartbeatService.instance()
+        return self.service
+
+    def start(self) -> None:
+        """Start monitoring the heartbeat."""
+        if self._running:
+            return
+        if self.adaptive:
+            msg = "SharedHBChannel does not support adaptive mode, use HBChannel"
+            raise ValueError(msg)
+        self._running = True
+        self._beating = True
+        self._get_service().register(self)
+
+    def is_alive(self) -> bool:
+        """Whether the heartbeat is being monitored."""
+        return bool(self._running)
+
+    def stop(self) -> None:
+        """Stop monitoring the heartbeat, and close the socket."""
+        if not self._running:
+            return
+        self._running = False
+        self._exit.set()
+        self._get_service().unregister(self)
+
+    close = stop
+
+
 class ZMQSocketChannel:
     """A ZMQ socket wrapper"""
 
@@ -216,9 +600,10 @@ class ZMQSocketChannel:
 
     def _recv(self, **kwargs: t.Any) -> t.Dict[str, t.Any]:
         assert self.socket is not None
+        copy = kwargs.setdefault("copy", not self.session.zero_copy_recv)
         msg = self.socket.recv_multipart(**kwargs)
-        ident, smsg = self.session.feed_identities(msg)
-        return self.session.deserialize(smsg)
+        ident, smsg = self.session.feed_identities(msg, copy)
+        return self.session.deserialize(smsg, copy=copy)
 
     def get_msg(self, timeout: t.Optional[float] = None) -> t.Dict[str, t.Any]:
         """Gets a message if there is one that is ready."""
@@ -261,10 +646,13 @@ class ZMQSocketChannel:
         """Test whether the channel is alive."""
         return self.socket is not None
 
-    def send(self, msg: t.Dict[str, t.Any]) -> None:
-        """Pass a message to the ZMQ socket to send"""
+    def send(self, msg: t.Union[t.Dict[str, t.Any], t.List[t.Dict[str, t.Any]]]) -> None:
+        """Pass a message, or a list of messages, to the ZMQ socket to send"""
         assert self.socket is not None
-        self.session.send(self.socket, msg)
+        if isinstance(msg, list):
+            self.session.send_many(self.socket, msg)
+        else:
+            self.session.send(self.socket, msg)
 
     def start(self) -> None:
         """Start the socket channel."""
@@ -295,9 +683,10 @@ class AsyncZMQSocketChannel(ZMQSocketChannel):
 
     async def _recv(self, **kwargs: t.Any) -> t.Dict[str, t.Any]:  # type:ignore[override]
         assert self.socket is not None
+        copy = kwargs.setdefault("copy", not self.session.zero_copy_recv)
         msg = await self.socket.recv_multipart(**kwargs)
-        _, smsg = self.session.feed_identities(msg)
-        return self.session.deserialize(smsg)
+        _, smsg = self.session.feed_identities(msg, copy)
+        return self.session.deserialize(smsg, copy=copy)
 
     async def get_msg(  # type:ignore[override]
         self, timeout: t.Optional[float] = None
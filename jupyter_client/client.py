@@ -6,13 +6,15 @@ import inspect
 import sys
 import time
 import typing as t
+from collections import OrderedDict
 from functools import partial
 from getpass import getpass
 from queue import Empty
 
 import zmq.asyncio
 from jupyter_core.utils import ensure_async
-from traitlets import Any, Bool, Instance, Type
+from traitlets import Any, Bool, Dict, Instance, Type
+from traitlets.log import get_logger
 
 from .channels import major_protocol_version
 from .channelsabc import ChannelABC, HBChannelABC
@@ -70,6 +72,224 @@ def reqrep(wrapped: t.Callable, meth: t.Callable, channel: str = "shell") -> t.C
     return wrapped
 
 
+def _channel_reader(channel: t.Any) -> t.Callable[..., t.Awaitable[t.Dict[str, t.Any]]]:
+    """Return an awaitable get_msg for a channel.
+
+    Routers are kept by the client, so they read from the channel rather than
+    through the client's methods: a reference back to the client would put it
+    in a reference cycle, and the garbage collector could then tear down its
+    zmq context before the client gets to destroy it.
+    """
+
+    async def get_msg(*args: t.Any, **kwargs: t.Any) -> t.Dict[str, t.Any]:
+        return await ensure_async(channel.get_msg(*args, **kwargs))
+
+    return get_msg
+
+
+class _ReplyRouter:
+    """Route the replies on a channel to the requests waiting for them.
+
+    On async channels, a single reader task receives replies on behalf of
+    every pending request and resolves each request's future, so concurrent
+    requests sharing a client don't consume each other's replies.
+    Replies that arrive while nobody is waiting for them
+    are kept (up to ``max_unclaimed``) for a later request.
+    """
+
+    max_unclaimed = 128
+
+    def __init__(self, get_msg: t.Callable[..., t.Awaitable[t.Dict[str, t.Any]]], concurrent: bool):
+        self._get_msg = get_msg
+        self._concurrent = concurrent
+        self._waiters: t.Dict[str, asyncio.Future] = {}
+        self._unclaimed: OrderedDict[str, t.Dict[str, t.Any]] = OrderedDict()
+        self._reader: t.Optional[asyncio.Task] = None
+        # the reader's current receive
+        self._recv: t.Optional[asyncio.Future] = None
+
+    def _dispatch(self, reply: t.Dict[str, t.Any]) -> None:
+        """Hand a reply to its waiter, or keep it for later"""
+        msg_id = reply["parent_header"].get("msg_id")
+        waiter = self._waiters.pop(msg_id, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(reply)
+            return
+        # not awaited (yet), someone may have forgotten to retrieve theirs
+        self._unclaimed[msg_id] = reply
+        if len(self._unclaimed) > self.max_unclaimed:
+            self._unclaimed.popitem(last=False)
+
+    async def _read(self) -> None:
+        """Receive replies while there are requests waiting for them"""
+        while self._waiters:
+            self._recv = recv = asyncio.ensure_future(self._get_msg())
+            try:
+                reply = await recv
+            except Exception as e:
+                for waiter in self._waiters.values():
+                    if not waiter.done():
+                        waiter.set_exception(e)
+                self._waiters.clear()
+                return
+            finally:
+                self._recv = None
+            self._dispatch(reply)
+
+    def _stop_reader(self) -> None:
+        """Cancel the reader, keeping a reply it has received but not dispatched yet"""
+        recv = self._recv
+        if recv is not None and recv.done() and not recv.cancelled() and recv.exception() is None:
+            self._recv = None
+            self._dispatch(recv.result())
+        if self._reader is not None:
+            self._reader.cancel()
+            self._reader = None
+
+    def close(self) -> None:
+        """Stop reading, and fail the requests still waiting for a reply"""
+        if self._reader is not None and self._reader.get_loop().is_closed():
+            # nothing left to wake up
+            self._reader = None
+        self._stop_reader()
+        for waiter in self._waiters.values():
+            if not waiter.done() and not waiter.get_loop().is_closed():
+                waiter.set_exception(RuntimeError("The channel was stopped"))
+        self._waiters.clear()
+        self._unclaimed.clear()
+
+    async def recv_reply(self, msg_id: str, timeout: t.Optional[float] = None) -> t.Dict[str, t.Any]:
+        """Receive and return the reply for a given request"""
+        if msg_id in self._unclaimed:
+            return self._unclaimed.pop(msg_id)
+        if not self._concurrent:
+            return await self._recv_reply_inline(msg_id, timeout)
+
+        loop = asyncio.get_running_loop()
+        if self._reader is not None and (self._reader.done() or self._reader.get_loop() is not loop):
+            self._reader = None
+        waiter = loop.create_future()
+        self._waiters[msg_id] = waiter
+        if self._reader is None:
+            self._reader = loop.create_task(self._read())
+        try:
+            return await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError as e:
+            msg = "Timeout waiting for reply"
+            raise TimeoutError(msg) from e
+        finally:
+            if self._waiters.get(msg_id) is waiter:
+                del self._waiters[msg_id]
+            if not self._waiters:
+                self._stop_reader()
+
+    async def _recv_reply_inline(
+        self, msg_id: str, timeout: t.Optional[float] = None
+    ) -> t.Dict[str, t.Any]:
+        """Receive replies in the caller until the requested one arrives"""
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+        while True:
+            if timeout is not None:
+                timeout = max(0, deadline - time.monotonic())
+            try:
+                reply = await self._get_msg(timeout=timeout)
+            except Empty as e:
+                msg = "Timeout waiting for reply"
+                raise TimeoutError(msg) from e
+            if reply["parent_header"].get("msg_id") == msg_id:
+                return reply
+            self._dispatch(reply)
+
+
+class _OutputRouter:
+    """Fan out the messages on a channel to queues keyed by parent msg_id.
+
+    A single reader task receives on behalf of every subscribed request,
+    so concurrent executions sharing a client each see their own output.
+    Messages without a subscriber are passed to the registered handlers,
+    or dropped if there are none.
+    """
+
+    def __init__(self, get_msg: t.Callable[..., t.Awaitable[t.Dict[str, t.Any]]]):
+        self._get_msg = get_msg
+        self._queues: t.Dict[str, asyncio.Queue] = {}
+        self._handlers: t.List[t.Callable[[t.Dict[str, t.Any]], t.Any]] = []
+        self._reader: t.Optional[asyncio.Task] = None
+
+    def subscribe(self, msg_id: str, queue: t.Optional[asyncio.Queue] = None) -> asyncio.Queue:
+        """Route messages whose parent is msg_id to a queue, and return the queue"""
+        if queue is None:
+            queue = asyncio.Queue()
+        self._queues[msg_id] = queue
+        self._ensure_reader()
+        return queue
+
+    def unsubscribe(self, msg_id: str) -> None:
+        """Stop routing messages whose parent is msg_id"""
+        self._queues.pop(msg_id, None)
+        self._check_idle()
+
+    def add_handler(self, handler: t.Callable[[t.Dict[str, t.Any]], t.Any]) -> None:
+        """Call handler with every message that has no subscriber"""
+        self._handlers.append(handler)
+        try:
+            self._ensure_reader()
+        except RuntimeError:
+            # no running loop, the reader starts with the next subscription
+            pass
+
+    def remove_handler(self, handler: t.Callable[[t.Dict[str, t.Any]], t.Any]) -> None:
+        """Stop calling a handler registered with add_handler"""
+        self._handlers.remove(handler)
+        self._check_idle()
+
+    def close(self) -> None:
+        """Stop reading, and wake up the subscribers with an error"""
+        if self._reader is not None:
+            if not self._reader.get_loop().is_closed():
+                self._reader.cancel()
+                for subscriber in self._queues.values():
+                    subscriber.put_nowait(RuntimeError("The channel was stopped"))
+            self._reader = None
+        self._queues.clear()
+        self._handlers.clear()
+
+    def _ensure_reader(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._reader is not None and (self._reader.done() or self._reader.get_loop() is not loop):
+            self._reader = None
+        if self._reader is None:
+            self._reader = loop.create_task(self._read())
+
+    def _check_idle(self) -> None:
+        if not (self._queues or self._handlers) and self._reader is not None:
+            self._reader.cancel()
+            self._reader = None
+
+    async def _read(self) -> None:
+        """Receive and route messages while anyone is listening"""
+        while self._queues or self._handlers:
+            try:
+                msg = await self._get_msg()
+            except Exception as e:
+                # wake up the subscribers, who re-raise the error
+                for subscriber in self._queues.values():
+                    subscriber.put_nowait(e)
+                return
+            queue = self._queues.get(msg["parent_header"].get("msg_id"))
+            if queue is not None:
+                queue.put_nowait(msg)
+                continue
+            for handler in self._handlers:
+                try:
+                    res = handler(msg)
+                    if inspect.isawaitable(res):
+                        await res
+                except Exception:
+                    get_logger().exception("Error in IOPub handler %r", handler)
+
+
 class KernelClient(ConnectionFileMixin):
     """Communicates with a single kernel on any host via zmq channels.
 
@@ -110,6 +330,11 @@ class KernelClient(ConnectionFileMixin):
     _hb_channel = Any()
     _control_channel = Any()
 
+    # reply routers for the shell and control channels
+    _reply_routers = Dict()
+    # output routers for the iopub and stdin channels
+    _output_routers = Dict()
+
     # flag for whether execute requests should be allowed to call raw_input:
     allow_stdin: bool = True
 
@@ -216,24 +441,48 @@ class KernelClient(ConnectionFileMixin):
     async def _async_recv_reply(
         self, msg_id: str, timeout: t.Optional[float] = None, channel: str = "shell"
     ) -> t.Dict[str, t.Any]:
-        """Receive and return the reply for a given request"""
-        if timeout is not None:
-            deadline = time.monotonic() + timeout
-        while True:
-            if timeout is not None:
-                timeout = max(0, deadline - time.monotonic())
-            try:
-                if channel == "control":
-                    reply = await self._async_get_control_msg(timeout=timeout)
-                else:
-                    reply = await self._async_get_shell_msg(timeout=timeout)
-            except Empty as e:
-                msg = "Timeout waiting for reply"
-                raise TimeoutError(msg) from e
-            if reply["parent_header"].get("msg_id") != msg_id:
-                # not my reply, someone may have forgotten to retrieve theirs
-                continue
-            return reply
+        """Receive and return the reply for a given request
+
+        Replies are routed by their parent msg_id,
+        so concurrent requests can wait for their replies on the same client.
+        """
+        if channel != "control":
+            channel = "shell"
+        router = self._reply_routers.get(channel)
+        if router is None:
+            chan = self.control_channel if channel == "control" else self.shell_channel
+            router = _ReplyRouter(
+                _channel_reader(chan), concurrent=inspect.iscoroutinefunction(chan.get_msg)
+            )
+            self._reply_routers[channel] = router
+        return await router.recv_reply(msg_id, timeout=timeout)
+
+    def _output_router(self, channel: str) -> _OutputRouter:
+        """Get the output router for the iopub or stdin channel"""
+        router = self._output_routers.get(channel)
+        if router is None:
+            chan = self.stdin_channel if channel == "stdin" else self.iopub_channel
+            router = self._output_routers[channel] = _OutputRouter(_channel_reader(chan))
+        return router
+
+    def add_iopub_handler(self, handler: t.Callable[[t.Dict[str, t.Any]], t.Any]) -> None:
+        """Call a handler with IOPub messages that no request is waiting for
+
+        Messages for concurrent :meth:`execute_interactive` calls are routed
+        to those calls, everything else (e.g. output from other clients) is
+        passed to the handlers. The handler may be a coroutine function.
+        Only supported on clients with async channels.
+
+        .. versionadded:: 8.7
+        """
+        self._output_router("iopub").add_handler(handler)
+
+    def remove_iopub_handler(self, handler: t.Callable[[t.Dict[str, t.Any]], t.Any]) -> None:
+        """Remove a handler registered with :meth:`add_iopub_handler`
+
+        .. versionadded:: 8.7
+        """
+        self._output_router("iopub").remove_handler(handler)
 
     async def _stdin_hook_default(self, msg: t.Dict[str, t.Any]) -> None:
         """Handle an input request"""
@@ -322,6 +571,11 @@ class KernelClient(ConnectionFileMixin):
 
         This stops their event loops and joins their threads.
         """
+        # stop the routers reading from the channels first
+        for router in [*self._reply_routers.values(), *self._output_routers.values()]:
+            router.close()
+        self._reply_routers.clear()
+        self._output_routers.clear()
         if self.shell_channel.is_alive():
             self.shell_channel.stop()
         if self.iopub_channel.is_alive():
@@ -530,6 +784,15 @@ class KernelClient(ConnectionFileMixin):
         else:
             timeout_ms = None
 
+        if inspect.iscoroutinefunction(self.iopub_channel.get_msg):
+            # async channels are shared with concurrent executions through routers
+            await self._async_route_interactive(
+                msg_id, allow_stdin, timeout, output_hook, stdin_hook
+            )
+            if timeout is not None:
+                timeout = max(0, deadline - time.monotonic())
+            return await self._async_recv_reply(msg_id, timeout=timeout)
+
         poller = zmq.asyncio.Poller()
         iopub_socket = self.iopub_channel.socket
         poller.register(iopub_socket, zmq.POLLIN)
@@ -576,6 +839,48 @@ class KernelClient(ConnectionFileMixin):
             timeout = max(0, deadline - time.monotonic())
         return await self._async_recv_reply(msg_id, timeout=timeout)
 
+    async def _async_route_interactive(
+        self,
+        msg_id: str,
+        allow_stdin: bool,
+        timeout: t.Optional[float],
+        output_hook: t.Callable,
+        stdin_hook: t.Callable,
+    ) -> None:
+        """Relay the output and input requests of an execution until it is idle"""
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+        queue = self._output_router("iopub").subscribe(msg_id)
+        if allow_stdin:
+            self._output_router("stdin").subscribe(msg_id, queue)
+        try:
+            while True:
+                if timeout is not None:
+                    timeout = max(0, deadline - time.monotonic())
+                try:
+                    msg = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError as e:
+                    emsg = "Timeout waiting for output"
+                    raise TimeoutError(emsg) from e
+                if isinstance(msg, Exception):
+                    raise msg
+                if msg["header"]["msg_type"] == "input_request":
+                    res = stdin_hook(msg)
+                    if inspect.isawaitable(res):
+                        await res
+                    continue
+                output_hook(msg)
+                # stop on idle
+                if (
+                    msg["header"]["msg_type"] == "status"
+                    and msg["content"]["execution_state"] == "idle"
+                ):
+                    break
+        finally:
+            self._output_router("iopub").unsubscribe(msg_id)
+            if allow_stdin:
+                self._output_router("stdin").unsubscribe(msg_id)
+
     # Methods to send specific messages on channels
     def execute(
         self,
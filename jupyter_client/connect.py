@@ -14,7 +14,9 @@ import os
 import socket
 import stat
 import tempfile
+import threading
 import warnings
+from collections import deque
 from getpass import getpass
 from typing import TYPE_CHECKING, Any, Union, cast
 
@@ -47,6 +49,7 @@ def write_connection_file(
     transport: str = "tcp",
     signature_scheme: str = "hmac-sha256",
     kernel_name: str = "",
+    registration_port: int = 0,
     **kwargs: Any,
 ) -> tuple[str, KernelConnectionInfo]:
     """Generates a JSON config file, including the selection of random ports.
@@ -88,6 +91,11 @@ def write_connection_file(
 
     kernel_name : str, optional
         The name of the kernel currently connected to.
+
+    registration_port : int, optional
+        The port of a socket on which the kernel reports the ports it bound.
+        If given, no ports are chosen: unspecified ports are written as 0,
+        for the kernel to bind ports of its choice.
     """
     if not ip:
         ip = localhost()
@@ -107,7 +115,9 @@ def write_connection_file(
         + int(control_port <= 0)
         + int(hb_port <= 0)
     )
-    if transport == "tcp":
+    if registration_port:
+        ports = [0] * ports_needed
+    elif transport == "tcp":
         for _ in range(ports_needed):
             sock = socket.socket()
             # struct.pack('ii', (0,0)) is 8 null bytes
@@ -148,6 +158,8 @@ def write_connection_file(
     cfg["transport"] = transport
     cfg["signature_scheme"] = signature_scheme
     cfg["kernel_name"] = kernel_name
+    if registration_port:
+        cfg["registration_port"] = registration_port
     cfg.update(kwargs)
 
     # Only ever write this file as user read/writeable
@@ -335,7 +347,16 @@ class ConnectionFileMixin(LoggingConfigurable):
     )
     _connection_file_written = Bool(False)
 
-    transport = CaselessStrEnum(["tcp", "ipc"], default_value="tcp", config=True)
+    transport = CaselessStrEnum(
+        ["tcp", "ipc", "auto"],
+        default_value="tcp",
+        config=True,
+        help="""The transport of the kernel's sockets.
+
+        "auto" lets the provisioner choose when the kernel is launched: local kernels
+        then use ipc sockets in the Jupyter runtime directory where available, and tcp
+        elsewhere.""",
+    )
     kernel_name: str | Unicode = Unicode()
 
     context = Instance(zmq.Context)
@@ -691,29 +712,168 @@ class LocalPortCache(SingletonConfigurable):
     acquiring a cached but unused port, thereby re-introducing the issue this
     class is attempting to resolve (minimize).
     See: https://github.com/jupyter/jupyter_client/issues/487
+
+    With ``pool_size`` set, ports are reserved ahead of kernel starts: up to that many
+    ports per ip are kept bound by this process, so that they cannot be handed out to
+    other processes, and are released when a kernel takes them. Once half of the pool
+    is used, it is refilled by a background thread. Returned ports are put back in it.
     """
 
+    pool_size = Integer(
+        0,
+        config=True,
+        help="""Number of ports to keep reserved per ip, ahead of kernel starts.
+        0 finds each port when it is needed.""",
+    )
+
     def __init__(self, **kwargs: Any) -> None:
         super().__init__(**kwargs)
         self.currently_used_ports: set[int] = set()
+        # guards the attributes below, and currently_used_ports
+        self._lock = threading.Lock()
+        # ip -> reserved ports, with the sockets holding them
+        self._pools: dict[str, deque[tuple[int, socket.socket]]] = {}
+        self._refilling: set[str] = set()
+        # port -> ip, for ports handed out from a pool
+        self._port_ips: dict[int, str] = {}
 
     def find_available_port(self, ip: str) -> int:
+        return self.find_available_ports(ip, 1)[0]
+
+    def find_available_ports(self, ip: str, count: int) -> list[int]:
+        """Return count distinct ports for a kernel, taken from the pool if there is one."""
+        reserved = []
+        with self._lock:
+            pool = self._pools.get(ip)
+            while pool and len(reserved) < count:
+                reserved.append(pool.popleft())
+            for port, _ in reserved:
+                self.currently_used_ports.add(port)
+        while len(reserved) < count:
+            reserved.append(self._reserve_port(ip))
+        ports = []
+        for port, sock in reserved:
+            sock.close()
+            ports.append(port)
+        if self.pool_size > 0:
+            with self._lock:
+                self._port_ips.update(dict.fromkeys(ports, ip))
+            self._start_refill(ip)
+        return ports
+
+    def clear_pool(self) -> None:
+        """Release the reserved ports."""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            for _, sock in pool:
+                sock.close()
+
+    def _reserve_port(self, ip: str) -> tuple[int, socket.socket]:
+        """Bind a free port which is not in use by our kernels, and mark it used."""
         while True:
             tmp_sock = socket.socket()
             tmp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, b"\0" * 8)
             tmp_sock.bind((ip, 0))
             port = tmp_sock.getsockname()[1]
-            tmp_sock.close()
 
             # This is a workaround for https://github.com/jupyter/jupyter_client/issues/487
             # We prevent two kernels to have the same ports.
-            if port not in self.currently_used_ports:
-                self.currently_used_ports.add(port)
-                return port
+            with self._lock:
+                if port not in self.currently_used_ports:
+                    self.currently_used_ports.add(port)
+                    return port, tmp_sock
+            tmp_sock.close()
+
+    def _start_refill(self, ip: str) -> None:
+        with self._lock:
+            # refill once half of the pool is used
+            if ip in self._refilling or len(self._pools.get(ip, ())) > self.pool_size // 2:
+                return
+            self._refilling.add(ip)
+        threading.Thread(target=self._refill, args=(ip,), daemon=True).start()
+
+    def _refill(self, ip: str) -> None:
+        """Reserve ports until the pool of ip is full."""
+        try:
+            while True:
+                with self._lock:
+                    if len(self._pools.setdefault(ip, deque())) >= self.pool_size:
+                        return
+                port, sock = self._reserve_port(ip)
+                with self._lock:
+                    # reserved, but not used by a kernel yet
+                    self.currently_used_ports.discard(port)
+                    self._pools.setdefault(ip, deque()).append((port, sock))
+        except OSError as e:
+            self.log.warning("Could not reserve ports on %s: %s", ip, e)
+        finally:
+            with self._lock:
+                self._refilling.discard(ip)
 
     def return_port(self, port: int) -> None:
-        if port in self.currently_used_ports:  # Tolerate uncached ports
-            self.currently_used_ports.remove(port)
+        with self._lock:
+            if port in self.currently_used_ports:  # Tolerate uncached ports
+                self.currently_used_ports.remove(port)
+            ip = self._port_ips.pop(port, None)
+            if ip is None or len(self._pools.get(ip, ())) >= self.pool_size:
+                return
+        # reuse the port, unless it was taken meanwhile
+        sock = socket.socket()
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, b"\0" * 8)
+        if os.name != "nt":
+            # allow binding while connections of the previous kernel are in TIME_WAIT
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.bind((ip, port))
+        except OSError:
+            sock.close()
+            return
+        with self._lock:
+            if port in self.currently_used_ports:
+                sock.close()
+            else:
+                self._pools.setdefault(ip, deque()).append((port, sock))
+
+
+# the longest path of a unix domain socket is 104 bytes on macOS, and 108 on Linux
+_MAX_IPC_PATH = 100
+
+
+class LocalIPCPathCache(SingletonConfigurable):
+    """
+    Hands out the ipc socket paths of local kernels using the "auto" transport.
+
+    Each kernel gets a prefix for its sockets, ``<directory>/ipc-<pid>-<n>``, to which
+    the port numbers are appended. Prefixes are returned when their kernel is shut down
+    and reused by later kernels, so that paths stay short and few.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.currently_used_paths: set[str] = set()
+
+    def find_available_path(self, directory: str) -> str | None:
+        """Return an unused socket path prefix in directory.
+
+        Returns None if the socket paths would be too long.
+        """
+        n = 1
+        while True:
+            path = os.path.join(directory, f"ipc-{os.getpid()}-{n}")
+            if len(path) + 3 > _MAX_IPC_PATH:
+                return None
+            # skip the sockets of kernels which were not cleaned up
+            if path not in self.currently_used_paths and not any(
+                os.path.exists(f"{path}-{port}") for port in range(1, len(port_names) + 1)
+            ):
+                self.currently_used_paths.add(path)
+                return path
+            n += 1
+
+    def return_path(self, path: str) -> None:
+        self.currently_used_paths.discard(path)
 
 
 __all__ = [
@@ -722,4 +882,5 @@ __all__ = [
     "tunnel_to_kernel",
     "KernelConnectionInfo",
     "LocalPortCache",
+    "LocalIPCPathCache",
 ]
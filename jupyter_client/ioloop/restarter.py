@@ -5,11 +5,13 @@ restarts the kernel if it dies.
 """
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
+import os
 import time
 import warnings
-from typing import Any
+from typing import Any, Optional
 
-from traitlets import Instance
+from tornado.ioloop import IOLoop
+from traitlets import Bool, Instance, default
 
 from ..restarter import KernelRestarter
 
@@ -29,29 +31,84 @@ class IOLoopKernelRestarter(KernelRestarter):
 
         return ioloop.IOLoop.current()
 
-    _pcallback = None
+    exit_notification = Bool(
+        False,
+        config=True,
+        help="""Whether to react to the kernel process exiting instead of polling it.
+
+        Only used when the kernel's provisioner supports it
+        (e.g. the local provisioner with pidfd on Linux),
+        the kernel is polled every time_to_dead seconds otherwise.
+
+        Off by default for blocking kernel managers, which would restart
+        the kernel from within whichever blocking call runs the event loop.
+        """,
+    )
+
+    _pcallback: Optional[Any] = None
+    _exit_fd: Optional[int] = None
+    _stable_timeout = None
 
     def start(self) -> None:
         """Start the polling of the kernel."""
-        if self._pcallback is None:
-            from tornado.ioloop import PeriodicCallback
-
-            self._pcallback = PeriodicCallback(
+        if self._pcallback is not None or self._exit_fd is not None:
+            return
+        provisioner = self.kernel_manager.provisioner
+        if self.exit_notification and provisioner is not None:
+            self._exit_fd = provisioner.get_exit_fd()
+        if self._exit_fd is not None:
+            self.loop.add_handler(self._exit_fd, self._on_exit, IOLoop.READ)
+            # instead of polling, check once for a stable start
+            if self._stable_timeout is not None:
+                # e.g. the poll after an exit, which this check replaces
+                self.loop.remove_timeout(self._stable_timeout)
+            stable_start_time = provisioner.get_stable_start_time(
+                recommended=self.stable_start_time
+            )
+            self._stable_timeout = self.loop.call_at(
+                self.loop.time() + max(0, self._last_dead + stable_start_time - time.time()),
                 self.poll,
-                1000 * self.time_to_dead,
             )
-            self._pcallback.start()
+            return
+
+        from tornado.ioloop import PeriodicCallback
+
+        self._pcallback = PeriodicCallback(
+            self.poll,
+            1000 * self.time_to_dead,
+        )
+        self._pcallback.start()
 
     def stop(self) -> None:
         """Stop the kernel polling."""
         if self._pcallback is not None:
             self._pcallback.stop()
             self._pcallback = None
+        self._stop_exit_notification()
+
+    def _stop_exit_notification(self) -> None:
+        if self._exit_fd is not None:
+            self.loop.remove_handler(self._exit_fd)
+            os.close(self._exit_fd)
+            self._exit_fd = None
+        if self._stable_timeout is not None:
+            self.loop.remove_timeout(self._stable_timeout)
+            self._stable_timeout = None
+
+    def _on_exit(self, fd: int, events: int) -> None:
+        """The kernel process has exited, handle it as a failed poll."""
+        self._stop_exit_notification()
+        # a timeout rather than a callback, so that stop() cancels it
+        self._stable_timeout = self.loop.call_later(0, self.poll)
 
 
 class AsyncIOLoopKernelRestarter(IOLoopKernelRestarter):
     """An async io loop kernel restarter."""
 
+    @default("exit_notification")
+    def _exit_notification_default(self) -> bool:
+        return True
+
     async def poll(self) -> None:  # type:ignore[override]
         """Poll the kernel."""
         if self.debug:
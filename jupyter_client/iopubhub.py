@@ -0,0 +1,227 @@
+"""An in-process hub sharing a kernel's IOPub messages between consumers.
+
+The hub subscribes to the kernel's IOPub channel once and deserializes each
+message once, then hands it to every subscription. Subscriptions buffer messages
+in bounded queues, and their backpressure policy decides what happens when a
+consumer falls behind.
+"""
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+from __future__ import annotations
+
+import asyncio
+import typing as t
+from collections import deque
+
+import zmq
+import zmq.asyncio
+
+if t.TYPE_CHECKING:
+    from .manager import KernelManager
+
+#: What a subscription does with a message when its queue is full.
+#: "drop_oldest" drops the oldest queued message,
+#: "drop_newest" drops the new message,
+#: "disconnect" closes the subscription and
+#: "block" waits for room, which holds up all subscriptions of the hub.
+BACKPRESSURE_POLICIES = ("drop_oldest", "drop_newest", "disconnect", "block")
+
+
+class SubscriptionClosed(Exception):
+    """Raised when getting a message from a closed subscription with no messages left."""
+
+
+class IOPubSubscription:
+    """A consumer's queue of the IOPub messages of a kernel.
+
+    Iterate over it asynchronously, or await :meth:`get`, to receive messages,
+    and close it once done. Messages are shared with the other subscriptions,
+    and must not be modified.
+    """
+
+    def __init__(self, hub: IOPubHub, maxsize: int, policy: str):
+        self.maxsize = maxsize
+        self.policy = policy
+        self.closed = False
+        #: the number of messages dropped because the queue was full
+        self.dropped = 0
+        self._hub = hub
+        self._messages: deque[dict[str, t.Any]] = deque()
+        self._getter: asyncio.Future | None = None
+        self._putter: asyncio.Future | None = None
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def _full(self) -> bool:
+        return 0 < self.maxsize <= len(self._messages)
+
+    @staticmethod
+    def _wake(waiter: asyncio.Future | None) -> None:
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def get(self) -> dict[str, t.Any]:
+        """Return the next message.
+
+        Messages queued before the subscription was closed are still returned,
+        SubscriptionClosed is raised after them.
+        """
+        while not self._messages:
+            if self.closed:
+                msg = "The IOPub subscription is closed"
+                raise SubscriptionClosed(msg)
+            self._getter = asyncio.get_running_loop().create_future()
+            try:
+                await self._getter
+            finally:
+                self._getter = None
+        message = self._messages.popleft()
+        self._wake(self._putter)
+        return message
+
+    def __aiter__(self) -> IOPubSubscription:
+        return self
+
+    async def __anext__(self) -> dict[str, t.Any]:
+        try:
+            return await self.get()
+        except SubscriptionClosed:
+            raise StopAsyncIteration from None
+
+    async def _put(self, message: dict[str, t.Any]) -> None:
+        """Queue a message, applying the backpressure policy when full."""
+        while not self.closed and self._full():
+            if self.policy == "drop_oldest":
+                self._messages.popleft()
+                self.dropped += 1
+            elif self.policy == "drop_newest":
+                self.dropped += 1
+                return
+            elif self.policy == "disconnect":
+                self._hub.log.warning(
+                    "Closing an IOPub subscription of kernel %s: %i messages behind",
+                    self._hub.km.kernel_id,
+                    len(self._messages),
+                )
+                self.close()
+            else:
+                self._putter = asyncio.get_running_loop().create_future()
+                try:
+                    await self._putter
+                finally:
+                    self._putter = None
+        if self.closed:
+            return
+        self._messages.append(message)
+        self._wake(self._getter)
+
+    def close(self) -> None:
+        """Stop receiving messages."""
+        if self.closed:
+            return
+        self.closed = True
+        self._hub._unsubscribe(self)
+        self._wake(self._getter)
+        self._wake(self._putter)
+
+
+class IOPubHub:
+    """Share the IOPub messages of a kernel between subscriptions.
+
+    The hub connects to the kernel while it has subscriptions, and must be
+    subscribed to from a running event loop.
+    """
+
+    def __init__(self, km: KernelManager):
+        self.km = km
+        self.log = km.log
+        # a session of our own, whose digest history other consumers
+        # of the kernel's messages (e.g. a culler) don't add to
+        self.session = km.session.clone()
+        self._subscriptions: list[IOPubSubscription] = []
+        self._socket: zmq.asyncio.Socket | None = None
+        self._url: str | None = None
+        self._reader: asyncio.Future | None = None
+
+    def subscribe(self, maxsize: int = 1000, policy: str = "drop_oldest") -> IOPubSubscription:
+        """Return a new subscription to the kernel's IOPub messages.
+
+        Parameters
+        ----------
+        maxsize : int
+            The number of messages the subscription queues before applying its policy.
+            0 means no limit.
+        policy : str
+            One of BACKPRESSURE_POLICIES.
+        """
+        if policy not in BACKPRESSURE_POLICIES:
+            msg = f"Unknown backpressure policy {policy!r}, expected one of {BACKPRESSURE_POLICIES}"
+            raise ValueError(msg)
+        subscription = IOPubSubscription(self, maxsize, policy)
+        self._subscriptions.append(subscription)
+        if self._reader is None:
+            self._connect()
+        return subscription
+
+    @property
+    def subscriptions(self) -> list[IOPubSubscription]:
+        """The open subscriptions."""
+        return list(self._subscriptions)
+
+    def _connect(self) -> None:
+        context = zmq.asyncio.Context.shadow(self.km.context.underlying)
+        self._url = self.km._make_url("iopub")
+        self.log.debug("Connecting IOPub hub to: %s", self._url)
+        sock = context.socket(zmq.SUB)
+        sock.linger = 0
+        sock.connect(self._url)
+        sock.setsockopt(zmq.SUBSCRIBE, b"")
+        self._socket = sock
+        self._reader = asyncio.ensure_future(self._read(sock))
+
+    def _disconnect(self) -> None:
+        if self._reader is not None:
+            if not self._reader.get_loop().is_closed():
+                self._reader.cancel()
+            self._reader = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def reconnect(self) -> None:
+        """Connect to the kernel again if its IOPub address changed, e.g. on restart."""
+        if self._reader is not None and self.km._make_url("iopub") != self._url:
+            self._disconnect()
+            self._connect()
+
+    async def _read(self, sock: zmq.asyncio.Socket) -> None:
+        session = self.session
+        try:
+            while True:
+                msg_list = await sock.recv_multipart()
+                try:
+                    _, msg_list = session.feed_identities(msg_list)
+                    message = session.deserialize(msg_list)
+                except Exception:
+                    self.log.warning("Dropping an invalid IOPub message", exc_info=True)
+                    continue
+                for subscription in self._subscriptions[:]:
+                    await subscription._put(message)
+        except Exception:
+            self.log.exception("Failed to read IOPub messages of kernel %s", self.km.kernel_id)
+            # subscriptions get SubscriptionClosed, rather than waiting for messages forever
+            self._reader = None
+            self.close()
+
+    def _unsubscribe(self, subscription: IOPubSubscription) -> None:
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+        if not self._subscriptions:
+            self._disconnect()
+
+    def close(self) -> None:
+        """Close all subscriptions and disconnect from the kernel."""
+        for subscription in self._subscriptions[:]:
+            subscription.close()
+        self._disconnect()
@@ -9,6 +9,7 @@ import warnings
 from binascii import b2a_base64
 from collections.abc import Iterable
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Optional, Union
 
 from dateutil.parser import isoparse as _dateutil_parse
@@ -81,6 +82,44 @@ def extract_dates(obj: Any) -> Any:
     return obj
 
 
+@lru_cache(maxsize=1024)
+def _parse_header_date(s: str) -> Optional[datetime]:
+    """parse a timezone-aware ISO8601 header date with datetime.fromisoformat
+
+    Returns None if the string is not a timezone-aware timestamp
+    fromisoformat can handle, so the caller can fall back on parse_date.
+    Results are cached, since the same parent header is often
+    received many times.
+    """
+    if s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+    try:
+        dt = datetime.fromisoformat(s)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        # let parse_date warn about naive timestamps
+        return None
+    return dt
+
+
+def extract_header_dates(header: Any) -> Any:
+    """extract the date from an unpacked message header
+
+    Message headers only have one timestamp, in the ``date`` field,
+    so unlike extract_dates this does not walk every value.
+    """
+    if not isinstance(header, dict):
+        return extract_dates(header)
+    date = header.get("date")
+    if not isinstance(date, str):
+        return header
+    header = dict(header)  # don't clobber
+    parsed = _parse_header_date(date)
+    header["date"] = parse_date(date) if parsed is None else parsed
+    return header
+
+
 def squash_dates(obj: Any) -> Any:
     """squash datetime objects into ISO8601 strings"""
     if isinstance(obj, dict):
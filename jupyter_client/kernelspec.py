@@ -11,9 +11,21 @@ import typing as t
 import warnings
 
 from jupyter_core.paths import SYSTEM_JUPYTER_PATH, jupyter_data_dir, jupyter_path
-from traitlets import Bool, CaselessStrEnum, Dict, HasTraits, List, Set, Type, Unicode, observe
+from traitlets import (
+    Bool,
+    CaselessStrEnum,
+    Dict,
+    Float,
+    HasTraits,
+    List,
+    Set,
+    Type,
+    Unicode,
+    observe,
+)
 from traitlets.config import LoggingConfigurable
 
+from ._dirwatch import InotifyWatcher, PollingWatcher, watch_directories
 from .provisioning import KernelProvisionerFactory as KPF  # noqa
 
 pjoin = os.path.join
@@ -108,6 +120,37 @@ def _list_kernels_in(dir: str | None) -> dict[str, str]:
     return kernels
 
 
+def _subdir_mtimes(dir: str) -> dict[str, int]:
+    """Return the mtime of each subdirectory of dir.
+
+    Creating or removing kernel.json in a subdirectory changes its mtime,
+    but not the mtime of dir.
+    """
+    mtimes = {}
+    with os.scandir(dir) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    mtimes[entry.path] = entry.stat().st_mtime_ns
+            except OSError:
+                continue
+    return mtimes
+
+
+def _stat_key(path: str) -> tuple[int, int, int]:
+    st = os.stat(path)
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _copy_json(obj: t.Any) -> t.Any:
+    """Copy the dicts and lists of a JSON-like object, so that callers may modify it."""
+    if isinstance(obj, dict):
+        return {key: _copy_json(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_copy_json(value) for value in obj]
+    return obj
+
+
 class NoSuchKernel(KeyError):  # noqa
     """An error raised when there is no kernel of a give name."""
 
@@ -164,6 +207,121 @@ class KernelSpecManager(LoggingConfigurable):
         help="List of kernel directories to search. Later ones take priority over earlier."
     )
 
+    cache_kernel_specs = Bool(
+        True,
+        config=True,
+        help="""Whether to keep kernel directory listings and parsed kernel.json files in memory.
+
+        Cached entries are reused as long as the stat of the directory, its subdirectories
+        or the kernel.json file is unchanged. get_kernel_spec only checks the
+        subdirectories of the requested kernel. Use invalidate_cache() after changes
+        the file system may not report, e.g. within its mtime resolution.
+        """,
+    )
+
+    watch_kernel_specs = Bool(
+        False,
+        config=True,
+        help="""Whether to keep an index of all kernel specs, updated when kernel directories change.
+
+        Lookups are then served from the index instead of scanning kernel_dirs.
+        Changes are detected with inotify on Linux, and by polling every
+        kernel_spec_poll_interval seconds elsewhere.
+        """,
+    )
+
+    kernel_spec_poll_interval = Float(
+        2.0,
+        config=True,
+        help="""Seconds between checks of the kernel directories when
+        watch_kernel_specs is enabled and inotify is not available.""",
+    )
+
+    def __init__(self, **kwargs: t.Any) -> None:
+        self._spec_watcher: InotifyWatcher | PollingWatcher | None = None
+        # (kernel name -> resource_dir, get_all_specs(), or None while it is built)
+        self._spec_index: tuple[dict[str, str], dict[str, t.Any] | None] | None = None
+        # kernel_dir -> kernel name -> resource_dir, of the kernels in the index
+        self._dir_index: dict[str, dict[str, str]] = {}
+        super().__init__(**kwargs)
+        # kernel_dir -> (stat key, subdirectory mtimes, kernel name -> resource_dir)
+        self._dir_cache: dict[str, tuple[tuple[int, int, int], dict[str, int], dict[str, str]]] = {}
+        # resource_dir -> (kernel.json stat key, kernel.json text, KernelSpec, its to_dict())
+        self._spec_cache: dict[
+            str, tuple[tuple[int, int, int], str, KernelSpec, dict[str, t.Any]]
+        ] = {}
+
+    def invalidate_cache(self) -> None:
+        """Forget all cached kernel directory listings and kernel specs."""
+        self._dir_cache.clear()
+        self._spec_cache.clear()
+        self._spec_index = None
+
+    @observe(
+        "kernel_dirs",
+        "allowed_kernelspecs",
+        "ensure_native_kernel",
+        "watch_kernel_specs",
+        "kernel_spec_poll_interval",
+    )
+    def _reset_spec_index(self, change: t.Any) -> None:
+        if self._spec_watcher is not None:
+            self._spec_watcher.close()
+            self._spec_watcher = None
+        self._spec_index = None
+
+    def _get_spec_index(self) -> tuple[dict[str, str], dict[str, t.Any] | None]:
+        """Return the kernel spec index, updated if kernel directories changed.
+
+        Only the entries of the kernel directories that changed are read again.
+        """
+        if self._spec_watcher is None:
+            self._spec_watcher = watch_directories(
+                self.kernel_dirs, self.kernel_spec_poll_interval, files=["kernel.json"]
+            )
+            self._spec_index = None
+        index = self._spec_index
+        changed = None
+        if index is not None:
+            if index[1] is None:
+                # being built
+                return index
+            try:
+                changed = self._spec_watcher.changed_dirs()
+                if not changed:
+                    return index
+            except OSError as e:
+                self.log.warning("Watching kernel directories failed, polling instead: %s", e)
+                self._spec_watcher.close()
+                self._spec_watcher = PollingWatcher(
+                    self.kernel_dirs, self.kernel_spec_poll_interval, files=["kernel.json"]
+                )
+
+        reuse = None
+        if changed is None:
+            self._dir_index = {}
+        else:
+            assert index is not None and index[1] is not None
+            reuse = {
+                kname: entry
+                for kname, entry in index[1].items()
+                if os.path.dirname(entry["resource_dir"]) not in changed
+            }
+        kernels: dict[str, str] = {}
+        for kernel_dir in self.kernel_dirs:
+            if changed is None or kernel_dir in changed or kernel_dir not in self._dir_index:
+                self._dir_index[kernel_dir] = self._list_kernels_in(kernel_dir)
+            for kname, resource_dir in self._dir_index[kernel_dir].items():
+                kernels.setdefault(kname, resource_dir)
+        self._spec_index = (kernels, None)
+        try:
+            specs = self._get_all_specs(reuse)
+        except BaseException:
+            self._spec_index = None
+            raise
+        self._spec_index = index = (kernels, specs)
+        return index
+
     _deprecated_aliases = {
         "whitelist": ("allowed_kernelspecs", "7.0"),
     }
@@ -201,13 +359,10 @@ class KernelSpecManager(LoggingConfigurable):
 
     def find_kernel_specs(self) -> dict[str, str]:
         """Returns a dict mapping kernel names to resource directories."""
-        d = {}
-        for kernel_dir in self.kernel_dirs:
-            kernels = _list_kernels_in(kernel_dir)
-            for kname, spec in kernels.items():
-                if kname not in d:
-                    self.log.debug("Found kernel %s in %s", kname, kernel_dir)
-                    d[kname] = spec
+        if self.watch_kernel_specs:
+            d = dict(self._get_spec_index()[0])
+        else:
+            d = self._scan_kernel_dirs()
 
         if self.ensure_native_kernel and NATIVE_KERNEL_NAME not in d:
             try:
@@ -226,7 +381,93 @@ class KernelSpecManager(LoggingConfigurable):
             # filter if there's an allow list
             d = {name: spec for name, spec in d.items() if name in self.allowed_kernelspecs}
         return d
-        # TODO: Caching?
+
+    def _scan_kernel_dirs(self) -> dict[str, str]:
+        """Return a mapping of kernel names to resource directories from kernel_dirs."""
+        d = {}
+        for kernel_dir in self.kernel_dirs:
+            kernels = self._list_kernels_in(kernel_dir)
+            for kname, spec in kernels.items():
+                if kname not in d:
+                    self.log.debug("Found kernel %s in %s", kname, kernel_dir)
+                    d[kname] = spec
+        return d
+
+    def _list_kernels_in(self, kernel_dir: str) -> dict[str, str]:
+        """Return a mapping of kernel names to resource directories from kernel_dir.
+
+        Served from the cache while kernel_dir and its subdirectories are unchanged.
+        """
+        if not self.cache_kernel_specs:
+            return _list_kernels_in(kernel_dir)
+        try:
+            key = _stat_key(kernel_dir)
+            cached = self._dir_cache.get(kernel_dir)
+            if (
+                cached is not None
+                and cached[0] == key
+                and all(_stat_key(path)[1] == mtime for path, mtime in cached[1].items())
+            ):
+                return dict(cached[2])
+            # stat before listing, so that changes made meanwhile are seen next time
+            subdirs = _subdir_mtimes(kernel_dir)
+        except OSError:
+            self._dir_cache.pop(kernel_dir, None)
+            return _list_kernels_in(kernel_dir)
+        kernels = _list_kernels_in(kernel_dir)
+        self._dir_cache[kernel_dir] = (key, subdirs, kernels)
+        return dict(kernels)
+
+    def _find_kernel_in(self, kernel_dir: str, kernel_name: str) -> str | None:
+        """Return the resource directory of kernel_name in kernel_dir, or None.
+
+        Unlike _list_kernels_in, only kernel_dir and its subdirectories named
+        kernel_name are checked against the cache, not every subdirectory.
+        """
+        cached = self._dir_cache.get(kernel_dir)
+        if cached is not None:
+            try:
+                if cached[0] == _stat_key(kernel_dir) and all(
+                    _stat_key(path)[1] == mtime
+                    for path, mtime in cached[1].items()
+                    if os.path.basename(path).lower() == kernel_name
+                ):
+                    return cached[2].get(kernel_name)
+            except OSError:
+                pass
+        return self._list_kernels_in(kernel_dir).get(kernel_name)
+
+    def _load_kernel_spec(
+        self, kernel_name: str, resource_dir: str
+    ) -> tuple[str, KernelSpec, dict[str, t.Any]]:
+        """Read the kernel.json of resource_dir, or reuse it while the file is unchanged.
+
+        Returns the text of kernel.json, and a KernelSpec and its to_dict()
+        owned by the cache.
+        """
+        kernel_file = pjoin(resource_dir, "kernel.json")
+        try:
+            key = _stat_key(kernel_file)
+        except FileNotFoundError:
+            # removed since kernel_dir was listed
+            self._dir_cache.pop(os.path.dirname(resource_dir), None)
+            self._spec_cache.pop(resource_dir, None)
+            raise NoSuchKernel(kernel_name) from None
+        cached = self._spec_cache.get(resource_dir)
+        if cached is None or cached[0] != key:
+            with open(kernel_file, encoding="utf-8") as f:
+                text = f.read()
+            kspec = self.kernel_spec_class(resource_dir=resource_dir, **json.loads(text))
+            cached = self._spec_cache[resource_dir] = (key, text, kspec, kspec.to_dict())
+        return cached[1:]
+
+    def _use_spec_cache(self) -> bool:
+        """Whether kernel specs are read by the cache, rather than a custom from_resource_dir."""
+        return (
+            self.cache_kernel_specs
+            and self.kernel_spec_class.from_resource_dir.__func__  # type:ignore[attr-defined]
+            is KernelSpec.from_resource_dir.__func__  # type:ignore[attr-defined]
+        )
 
     def _get_kernel_spec_by_name(self, kernel_name: str, resource_dir: str) -> KernelSpec:
         """Returns a :class:`KernelSpec` instance for a given kernel_name
@@ -244,7 +485,14 @@ class KernelSpecManager(LoggingConfigurable):
                     kdict = get_kernel_dict()
                     kspec = self.kernel_spec_class(resource_dir=resource_dir, **kdict)
         if not kspec:
-            kspec = self.kernel_spec_class.from_resource_dir(resource_dir)
+            if self._use_spec_cache():
+                text, cached_kspec, _ = self._load_kernel_spec(kernel_name, resource_dir)
+                if not KPF.instance(parent=self.parent).is_provisioner_available(cached_kspec):
+                    raise NoSuchKernel(kernel_name)
+                # a new instance, which callers may modify
+                return self.kernel_spec_class(resource_dir=resource_dir, **json.loads(text))
+            else:
+                kspec = self.kernel_spec_class.from_resource_dir(resource_dir)
 
         if not KPF.instance(parent=self.parent).is_provisioner_available(kspec):
             raise NoSuchKernel(kernel_name)
@@ -253,12 +501,22 @@ class KernelSpecManager(LoggingConfigurable):
 
     def _find_spec_directory(self, kernel_name: str) -> str | None:
         """Find the resource directory of a named kernel spec"""
-        for kernel_dir in [kd for kd in self.kernel_dirs if os.path.isdir(kd)]:
-            files = os.listdir(kernel_dir)
-            for f in files:
-                path = pjoin(kernel_dir, f)
-                if f.lower() == kernel_name and _is_kernel_dir(path):
+        if self.watch_kernel_specs:
+            path = self._get_spec_index()[0].get(kernel_name)
+            if path is not None:
+                return path
+        elif self.cache_kernel_specs:
+            for kernel_dir in self.kernel_dirs:
+                path = self._find_kernel_in(kernel_dir, kernel_name)
+                if path is not None:
                     return path
+        else:
+            for kernel_dir in [kd for kd in self.kernel_dirs if os.path.isdir(kd)]:
+                files = os.listdir(kernel_dir)
+                for f in files:
+                    path = pjoin(kernel_dir, f)
+                    if f.lower() == kernel_name and _is_kernel_dir(path):
+                        return path
 
         if kernel_name == NATIVE_KERNEL_NAME:
             try:
@@ -298,10 +556,38 @@ class KernelSpecManager(LoggingConfigurable):
               ...
             }
         """
+        if self.watch_kernel_specs:
+            specs = self._get_spec_index()[1]
+            if specs is not None:
+                return _copy_json(specs)
+        return self._get_all_specs()
+
+    def _get_all_specs(self, reuse: dict[str, t.Any] | None = None) -> dict[str, t.Any]:
+        """Return get_all_specs(), taking the entries of reuse whose resource_dir is unchanged."""
         d = self.find_kernel_specs()
         res = {}
+        native_resources = None
+        if self.ensure_native_kernel:
+            try:
+                from ipykernel.kernelspec import RESOURCES as native_resources
+            except ImportError:
+                pass
         for kname, resource_dir in d.items():
+            if reuse is not None and kname in reuse and reuse[kname]["resource_dir"] == resource_dir:
+                res[kname] = reuse[kname]
+                continue
             try:
+                if (
+                    self.__class__ is KernelSpecManager
+                    and self._use_spec_cache()
+                    and resource_dir != native_resources
+                ):
+                    # serve unchanged specs without creating a KernelSpec
+                    _, kspec, spec = self._load_kernel_spec(kname, resource_dir)
+                    if not KPF.instance(parent=self.parent).is_provisioner_available(kspec):
+                        raise NoSuchKernel(kname)
+                    res[kname] = {"resource_dir": resource_dir, "spec": _copy_json(spec)}
+                    continue
                 if self.__class__ is KernelSpecManager:
                     spec = self._get_kernel_spec_by_name(kname, resource_dir)
                 else:
@@ -334,6 +620,7 @@ class KernelSpecManager(LoggingConfigurable):
             os.remove(spec_dir)
         else:
             shutil.rmtree(spec_dir)
+        self.invalidate_cache()
         return spec_dir
 
     def _get_destination_dir(
@@ -403,6 +690,7 @@ class KernelSpecManager(LoggingConfigurable):
             shutil.rmtree(destination)
 
         shutil.copytree(source_dir, destination)
+        self.invalidate_cache()
         self.log.info("Installed kernelspec %s in %s", kernel_name, destination)
         return destination
 
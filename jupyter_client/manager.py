@@ -20,10 +20,12 @@ from jupyter_core.utils import run_sync
 from traitlets import (
     Any,
     Bool,
+    CaselessStrEnum,
     Dict,
     DottedObjectName,
     Float,
     Instance,
+    Integer,
     Type,
     Unicode,
     default,
@@ -37,6 +39,7 @@ from .asynchronous import AsyncKernelClient
 from .blocking import BlockingKernelClient
 from .client import KernelClient
 from .connect import ConnectionFileMixin
+from .iopubhub import BACKPRESSURE_POLICIES, IOPubHub, IOPubSubscription
 from .managerabc import KernelManagerABC
 from .provisioning import KernelProvisionerBase
 from .provisioning import KernelProvisionerFactory as KPF  # noqa
@@ -124,6 +127,9 @@ class KernelManager(ConnectionFileMixin):
         self._ready = None
 
     _created_context: Bool = Bool(False)
+    # Whether clients may share a context we were given,
+    # False when its owner destroys it while our clients may still use it.
+    _share_context: Bool = Bool(True)
 
     # The PyZMQ Context to use for communication with the kernel.
     context: Instance = Instance(zmq.Context)
@@ -205,6 +211,25 @@ class KernelManager(ConnectionFileMixin):
     def _default_cache_ports(self) -> bool:
         return self.transport == "tcp"
 
+    iopub_queue_size: Integer = Integer(
+        1000,
+        config=True,
+        help="""The number of IOPub messages a subscription from subscribe_iopub queues
+        before its backpressure policy applies. 0 means no limit.""",
+    )
+
+    iopub_backpressure: CaselessStrEnum = CaselessStrEnum(
+        BACKPRESSURE_POLICIES,
+        default_value="drop_oldest",
+        config=True,
+        help="""What a subscription from subscribe_iopub does with a new message
+        when its queue is full: drop its oldest queued message (drop_oldest),
+        drop the new message (drop_newest), close (disconnect),
+        or wait for room, holding up the other subscriptions (block).""",
+    )
+
+    _iopub_hub: t.Optional[IOPubHub] = None
+
     @property
     def ready(self) -> t.Union[CFuture, Future]:
         """A future that resolves when the kernel process has started for the first time"""
@@ -230,6 +255,10 @@ class KernelManager(ConnectionFileMixin):
 
     def __del__(self) -> None:
         self._close_control_socket()
+        if self._iopub_hub is not None:
+            # the hub's socket belongs to a shadow of our context,
+            # which doesn't close it when destroyed
+            self._iopub_hub._disconnect()
         self.cleanup_connection_file()
 
     # --------------------------------------------------------------------------
@@ -261,7 +290,12 @@ class KernelManager(ConnectionFileMixin):
     # --------------------------------------------------------------------------
 
     def client(self, **kwargs: t.Any) -> BlockingKernelClient:
-        """Create a client configured to connect to our kernel"""
+        """Create a client configured to connect to our kernel
+
+        If our context was passed in, e.g. by a MultiKernelManager that was
+        given a context, the client shares it, and must not be used after
+        the context is closed by its owner.
+        """
         kw: dict = {}
         kw.update(self.get_connection_info(session=True))
         kw.update(
@@ -270,11 +304,43 @@ class KernelManager(ConnectionFileMixin):
                 "parent": self,
             }
         )
+        context = self.context
+        if not self._created_context and self._share_context:
+            # Share the context we were given, whose owner outlives us.
+            # A context we created is destroyed at shutdown, clients keep their own then.
+            klass = getattr(self.client_factory.class_traits().get("context"), "klass", None)
+            if not isinstance(klass, type):
+                klass = zmq.Context
+            kw["context"] = klass.shadow(context.underlying)
 
         # add kwargs last, for manual overrides
         kw.update(kwargs)
         return self.client_factory(**kw)
 
+    def subscribe_iopub(
+        self, maxsize: t.Optional[int] = None, policy: t.Optional[str] = None
+    ) -> IOPubSubscription:
+        """Subscribe to our kernel's IOPub messages, from a running event loop.
+
+        All subscriptions share one connection to the kernel, and each message
+        is deserialized once for all of them.
+        Subscriptions are closed when the kernel is shut down.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            The number of messages queued before the backpressure policy applies.
+            Defaults to `iopub_queue_size`.
+        policy : str, optional
+            The backpressure policy. Defaults to `iopub_backpressure`.
+        """
+        if self._iopub_hub is None:
+            self._iopub_hub = IOPubHub(self)
+        return self._iopub_hub.subscribe(
+            self.iopub_queue_size if maxsize is None else maxsize,
+            policy or self.iopub_backpressure,
+        )
+
     # --------------------------------------------------------------------------
     # Kernel management
     # --------------------------------------------------------------------------
@@ -413,6 +479,8 @@ class KernelManager(ConnectionFileMixin):
         """
         self.start_restarter()
         self._connect_control_socket()
+        if self._iopub_hub is not None:
+            self._iopub_hub.reconnect()
         assert self.provisioner is not None
         await self.provisioner.post_launch(**kw)
 
@@ -502,6 +570,8 @@ class KernelManager(ConnectionFileMixin):
 
         self.cleanup_ipc_files()
         self._close_control_socket()
+        if self._iopub_hub is not None and not restart:
+            self._iopub_hub.close()
         self.session.parent = None
 
         if self._created_context and not restart:
@@ -4,25 +4,55 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
 import json
 import os
 import socket
+import time
 import typing as t
 import uuid
+from collections import Counter, deque
+from contextlib import contextmanager
 from functools import wraps
 from pathlib import Path
 
 import zmq
-from traitlets import Any, Bool, Dict, DottedObjectName, Instance, Unicode, default, observe
+import zmq.asyncio
+from traitlets import (
+    Any,
+    Bool,
+    Dict,
+    DottedObjectName,
+    Float,
+    Instance,
+    Integer,
+    List,
+    Unicode,
+    default,
+    observe,
+)
 from traitlets.config.configurable import LoggingConfigurable
 from traitlets.utils.importstring import import_item
+from zmq.eventloop.zmqstream import ZMQStream
 
+from .asynchronous import AsyncKernelClient
 from .connect import KernelConnectionInfo
+from .iopubhub import IOPubSubscription
 from .kernelspec import NATIVE_KERNEL_NAME, KernelSpecManager
-from .manager import KernelManager
+from .manager import KernelManager, _ShutdownStatus
+from .session import Session
 from .utils import ensure_async, run_sync, utcnow
 
 
+_POOLED_CHANNELS = ("shell", "control", "iopub", "stdin")
+
+
+def _zmq_socket(sock: t.Any) -> zmq.Socket | None:
+    """The zmq socket of a socket or ZMQStream, None once closed."""
+    raw = sock.socket if isinstance(sock, ZMQStream) else sock
+    return None if raw is None or raw.closed else raw
+
+
 class DuplicateKernelError(Exception):
     pass
 
@@ -48,6 +78,18 @@ def kernel_method(f: t.Callable) -> t.Callable:
     return wrapped
 
 
+class _WarmKernel:
+    """A started kernel waiting in the warm pool, with the state it was launched with."""
+
+    __slots__ = ("km", "cwd", "env", "expiry")
+
+    def __init__(self, km: KernelManager, cwd: str, env: dict[str, str]) -> None:
+        self.km = km
+        self.cwd = cwd
+        self.env = env
+        self.expiry: asyncio.TimerHandle | None = None
+
+
 class MultiKernelManager(LoggingConfigurable):
     """A class for managing multiple kernels."""
 
@@ -84,13 +126,20 @@ class MultiKernelManager(LoggingConfigurable):
                     self.context = self._context_default()
                 kwargs.setdefault("context", self.context)
             km = kernel_manager_ctor(*args, **kwargs)
+            if self._created_context and km.context is self.context:
+                # we destroy a context we created when we are collected,
+                # which would close the sockets of clients that outlive us
+                km._share_context = False
             return km
 
         return create_kernel_manager
 
     shared_context = Bool(
         True,
-        help="Share a single zmq.Context to talk to all my kernels",
+        help="""Share a single zmq.Context to talk to all my kernels.
+
+        If the context was passed in, clients created by the kernel managers
+        share it too. The context must then stay open as long as they are used.""",
     ).tag(config=True)
 
     context = Instance("zmq.Context")
@@ -114,9 +163,141 @@ class MultiKernelManager(LoggingConfigurable):
 
     _kernels = Dict()
 
+    warm_pool_size = Dict(
+        value_trait=Integer(),
+        help="""The number of started kernels to keep idle, per kernel name
+        (e.g. ``{"python3": 2}``).
+
+        start_kernel hands out one of these kernels when the request is compatible
+        with it, and a replacement is started in the background.
+
+        Only supported by AsyncMultiKernelManager, whose event loop keeps running
+        to start replacements. MultiKernelManager ignores it.
+        """,
+    ).tag(config=True)
+
+    # warm kernels are started, and idle kernels culled, in the background
+    # on the running event loop, which the blocking manager only runs during its own calls
+    _background_tasks_supported = False
+
+    @observe("warm_pool_size", "idle_kernel_timeout")
+    def _background_option_changed(self, change: t.Any) -> None:
+        if change["new"] and not self._background_tasks_supported:
+            self.log.warning(
+                "%s does not support %s, use AsyncMultiKernelManager",
+                self.__class__.__name__,
+                change["name"],
+            )
+
+    warm_kernel_ttl = Float(
+        0.0,
+        help="""The time in seconds after which an unused warm kernel is shut down
+        and replaced. 0 means warm kernels never expire.""",
+    ).tag(config=True)
+
+    warm_kernel_ready_timeout = Float(
+        60.0,
+        help="""The time in seconds a warm kernel has to answer a kernel_info request
+        before it is discarded.""",
+    ).tag(config=True)
+
+    warm_kernel_mutable_env = List(
+        Unicode(),
+        ["JPY_SESSION_NAME"],
+        help="""Environment variables that may differ between a start_kernel request
+        and a warm kernel handed out for it.
+
+        Requested values only take effect when the kernel is restarted.
+        A request differing in any other variable, or in its working directory,
+        starts a new kernel.""",
+    ).tag(config=True)
+
+    bulk_concurrency = Integer(
+        16,
+        help="""The maximum number of kernels started, restarted or shut down at the same time
+        by start_kernels, restart_kernels and shutdown_kernels.
+        Values of 0 or lower mean no limit.
+
+        shutdown_all is not limited: a kernel asked to shut down mostly waits for its
+        exit, so that a limit of n would make draining N unresponsive kernels take
+        about N/n times shutdown_wait_time, rather than shutdown_wait_time.
+        Call shutdown_kernels with all kernel ids to trade drain time for fewer
+        signals and file descriptors in use at once.""",
+    ).tag(config=True)
+
+    group_shutdown = Bool(
+        False,
+        help="""Whether shutdown_all shuts kernels down as a group.
+
+        All running kernels are asked to shut down at once and their exits are watched
+        in a single loop: only the ones still running after half of shutdown_wait_time
+        are sent SIGTERM, and only the ones still running after all of it are killed.
+        Shutting down then takes at most about shutdown_wait_time however many kernels
+        there are. Each kernel is still finished through shutdown_kernel.
+        """,
+    ).tag(config=True)
+
+    idle_kernel_timeout = Integer(
+        0,
+        help="""Timeout (in seconds) after which a kernel is considered idle and ready to be culled.
+        Values of 0 or lower disable culling.
+
+        Activity is tracked from the status messages kernels publish on IOPub.
+        Only supported by AsyncMultiKernelManager, whose event loop keeps running
+        to cull kernels. MultiKernelManager ignores it.
+
+        Unlike jupyter_server's ``cull_idle_timeout``, this doesn't update
+        the kernel managers' ``last_activity`` and ``execution_state``,
+        so enable only one of the two.
+        """,
+    ).tag(config=True)
+
+    idle_kernel_cull_busy = Bool(
+        False, help="""Whether to consider culling idle kernels which are busy."""
+    ).tag(config=True)
+
+    idle_kernel_cull_connected = Bool(
+        False,
+        help="""Whether to consider culling idle kernels which have one or more connections,
+        according to their manager's ``connections`` attribute.""",
+    ).tag(config=True)
+
+    idle_kernel_cull_concurrency = Integer(
+        8, help="""The maximum number of idle kernels shut down at the same time."""
+    ).tag(config=True)
+
+    socket_pool_size = Integer(
+        0,
+        help="""The number of idle connected sockets kept per kernel and channel
+        for lease_socket to hand out again. 0 disables pooling:
+        lease_socket connects a new socket and release_socket closes it.""",
+    ).tag(config=True)
+
+    socket_pool_idle_timeout = Float(
+        60.0,
+        help="""The time in seconds after which an idle pooled socket is closed.
+        0 means pooled sockets are kept until their kernel is removed.""",
+    ).tag(config=True)
+
     def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:
         super().__init__(*args, **kwargs)
         self.kernel_id_to_connection_file: dict[str, Path] = {}
+        self._activity_streams: dict[str, ZMQStream] = {}
+        # one (deadline, kernel_id) entry per watched kernel, ordered by idle deadline.
+        # Activity only moves _cull_deadlines, entries are updated when they come up.
+        self._cull_heap: list[tuple[float, str]] = []
+        self._cull_deadlines: dict[str, float] = {}
+        self._cull_timer: asyncio.TimerHandle | None = None
+        self._cull_semaphore: asyncio.Semaphore | None = None
+        # the last execution_state each watched kernel published
+        self._execution_states: dict[str, str] = {}
+        self._culling: set[asyncio.Future] = set()
+        self._warm_kernels: dict[str, deque[_WarmKernel]] = {}
+        self._warm_starting: dict[str, set[asyncio.Future]] = {}
+        self._warm_stopping: set[asyncio.Future] = set()
+        self._warm_stats: dict[str, Counter] = {}
+        # (kernel_id, channel) -> idle (socket, url, released at), most recently released last
+        self._socket_pools: dict[tuple[str, str], list[tuple[t.Any, str, float]]] = {}
 
     def __del__(self) -> None:
         """Handle garbage collection.  Destroy context if applicable."""
@@ -232,6 +413,7 @@ class MultiKernelManager(LoggingConfigurable):
             await kernel_awaitable
             self._kernels[kernel_id] = km
             self._pending_kernels.pop(kernel_id, None)
+            self._watch_activity(kernel_id, km)
         except Exception as e:
             self.log.exception(e)
 
@@ -251,6 +433,182 @@ class MultiKernelManager(LoggingConfigurable):
         """
         return getattr(self, "use_pending_kernels", False)
 
+    def warm_pool_stats(self) -> dict[str, dict[str, int]]:
+        """Return the warm pool metrics of every kernel name.
+
+        For each kernel name: the number of ``ready`` and ``starting`` warm kernels,
+        and counts of warm kernels ``started``, ``failed`` to start and ``expired``,
+        and of start_kernel requests served from the pool (``hits``) or not (``misses``).
+        """
+        stats = {}
+        for kernel_name in set(self.warm_pool_size) | set(self._warm_stats):
+            counts = dict.fromkeys(("hits", "misses", "started", "failed", "expired"), 0)
+            counts.update(self._warm_stats.get(kernel_name, {}))
+            counts["ready"] = len(self._warm_kernels.get(kernel_name, ()))
+            counts["starting"] = len(self._warm_starting.get(kernel_name, ()))
+            stats[kernel_name] = counts
+        return stats
+
+    async def _async_fill_warm_pool(self, kernel_name: str | None = None) -> None:
+        """Start warm kernels until the pool is full, and wait for them to be ready.
+
+        Fills the pool of ``kernel_name``, or of every kernel name in warm_pool_size.
+        """
+        if not self._background_tasks_supported:
+            return
+        kernel_names = [kernel_name] if kernel_name else list(self.warm_pool_size)
+        starting: list[asyncio.Future] = []
+        for name in kernel_names:
+            self._refill_warm_pool(name)
+            starting.extend(self._warm_starting.get(name, ()))
+        await asyncio.gather(*starting, return_exceptions=True)
+
+    fill_warm_pool = run_sync(_async_fill_warm_pool)
+
+    async def _async_shutdown_warm_pool(self) -> None:
+        """Shutdown all warm kernels, including those still starting."""
+        starting = [fut for futs in self._warm_starting.values() for fut in futs]
+        await asyncio.gather(*starting, return_exceptions=True)
+        for pool in self._warm_kernels.values():
+            while pool:
+                self._stop_warm_kernel(pool.popleft())
+        await asyncio.gather(*self._warm_stopping, return_exceptions=True)
+
+    shutdown_warm_pool = run_sync(_async_shutdown_warm_pool)
+
+    def _refill_warm_pool(self, kernel_name: str) -> None:
+        """Start warm kernels in the background until the pool of kernel_name is full."""
+        pool = self._warm_kernels.setdefault(kernel_name, deque())
+        starting = self._warm_starting.setdefault(kernel_name, set())
+        for _ in range(self.warm_pool_size.get(kernel_name, 0) - len(pool) - len(starting)):
+            fut = asyncio.ensure_future(self._start_warm_kernel(kernel_name))
+            starting.add(fut)
+            fut.add_done_callback(starting.discard)
+
+    async def _start_warm_kernel(self, kernel_name: str) -> None:
+        stats = self._warm_stats.setdefault(kernel_name, Counter())
+        km, kernel_name, kernel_id = self.pre_start_kernel(kernel_name, {})
+        warm = _WarmKernel(km, os.getcwd(), dict(os.environ))
+        try:
+            await ensure_async(km.start_kernel(kernel_id=kernel_id))
+            # only hand out kernels that have answered a kernel_info request
+            kc = AsyncKernelClient(
+                parent=km,
+                context=zmq.asyncio.Context.shadow(km.context.underlying),
+                **km.get_connection_info(session=True),
+            )
+            kc.start_channels(stdin=False, hb=False, control=False)
+            try:
+                await kc.wait_for_ready(timeout=self.warm_kernel_ready_timeout)
+            finally:
+                kc.stop_channels()
+        except Exception:
+            self.log.exception("Failed to start a warm %s kernel", kernel_name)
+            stats["failed"] += 1
+            if km.has_kernel:
+                self._stop_warm_kernel(warm)
+            return
+        stats["started"] += 1
+        if self.warm_kernel_ttl > 0:
+            warm.expiry = asyncio.get_running_loop().call_later(
+                self.warm_kernel_ttl, self._expire_warm_kernel, kernel_name, warm
+            )
+        self._warm_kernels.setdefault(kernel_name, deque()).append(warm)
+
+    def _expire_warm_kernel(self, kernel_name: str, warm: _WarmKernel) -> None:
+        pool = self._warm_kernels.get(kernel_name, deque())
+        if warm not in pool:
+            return
+        self.log.debug("Warm %s kernel expired", kernel_name)
+        pool.remove(warm)
+        self._warm_stats[kernel_name]["expired"] += 1
+        self._stop_warm_kernel(warm)
+        self._refill_warm_pool(kernel_name)
+
+    def _stop_warm_kernel(self, warm: _WarmKernel) -> None:
+        if warm.expiry is not None:
+            warm.expiry.cancel()
+        fut = asyncio.ensure_future(ensure_async(warm.km.shutdown_kernel(now=True)))
+        self._warm_stopping.add(fut)
+        fut.add_done_callback(self._warm_stopping.discard)
+
+    def _warm_kernel_matches(self, warm: _WarmKernel, kwargs: dict[str, t.Any]) -> bool:
+        """Whether a warm kernel can serve a start_kernel request with these kwargs."""
+        if set(kwargs) - {"cwd", "env", "kernel_id"}:
+            return False
+        cwd = kwargs.get("cwd")
+        if cwd is not None and os.path.abspath(cwd) != warm.cwd:
+            return False
+        env = kwargs.get("env")
+        if env is not None:
+            mutable = set(self.warm_kernel_mutable_env)
+            if {k: v for k, v in env.items() if k not in mutable} != {
+                k: v for k, v in warm.env.items() if k not in mutable
+            }:
+                return False
+        return True
+
+    async def _take_warm_kernel(
+        self, kernel_name: str, kwargs: dict[str, t.Any]
+    ) -> _WarmKernel | None:
+        """Take a live warm kernel out of the pool for a start_kernel request, if possible."""
+        stats = self._warm_stats.setdefault(kernel_name, Counter())
+        pool = self._warm_kernels.get(kernel_name, deque())
+        taken = None
+        while pool and self._warm_kernel_matches(pool[0], kwargs):
+            warm = pool.popleft()
+            if warm.expiry is not None:
+                warm.expiry.cancel()
+            if await ensure_async(warm.km.is_alive()):
+                taken = warm
+                break
+            self._stop_warm_kernel(warm)
+        self._refill_warm_pool(kernel_name)
+        stats["hits" if taken is not None else "misses"] += 1
+        return taken
+
+    async def _async_start_warm_kernel(
+        self, kernel_name: str | None, kwargs: dict[str, t.Any]
+    ) -> str | None:
+        """Hand out a warm kernel for a start_kernel request.
+
+        Returns the kernel's new id, or None if the request must start a new kernel.
+        """
+        if kernel_name is None:
+            kernel_name = self.default_kernel_name
+        if not self._background_tasks_supported or not self.warm_pool_size.get(kernel_name):
+            return None
+        warm = await self._take_warm_kernel(kernel_name, kwargs)
+        if warm is None:
+            return None
+        kernel_id = kwargs.pop("kernel_id", self.new_kernel_id(**kwargs))
+        if kernel_id in self:
+            self._stop_warm_kernel(warm)
+            raise DuplicateKernelError("Kernel already exists: %s" % kernel_id)
+        km = warm.km
+        self._rename_connection_file(km, kernel_id)
+        km.kernel_id = kernel_id
+        if km.provisioner is not None:
+            km.provisioner.kernel_id = kernel_id
+        if "env" in kwargs:
+            # used from the next restart on
+            km._launch_args["env"] = kwargs["env"]
+        self._kernels[kernel_id] = km
+        self._watch_activity(kernel_id, km)
+        self.log.info("Kernel started from the warm pool: %s", kernel_id)
+        return kernel_id
+
+    def _rename_connection_file(self, km: KernelManager, kernel_id: str) -> None:
+        """Name a warm kernel's connection file after the id it is handed out with."""
+        old_file = km.connection_file
+        if os.path.basename(old_file) != "kernel-%s.json" % km.kernel_id:
+            # not named by pre_start_kernel
+            return
+        new_file = os.path.join(os.path.dirname(old_file), "kernel-%s.json" % kernel_id)
+        if os.path.exists(old_file):
+            os.replace(old_file, new_file)
+        km.connection_file = new_file
+
     async def _async_start_kernel(self, *, kernel_name: str | None = None, **kwargs: t.Any) -> str:
         """Start a new kernel.
 
@@ -258,7 +616,13 @@ class MultiKernelManager(LoggingConfigurable):
         otherwise one will be generated using new_kernel_id().
 
         The kernel ID for the newly started kernel is returned.
+
+        If warm_pool_size is configured for the kernel name, an already started
+        kernel is handed out when the request allows it.
         """
+        kernel_id = await self._async_start_warm_kernel(kernel_name, kwargs)
+        if kernel_id is not None:
+            return kernel_id
         km, kernel_name, kernel_id = self.pre_start_kernel(kernel_name, kwargs)
         if not isinstance(km, KernelManager):
             self.log.warning(  # type:ignore[unreachable]
@@ -357,15 +721,131 @@ class MultiKernelManager(LoggingConfigurable):
 
         The kernel object is returned, or `None` if not found.
         """
-        return self._kernels.pop(kernel_id, None)
+        self._unwatch_activity(kernel_id)
+        self._close_socket_pools(kernel_id)
+        km = self._kernels.pop(kernel_id, None)
+        if km is not None and km._iopub_hub is not None:
+            km._iopub_hub.close()
+        return km
+
+    def _watch_activity(self, kernel_id: str, km: KernelManager) -> None:
+        """Track a kernel's activity from IOPub, to cull it once idle."""
+        if (
+            not self._background_tasks_supported
+            or self.idle_kernel_timeout <= 0
+            or kernel_id in self._activity_streams
+        ):
+            return
+        stream = km.connect_iopub()
+        if not isinstance(stream, ZMQStream):
+            self.log.warning(
+                "Cannot cull kernel %s: %s does not provide IOPub streams",
+                kernel_id,
+                type(km).__name__,
+            )
+            stream.close()
+            return
+        self._execution_states[kernel_id] = "starting"
+        # a session of our own, whose digest history other consumers
+        # of the kernel's messages don't add to
+        session = km.session.clone()
+        stream.on_recv(lambda msg_list: self._record_activity(kernel_id, session, msg_list))
+        self._activity_streams[kernel_id] = stream
+        deadline = time.monotonic() + self.idle_kernel_timeout
+        self._cull_deadlines[kernel_id] = deadline
+        self._push_cull_deadline(deadline, kernel_id)
+
+    def _unwatch_activity(self, kernel_id: str) -> None:
+        stream = self._activity_streams.pop(kernel_id, None)
+        if stream is not None:
+            stream.close()
+        # its heap entry is dropped when it comes up
+        self._cull_deadlines.pop(kernel_id, None)
+        self._execution_states.pop(kernel_id, None)
+
+    def _record_activity(self, kernel_id: str, session: Session, msg_list: list) -> None:
+        """Record an IOPub message arriving from a kernel."""
+        if kernel_id not in self._cull_deadlines:
+            return
+        self._cull_deadlines[kernel_id] = time.monotonic() + self.idle_kernel_timeout
+        _, fed_msg_list = session.feed_identities(msg_list)
+        msg = session.deserialize(fed_msg_list, content=False)
+        if msg["header"]["msg_type"] == "status":
+            state = session.unpack(msg["content"])["execution_state"]
+            self._execution_states[kernel_id] = state
+
+    def _push_cull_deadline(self, deadline: float, kernel_id: str) -> None:
+        heapq.heappush(self._cull_heap, (deadline, kernel_id))
+        if self._cull_heap[0][1] == kernel_id:
+            self._schedule_cull()
+
+    def _schedule_cull(self) -> None:
+        """Wake up at the earliest idle deadline, and not before."""
+        if self._cull_timer is not None:
+            self._cull_timer.cancel()
+            self._cull_timer = None
+        if self._cull_heap:
+            self._cull_timer = asyncio.get_running_loop().call_later(
+                self._cull_heap[0][0] - time.monotonic(), self._cull_idle_kernels
+            )
+
+    def _cull_idle_kernels(self) -> None:
+        self._cull_timer = None
+        now = time.monotonic()
+        while self._cull_heap and self._cull_heap[0][0] <= now:
+            _, kernel_id = heapq.heappop(self._cull_heap)
+            deadline = self._cull_deadlines.get(kernel_id)
+            if deadline is None:
+                # no longer watched
+                continue
+            if deadline <= now:
+                km = self._kernels[kernel_id]
+                state = self._execution_states.get(kernel_id, "unknown")
+                busy = state == "busy"
+                connected = getattr(km, "connections", 0) > 0
+                if (self.idle_kernel_cull_busy or not busy) and (
+                    self.idle_kernel_cull_connected or not connected
+                ):
+                    self._unwatch_activity(kernel_id)
+                    fut = asyncio.ensure_future(self._cull_kernel(kernel_id, state, connected))
+                    self._culling.add(fut)
+                    fut.add_done_callback(self._culling.discard)
+                    continue
+                # check again after another timeout
+                deadline = self._cull_deadlines[kernel_id] = now + self.idle_kernel_timeout
+            heapq.heappush(self._cull_heap, (deadline, kernel_id))
+        self._schedule_cull()
+
+    async def _cull_kernel(self, kernel_id: str, state: str, connected: bool) -> None:
+        if self._cull_semaphore is None:
+            self._cull_semaphore = asyncio.Semaphore(self.idle_kernel_cull_concurrency)
+        async with self._cull_semaphore:
+            if kernel_id not in self:
+                return
+            self.log.warning(
+                "Culling '%s'%s kernel %s, idle for more than %ss.",
+                state,
+                " connected" if connected else "",
+                kernel_id,
+                self.idle_kernel_timeout,
+            )
+            try:
+                await self._async_shutdown_kernel(kernel_id)
+            except Exception:
+                self.log.exception("Failed to cull kernel %s", kernel_id)
 
     async def _async_shutdown_all(self, now: bool = False) -> None:
-        """Shutdown all kernels."""
+        """Shutdown all kernels, including warm ones."""
+        await self._async_shutdown_warm_pool()
         kids = self.list_kernel_ids()
         kids += list(self._pending_kernels)
         kms = list(self._kernels.values())
-        futs = [self._async_shutdown_kernel(kid, now=now) for kid in set(kids)]
-        await asyncio.gather(*futs)
+        errors = await self._async_shutdown_kernels(
+            set(kids), now=now, concurrency=0, group=self.group_shutdown
+        )
+        for error in errors.values():
+            if error is not None:
+                raise error
         # If using pending kernels, the kernels will not have been fully shut down.
         if self._using_pending_kernels():
             for km in kms:
@@ -435,6 +915,226 @@ class MultiKernelManager(LoggingConfigurable):
 
     restart_kernel = run_sync(_async_restart_kernel)
 
+    async def _run_bounded(
+        self,
+        func: t.Callable[[t.Any], t.Awaitable],
+        items: list,
+        concurrency: int | None,
+        progress: t.Callable[[int, int], t.Any] | None,
+    ) -> list:
+        """Await func(item) for all items, at most `concurrency` at a time.
+
+        Returns the results in the order of items, with exceptions in place of
+        the results of failed calls. progress(done, total) is called as calls complete.
+        """
+        if concurrency is None:
+            concurrency = self.bulk_concurrency
+        if concurrency <= 0:
+            concurrency = len(items)
+        results: list = [None] * len(items)
+        pending = iter(enumerate(items))
+        done = 0
+
+        async def worker() -> None:
+            nonlocal done
+            for i, item in pending:
+                try:
+                    results[i] = await func(item)
+                except Exception as e:
+                    results[i] = e
+                done += 1
+                if progress is not None:
+                    progress(done, len(items))
+
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, len(items)))))
+        return results
+
+    async def _async_start_kernels(
+        self,
+        requests: t.Iterable[dict[str, t.Any]],
+        *,
+        concurrency: int | None = None,
+        progress: t.Callable[[int, int], t.Any] | None = None,
+    ) -> list[str | Exception]:
+        """Start several kernels, at most `concurrency` at a time.
+
+        Parameters
+        ==========
+        requests : iterable of dict
+            The keyword arguments of start_kernel for each kernel,
+            e.g. ``[{"kernel_name": "python3"}] * 10``.
+        concurrency : int, optional
+            Defaults to bulk_concurrency.
+        progress : callable, optional
+            Called as ``progress(done, total)`` each time a kernel has started or failed.
+
+        Returns
+        =======
+        The id of each kernel, or the exception raised while starting it,
+        in the order of requests.
+        """
+        return await self._run_bounded(
+            lambda kwargs: self._async_start_kernel(**kwargs),
+            [dict(kwargs) for kwargs in requests],
+            concurrency,
+            progress,
+        )
+
+    start_kernels = run_sync(_async_start_kernels)
+
+    async def _async_restart_kernels(
+        self,
+        kernel_ids: t.Iterable[str],
+        now: bool = False,
+        *,
+        concurrency: int | None = None,
+        progress: t.Callable[[int, int], t.Any] | None = None,
+    ) -> dict[str, Exception | None]:
+        """Restart several kernels, at most `concurrency` at a time.
+
+        See start_kernels for `concurrency` and `progress`.
+
+        Returns
+        =======
+        A dict mapping each kernel id to None, or to the exception raised while restarting it.
+        """
+        kernel_ids = list(kernel_ids)
+        results = await self._run_bounded(
+            lambda kernel_id: self._async_restart_kernel(kernel_id, now=now),
+            kernel_ids,
+            concurrency,
+            progress,
+        )
+        return dict(zip(kernel_ids, results))
+
+    restart_kernels = run_sync(_async_restart_kernels)
+
+    async def _async_shutdown_kernels(
+        self,
+        kernel_ids: t.Iterable[str],
+        now: bool = False,
+        *,
+        concurrency: int | None = None,
+        progress: t.Callable[[int, int], t.Any] | None = None,
+        group: bool = False,
+    ) -> dict[str, Exception | None]:
+        """Shutdown several kernels, at most `concurrency` at a time.
+
+        See start_kernels for `concurrency` and `progress`.
+
+        If `group` is True, running kernels are shut down together in stages instead,
+        see group_shutdown. `concurrency` then only applies to kernels that are
+        starting or failed to start.
+
+        Returns
+        =======
+        A dict mapping each kernel id to None, or to the exception raised while shutting it down.
+        """
+        kernel_ids = list(kernel_ids)
+
+        def shutdown(kernel_id: str) -> t.Awaitable:
+            return self._async_shutdown_kernel(kernel_id, now=now)
+
+        if not group:
+            results = await self._run_bounded(shutdown, kernel_ids, concurrency, progress)
+            return dict(zip(kernel_ids, results))
+
+        running = [kernel_id for kernel_id in kernel_ids if self._is_running(kernel_id)]
+        running_ids = set(running)
+        others = [kernel_id for kernel_id in kernel_ids if kernel_id not in running_ids]
+        done = 0
+
+        def count(_done: int, _total: int) -> None:
+            nonlocal done
+            done += 1
+            assert progress is not None
+            progress(done, len(kernel_ids))
+
+        counter = count if progress is not None else None
+
+        async def shutdown_running() -> list:
+            if not now:
+                await self._shutdown_group(running)
+            # The kernels that were asked to shut down have exited or are due to be
+            # killed, so that shutdown_kernel only kills the stragglers and cleans up.
+            return await self._run_bounded(
+                lambda kernel_id: self._async_shutdown_kernel(kernel_id, now=True),
+                running,
+                0,
+                counter,
+            )
+
+        running_results, other_results = await asyncio.gather(
+            shutdown_running(),
+            self._run_bounded(shutdown, others, concurrency, counter),
+        )
+        results_by_id = dict(zip(running, running_results))
+        results_by_id.update(zip(others, other_results))
+        return {kernel_id: results_by_id[kernel_id] for kernel_id in kernel_ids}
+
+    shutdown_kernels = run_sync(_async_shutdown_kernels)
+
+    async def _shutdown_group(self, kernel_ids: list[str], pollinterval: float = 0.1) -> None:
+        """Ask running kernels to shut down, and watch their exits in one loop.
+
+        This runs the stages of KernelManager.finish_shutdown for all kernels at once:
+        kernels still running after half their shutdown wait time are sent SIGTERM,
+        and those still running after the full wait are left for shutdown_kernel to kill.
+        """
+        loop = asyncio.get_running_loop()
+        running: dict[str, tuple[KernelManager, float]] = {}
+        for kernel_id in kernel_ids:
+            km = self.get_kernel(kernel_id)
+            km.shutting_down = True
+            km.stop_restarter()
+            try:
+                await ensure_async(km.interrupt_kernel())
+                await ensure_async(km.request_shutdown())
+            except Exception:
+                self.log.exception("Failed to request shutdown of kernel %s", kernel_id)
+                continue
+            waittime = max(km.shutdown_wait_time, 0)
+            if km.provisioner:  # Allow provisioner to override
+                waittime = km.provisioner.get_shutdown_wait_time(recommended=waittime)
+            running[kernel_id] = (km, waittime)
+
+        start = loop.time()
+        while running:
+            elapsed = loop.time() - start
+            for kernel_id, (km, waittime) in list(running.items()):
+                if not await ensure_async(km.is_alive()):
+                    del running[kernel_id]
+                    # Process is no longer alive, wait and clear
+                    if km.has_kernel:
+                        assert km.provisioner is not None
+                        await km.provisioner.wait()
+                elif elapsed >= waittime:
+                    self.log.debug("Kernel %s is taking too long to finish, killing", kernel_id)
+                    del running[kernel_id]
+                    km._shutdown_status = _ShutdownStatus.SigkillRequest
+                elif (
+                    elapsed >= waittime / 2
+                    and km._shutdown_status != _ShutdownStatus.SigtermRequest
+                ):
+                    self.log.debug("Kernel %s is taking too long to finish, terminating", kernel_id)
+                    km._shutdown_status = _ShutdownStatus.SigtermRequest
+                    await ensure_async(km._send_kernel_sigterm())
+            if running:
+                await asyncio.sleep(pollinterval)
+
+    def _is_running(self, kernel_id: str) -> bool:
+        """Whether a kernel has started, and its process is managed here."""
+        km = self._kernels.get(kernel_id)
+        return (
+            km is not None
+            and kernel_id not in self._pending_kernels
+            and km.owns_kernel
+            and km.has_kernel
+            and km.ready.done()
+            and not km.ready.cancelled()
+            and km.ready.exception() is None
+        )
+
     @kernel_method
     def is_alive(self, kernel_id: str) -> bool:  # type:ignore[empty-body]
         """Is the kernel alive.
@@ -584,6 +1284,125 @@ class MultiKernelManager(LoggingConfigurable):
         stream : zmq Socket or ZMQStream
         """
 
+    @kernel_method
+    def subscribe_iopub(  # type:ignore[empty-body]
+        self, kernel_id: str, maxsize: int | None = None, policy: str | None = None
+    ) -> IOPubSubscription:
+        """Subscribe to a kernel's IOPub messages, from a running event loop.
+
+        Subscriptions to a kernel share one connection to it.
+
+        Parameters
+        ==========
+        kernel_id : uuid
+            The id of the kernel
+        maxsize : int (optional)
+            The number of messages queued before the backpressure policy applies
+        policy : str (optional)
+            The backpressure policy: drop_oldest, drop_newest, disconnect or block
+
+        Returns
+        =======
+        subscription : IOPubSubscription
+        """
+
+    def lease_socket(self, kernel_id: str, channel: str) -> t.Any:
+        """Return a socket connected to a kernel's shell, control, iopub or stdin channel.
+
+        With ``socket_pool_size`` set, a socket given back with :meth:`release_socket`
+        is handed out again, rather than a new one being connected.
+        Pooled sockets are checked before they are handed out: closed sockets and
+        sockets connected to a former address of the kernel are discarded,
+        and messages left unread on them are dropped.
+
+        Parameters
+        ==========
+        kernel_id : uuid
+            The id of the kernel
+        channel : str
+            The name of the channel: shell, control, iopub or stdin
+
+        Returns
+        =======
+        stream : zmq Socket or ZMQStream
+        """
+        if channel not in _POOLED_CHANNELS:
+            msg = f"Cannot lease a socket for the {channel!r} channel"
+            raise ValueError(msg)
+        km = self.get_kernel(kernel_id)
+        self._evict_idle_sockets()
+        url = km._make_url(channel)
+        pool = self._socket_pools.get((kernel_id, channel), [])
+        while pool:
+            sock, pooled_url, _ = pool.pop()
+            raw = _zmq_socket(sock)
+            if raw is None:
+                continue
+            if pooled_url != url:
+                self.log.debug("Closing pooled %s socket of kernel %s: moved", channel, kernel_id)
+                sock.close()
+                continue
+            # drop replies and output meant for the previous lease
+            shadow = zmq.Socket.shadow(raw.underlying)
+            while shadow.poll(0):
+                shadow.recv_multipart()
+            if channel == "iopub":
+                raw.setsockopt(zmq.SUBSCRIBE, b"")
+            return sock
+        return getattr(km, f"connect_{channel}")()
+
+    def release_socket(self, kernel_id: str, channel: str, sock: t.Any) -> None:
+        """Give back a socket from :meth:`lease_socket`, once it is no longer used.
+
+        The socket is kept for the next lease of the channel if the pool has room,
+        otherwise it is closed. Callers should have received the replies to their
+        requests first, since later replies are dropped.
+        """
+        self._evict_idle_sockets()
+        raw = _zmq_socket(sock)
+        if raw is None:
+            return
+        pool = self._socket_pools.get((kernel_id, channel), [])
+        if kernel_id not in self._kernels or len(pool) >= self.socket_pool_size:
+            sock.close()
+            return
+        if isinstance(sock, ZMQStream):
+            sock.stop_on_recv()
+            sock.stop_on_send()
+        if channel == "iopub":
+            # stop the kernel from sending us output while we are idle
+            raw.setsockopt(zmq.UNSUBSCRIBE, b"")
+        km = self.get_kernel(kernel_id)
+        self._socket_pools.setdefault((kernel_id, channel), pool)
+        pool.append((sock, km._make_url(channel), time.monotonic()))
+
+    @contextmanager
+    def leased_socket(self, kernel_id: str, channel: str) -> t.Iterator[t.Any]:
+        """Lease a socket for the duration of a with block."""
+        sock = self.lease_socket(kernel_id, channel)
+        try:
+            yield sock
+        finally:
+            self.release_socket(kernel_id, channel, sock)
+
+    def _evict_idle_sockets(self) -> None:
+        """Close pooled sockets idle for longer than socket_pool_idle_timeout."""
+        if self.socket_pool_idle_timeout <= 0:
+            return
+        cutoff = time.monotonic() - self.socket_pool_idle_timeout
+        for pool in self._socket_pools.values():
+            # sockets are appended as they are released, so the oldest come first
+            expired = 0
+            while expired < len(pool) and pool[expired][2] < cutoff:
+                pool[expired][0].close()
+                expired += 1
+            del pool[:expired]
+
+    def _close_socket_pools(self, kernel_id: str) -> None:
+        for channel in _POOLED_CHANNELS:
+            for sock, _, _ in self._socket_pools.pop((kernel_id, channel), []):
+                sock.close()
+
     def new_kernel_id(self, **kwargs: t.Any) -> str:
         """
         Returns the id to associate with the kernel for this request. Subclasses may override
@@ -611,6 +1430,8 @@ class AsyncMultiKernelManager(MultiKernelManager):
 
     context = Instance("zmq.asyncio.Context")
 
+    _background_tasks_supported = True
+
     @default("context")
     def _context_default(self) -> zmq.asyncio.Context:
         self._created_context = True
@@ -620,3 +1441,8 @@ class AsyncMultiKernelManager(MultiKernelManager):
     restart_kernel: t.Callable[..., t.Awaitable] = MultiKernelManager._async_restart_kernel  # type:ignore[assignment]
     shutdown_kernel: t.Callable[..., t.Awaitable] = MultiKernelManager._async_shutdown_kernel  # type:ignore[assignment]
     shutdown_all: t.Callable[..., t.Awaitable] = MultiKernelManager._async_shutdown_all  # type:ignore[assignment]
+    start_kernels: t.Callable[..., t.Awaitable] = MultiKernelManager._async_start_kernels  # type:ignore[assignment]
+    restart_kernels: t.Callable[..., t.Awaitable] = MultiKernelManager._async_restart_kernels  # type:ignore[assignment]
+    shutdown_kernels: t.Callable[..., t.Awaitable] = MultiKernelManager._async_shutdown_kernels  # type:ignore[assignment]
+    fill_warm_pool: t.Callable[..., t.Awaitable] = MultiKernelManager._async_fill_warm_pool  # type:ignore[assignment]
+    shutdown_warm_pool: t.Callable[..., t.Awaitable] = MultiKernelManager._async_shutdown_warm_pool  # type:ignore[assignment]
@@ -2,6 +2,9 @@
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
 import glob
+import hashlib
+import json
+import os
 import sys
 from os import getenv, path
 from typing import Any
@@ -12,11 +15,31 @@ if sys.version_info < (3, 10):  # pragma: no cover
 else:  # pragma: no cover
     from importlib.metadata import EntryPoint, entry_points
 
+from jupyter_core.paths import jupyter_data_dir
 from traitlets.config import SingletonConfigurable, Unicode, default
 
+from .._version import __version__
 from .provisioner_base import KernelProvisionerBase
 
 
+def _environment_fingerprint() -> list[Any]:
+    """Identify the installed distributions, which provide the entry points.
+
+    Installing or removing a distribution changes the mtime of its
+    directory on sys.path. The current directory is left out, as files
+    are created there all the time.
+    """
+    fingerprint: list[Any] = [sys.executable, sys.version, __version__]
+    for entry in sys.path:
+        if not entry:
+            continue
+        try:
+            fingerprint.append([entry, os.stat(entry).st_mtime_ns])
+        except OSError:
+            fingerprint.append([entry, None])
+    return fingerprint
+
+
 class KernelProvisionerFactory(SingletonConfigurable):
     """
     :class:`KernelProvisionerFactory` is responsible for creating provisioner instances.
@@ -47,13 +70,61 @@ class KernelProvisionerFactory(SingletonConfigurable):
         """The default provisioner name."""
         return getenv(self.default_provisioner_name_env, "local-provisioner")
 
+    entry_point_cache_file = Unicode(
+        config=True,
+        help="""File in which to keep the provisioner entry points found in this environment,
+        so that they are not looked up again by later processes.
+
+        The file is ignored once the Python environment changes. By default, each
+        Python environment sharing the Jupyter data directory has its own file,
+        named after sys.prefix and sys.executable.
+        Set to an empty string to always look up entry points.""",
+    )
+
+    @default("entry_point_cache_file")
+    def _entry_point_cache_file_default(self) -> str:
+        environment = f"{sys.prefix}\0{sys.executable}".encode()
+        key = hashlib.sha256(environment).hexdigest()[:16]
+        return path.join(jupyter_data_dir(), f"kernel_provisioners-{key}.json")
+
     def __init__(self, **kwargs: Any) -> None:
         """Initialize a kernel provisioner factory."""
         super().__init__(**kwargs)
+        # provisioner name -> environment fingerprint in which it was not found
+        self._missing: dict[str, list[Any]] = {}
 
-        for ep in KernelProvisionerFactory._get_all_provisioners():
+        for ep in self._load_provisioners():
             self.provisioners[ep.name] = ep
 
+    def _load_provisioners(self) -> list[EntryPoint]:
+        """Return all provisioner entry points, from the cache file while it is current."""
+        fingerprint = _environment_fingerprint()
+        cache_file = self.entry_point_cache_file
+        if cache_file:
+            try:
+                with open(cache_file, encoding="utf-8") as f:
+                    cached = json.load(f)
+                if cached["fingerprint"] == fingerprint:
+                    return [
+                        EntryPoint(name, value, self.GROUP_NAME)
+                        for name, value in cached["provisioners"].items()
+                    ]
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+
+        eps = list(KernelProvisionerFactory._get_all_provisioners())
+        if cache_file:
+            cached = {"fingerprint": fingerprint, "provisioners": {ep.name: ep.value for ep in eps}}
+            tmp_file = f"{cache_file}.{os.getpid()}"
+            try:
+                os.makedirs(path.dirname(cache_file), exist_ok=True)
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    json.dump(cached, f)
+                os.replace(tmp_file, cache_file)
+            except OSError as e:
+                self.log.debug("Could not write provisioner cache %s: %s", cache_file, e)
+        return eps
+
     def is_provisioner_available(self, kernel_spec: Any) -> bool:
         """
         Reads the associated ``kernel_spec`` to determine the provisioner and returns whether it
@@ -109,16 +180,23 @@ class KernelProvisionerFactory(SingletonConfigurable):
 
         If the given provisioner is not in the current set of loaded provisioners an attempt
         is made to fetch the named entry point and, if successful, loads it into the cache.
+        A provisioner which is not found is not looked up again until the Python environment
+        changes.
 
         :param provisioner_name:
         :return:
         """
         is_available = True
         if provisioner_name not in self.provisioners:
+            fingerprint = _environment_fingerprint()
+            if self._missing.get(provisioner_name) == fingerprint:
+                return False
             try:
                 ep = self._get_provisioner(provisioner_name)
                 self.provisioners[provisioner_name] = ep  # Update cache
+                self._missing.pop(provisioner_name, None)
             except Exception:
+                self._missing[provisioner_name] = fingerprint
                 is_available = False
         return is_available
 
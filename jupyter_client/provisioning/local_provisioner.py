@@ -5,9 +5,16 @@ import asyncio
 import os
 import signal
 import sys
+import time
 from typing import TYPE_CHECKING, Any, Optional
 
-from ..connect import KernelConnectionInfo, LocalPortCache
+import zmq
+import zmq.asyncio
+from traitlets import Bool, Float
+
+from jupyter_core.paths import jupyter_runtime_dir
+
+from ..connect import KernelConnectionInfo, LocalIPCPathCache, LocalPortCache, port_names
 from ..launcher import launch_kernel
 from ..localinterfaces import is_local_ip, local_ips
 from .provisioner_base import KernelProvisionerBase
@@ -31,6 +38,27 @@ class LocalProvisioner(KernelProvisionerBase):  # type:ignore[misc]
     pgid = None
     ip = None
     ports_cached = False
+    ipc_path = None
+    _registration_socket = None
+
+    handshake = Bool(
+        False,
+        config=True,
+        help="""Whether the kernel binds ports of its choice and reports them back.
+
+        Instead of choosing free ports for the kernel, which another process may
+        take before the kernel binds them, the connection file gets the port of a
+        registration socket owned by the manager (``registration_port``). The kernel
+        binds any port left as 0, then sends a signed ``registration_request`` with
+        its ports, which the manager answers with a ``registration_reply``.
+        Only for the tcp transport, and for kernels supporting it.""",
+    )
+
+    handshake_timeout = Float(
+        60.0,
+        config=True,
+        help="Seconds to wait for the kernel to report its ports, when using the handshake.",
+    )
 
     @property
     def has_process(self) -> bool:
@@ -43,16 +71,39 @@ class LocalProvisioner(KernelProvisionerBase):  # type:ignore[misc]
             ret = self.process.poll()  # type:ignore[unreachable]
         return ret
 
+    def get_exit_fd(self) -> Optional[int]:
+        """Get a pidfd for the kernel process, on Linux 5.3+."""
+        if self.process is None or not hasattr(os, "pidfd_open"):
+            return None
+        try:
+            return os.pidfd_open(self.process.pid)
+        except OSError:
+            # not supported by the running kernel, or the process is gone
+            return None
+
     async def wait(self) -> Optional[int]:
         """Wait for the provisioner process."""
         ret = 0
         if self.process:
-            # Use busy loop at 100ms intervals, polling until the process is
-            # not alive.  If we find the process is no longer alive, complete
-            # its cleanup via the blocking wait().  Callers are responsible for
-            # issuing calls to wait() using a timeout (see kill()).
-            while await self.poll() is None:  # type:ignore[unreachable]
-                await asyncio.sleep(0.1)
+            # Callers are responsible for issuing calls to wait()
+            # using a timeout (see kill()).
+            exit_fd = self.get_exit_fd()  # type:ignore[unreachable]
+            if exit_fd is not None:
+                # the pidfd becomes readable when the process exits
+                loop = asyncio.get_running_loop()
+                exited = loop.create_future()
+                loop.add_reader(exit_fd, lambda: exited.done() or exited.set_result(None))
+                try:
+                    if await self.poll() is None:
+                        await exited
+                finally:
+                    loop.remove_reader(exit_fd)
+                    os.close(exit_fd)
+            else:
+                # Use busy loop at 100ms intervals, polling until the process is
+                # not alive.
+                while await self.poll() is None:
+                    await asyncio.sleep(0.1)
 
             # Process is no longer alive, wait and clear
             ret = self.process.wait()
@@ -139,6 +190,13 @@ class LocalProvisioner(KernelProvisionerBase):  # type:ignore[misc]
 
     async def cleanup(self, restart: bool = False) -> None:
         """Clean up the resources used by the provisioner and optionally restart."""
+        self._close_registration_socket()
+        if self.ipc_path and not restart:
+            # the sockets were removed by the manager, the next start chooses again
+            LocalIPCPathCache.instance().return_path(self.ipc_path)
+            self.ipc_path = None
+            if self.parent:
+                self.parent.transport = "auto"
         if self.ports_cached and not restart:
             # provisioner is about to be destroyed, return cached ports
             lpc = LocalPortCache.instance()
@@ -166,6 +224,8 @@ class LocalProvisioner(KernelProvisionerBase):  # type:ignore[misc]
         # This should be considered temporary until a better division of labor can be defined.
         km = self.parent
         if km:
+            if km.transport == "auto":
+                self._choose_transport()
             if km.transport == "tcp" and not is_local_ip(km.ip):
                 msg = (
                     "Can only launch a kernel on a local interface. "
@@ -179,20 +239,26 @@ class LocalProvisioner(KernelProvisionerBase):  # type:ignore[misc]
             extra_arguments = kwargs.pop("extra_arguments", [])
 
             # write connection file / get default ports
-            # TODO - change when handshake pattern is adopted
-            if km.cache_ports and not self.ports_cached:
+            registration: dict[str, int] = {}
+            if self.handshake and km.transport == "tcp":
+                # the kernel binds ports itself, and reports them to the registration socket
+                registration["registration_port"] = self._bind_registration_socket()
+                km.cleanup_connection_file()
+            elif km.cache_ports and not self.ports_cached:
                 lpc = LocalPortCache.instance()
-                km.shell_port = lpc.find_available_port(km.ip)
-                km.iopub_port = lpc.find_available_port(km.ip)
-                km.stdin_port = lpc.find_available_port(km.ip)
-                km.hb_port = lpc.find_available_port(km.ip)
-                km.control_port = lpc.find_available_port(km.ip)
+                (
+                    km.shell_port,
+                    km.iopub_port,
+                    km.stdin_port,
+                    km.hb_port,
+                    km.control_port,
+                ) = lpc.find_available_ports(km.ip, 5)
                 self.ports_cached = True
             if "env" in kwargs:
                 jupyter_session = kwargs["env"].get("JPY_SESSION_NAME", "")
-                km.write_connection_file(jupyter_session=jupyter_session)
+                km.write_connection_file(jupyter_session=jupyter_session, **registration)
             else:
-                km.write_connection_file()
+                km.write_connection_file(**registration)
             self.connection_info = km.get_connection_info()
 
             kernel_cmd = km.format_kernel_cmd(
@@ -217,8 +283,86 @@ class LocalProvisioner(KernelProvisionerBase):  # type:ignore[misc]
 
         self.pid = self.process.pid
         self.pgid = pgid
+        if self._registration_socket is not None:
+            try:
+                await self._wait_for_registration()
+            except BaseException:
+                # don't leave the kernel running without its ports
+                await self.kill()
+                await self.wait()
+                raise
+            finally:
+                self._close_registration_socket()
         return self.connection_info
 
+    def _choose_transport(self) -> None:
+        """Resolve the "auto" transport: ipc sockets in the runtime directory, if possible."""
+        km = self.parent
+        if zmq.has("ipc"):
+            runtime_dir = jupyter_runtime_dir()
+            os.makedirs(runtime_dir, mode=0o700, exist_ok=True)
+            self.ipc_path = LocalIPCPathCache.instance().find_available_path(runtime_dir)
+        if self.ipc_path:
+            km.transport = "ipc"
+            km.ip = self.ipc_path
+        else:
+            self.log.debug("Using tcp for kernel %s, ipc is not available", self.kernel_id)
+            km.transport = "tcp"
+
+    def _bind_registration_socket(self) -> int:
+        """Bind the socket on which the kernel reports its ports, returning its port."""
+        km = self.parent
+        self._close_registration_socket()
+        context = zmq.asyncio.Context.shadow(km.context.underlying)
+        self._registration_socket = context.socket(zmq.ROUTER)
+        # long enough to deliver the reply to the kernel
+        self._registration_socket.linger = 1000
+        return self._registration_socket.bind_to_random_port(f"tcp://{km.ip}")
+
+    def _close_registration_socket(self) -> None:
+        if self._registration_socket is not None:
+            self._registration_socket.close()
+            self._registration_socket = None
+
+    async def _wait_for_registration(self) -> None:
+        """Wait for the kernel to report its ports, and use them as connection info."""
+        assert self._registration_socket is not None
+        session = self.parent.session
+        deadline = time.monotonic() + self.handshake_timeout
+        while True:
+            if await self._registration_socket.poll(100):
+                msg_list = await self._registration_socket.recv_multipart()
+                try:
+                    idents, msg_list = session.feed_identities(msg_list)
+                    request = session.deserialize(msg_list)
+                except Exception as e:
+                    self.log.warning("Ignoring invalid kernel registration message: %s", e)
+                    continue
+                if request["msg_type"] != "registration_request":
+                    continue
+                ports = {name: request["content"].get(name, 0) for name in port_names}
+                if not all(isinstance(port, int) and port > 0 for port in ports.values()):
+                    self.log.warning("Ignoring kernel registration without ports: %s", ports)
+                    continue
+                session.send(
+                    self._registration_socket,
+                    "registration_reply",
+                    {"status": "ok"},
+                    parent=request,
+                    ident=idents,
+                )
+                self.connection_info = dict(self.connection_info, **ports)
+                # written again by the manager, with these ports
+                self.parent.cleanup_connection_file()
+                self.log.debug("Kernel %s registered ports %s", self.kernel_id, ports)
+                return
+            if await self.poll() is not None:
+                msg = "Kernel exited before reporting its ports"
+                raise RuntimeError(msg)
+            if time.monotonic() > deadline:
+                msg = f"Kernel did not report its ports within {self.handshake_timeout}s"
+                raise TimeoutError(msg)
+
     @staticmethod
     def _scrub_kwargs(kwargs: dict[str, Any]) -> dict[str, Any]:
         """Remove any keyword arguments that Popen does not tolerate."""
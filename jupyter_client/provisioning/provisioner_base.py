@@ -124,6 +124,19 @@ class KernelProvisionerBase(  # type:ignore[misc]
         """
         pass
 
+    def get_exit_fd(self) -> Optional[int]:
+        """
+        Returns a file descriptor that becomes readable when the kernel process exits.
+
+        This method is called from the kernel restarter, which reacts to the kernel's
+        exit instead of polling it when a descriptor is returned. The caller owns
+        the descriptor and is responsible for closing it.
+
+        This method is optional. The default implementation returns None,
+        in which case the kernel is polled.
+        """
+        return None
+
     async def shutdown_requested(self, restart: bool = False) -> None:
         """
         Allows the provisioner to determine if the kernel's shutdown has been requested.
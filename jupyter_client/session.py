@@ -7,6 +7,7 @@ Also defined here are utilities for working with Sessions:
 * A SessionFactory to be used as a base class for configurables that work with
 Sessions.
 * A Message object for convenience that allows attribute-access to the msg dict.
+* A LazyMessage object, a msg dict whose parts are unpacked on first access.
 """
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
@@ -16,13 +17,15 @@ import hashlib
 import hmac
 import json
 import logging
+import math
 import os
 import pickle
 import pprint
-import random
 import typing as t
 import warnings
 from binascii import b2a_hex
+from collections import deque
+from collections.abc import MutableMapping
 from datetime import datetime, timezone
 from hmac import compare_digest
 
@@ -50,7 +53,25 @@ from zmq.eventloop.zmqstream import ZMQStream
 
 from ._version import protocol_version
 from .adapter import adapt
-from .jsonutil import extract_dates, json_clean, json_default, squash_dates
+from .jsonutil import (
+    extract_header_dates,
+    json_clean,
+    json_default,
+    squash_dates,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type:ignore[assignment]
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None  # type:ignore[assignment]
+else:
+    _msgspec_encoder = msgspec.json.Encoder(enc_hook=json_default)
+    _msgspec_decoder = msgspec.json.Decoder()
 
 PICKLE_PROTOCOL = pickle.DEFAULT_PROTOCOL
 
@@ -117,10 +138,10 @@ def json_packer(obj: t.Any) -> bytes:
         return packed
 
 
-def json_unpacker(s: str | bytes) -> t.Any:
-    """Convert a json bytes or string to an object."""
-    if isinstance(s, bytes):
-        s = s.decode("utf8", "replace")
+def json_unpacker(s: str | bytes | memoryview) -> t.Any:
+    """Convert a json bytes-like object or string to an object."""
+    if not isinstance(s, str):
+        s = str(s, "utf8", "replace")
     return json.loads(s)
 
 
@@ -131,6 +152,110 @@ def pickle_packer(o: t.Any) -> bytes:
 
 pickle_unpacker = pickle.loads
 
+
+def _has_nonfinite(obj: t.Any) -> bool:
+    """Whether a json object contains nan or inf, which json_packer handles specially."""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_nonfinite(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_nonfinite(item) for item in obj)
+    return False
+
+
+def orjson_packer(obj: t.Any) -> bytes:
+    """Convert a json object to bytes using orjson.
+
+    datetimes are passed through to :func:`json_default`, so they are formatted
+    exactly as :func:`json_packer` would.
+    Objects orjson cannot handle (e.g. non-str keys, lone surrogates)
+    fall back to :func:`json_packer`, as do objects containing nan or inf,
+    which orjson would turn into null.
+    """
+    try:
+        packed = orjson.dumps(obj, default=json_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    except TypeError:
+        return json_packer(obj)
+    if b"null" in packed and _has_nonfinite(obj):
+        return json_packer(obj)
+    return packed
+
+
+def orjson_unpacker(s: str | bytes) -> t.Any:
+    """Convert a json bytes or string to an object using orjson."""
+    try:
+        return orjson.loads(s)
+    except ValueError:
+        # invalid utf8, let json_unpacker replace the bad bytes
+        return json_unpacker(s)
+
+
+def msgspec_packer(obj: t.Any) -> bytes:
+    """Convert a json object to bytes using msgspec.
+
+    Objects msgspec cannot handle fall back to :func:`json_packer`,
+    as do objects containing nan or inf, which msgspec would turn into null.
+    """
+    try:
+        packed = _msgspec_encoder.encode(obj)
+    except (TypeError, ValueError):
+        return json_packer(obj)
+    if b"null" in packed and _has_nonfinite(obj):
+        return json_packer(obj)
+    return packed
+
+
+def msgspec_unpacker(s: str | bytes) -> t.Any:
+    """Convert a json bytes or string to an object using msgspec."""
+    try:
+        return _msgspec_decoder.decode(s)
+    except (msgspec.DecodeError, ValueError):
+        # invalid utf8, let json_unpacker replace the bad bytes
+        return json_unpacker(s)
+
+
+# named serialization backends: name -> (module, packer, unpacker)
+# a backend is only available if its module could be imported.
+# 'auto' picks the first available JSON backend in _auto_json_backends.
+packer_backends: dict[str, tuple[t.Any, t.Callable, t.Callable]] = {
+    "json": (json, json_packer, json_unpacker),
+    "pickle": (pickle, pickle_packer, pickle_unpacker),
+    "orjson": (orjson, orjson_packer, orjson_unpacker),
+    "msgspec": (msgspec, msgspec_packer, msgspec_unpacker),
+}
+_auto_json_backends = ("orjson", "msgspec", "json")
+# the built-in unpackers accept any bytes-like object, e.g. a view of a zmq.Frame
+buffer_unpackers = {unpacker for _, _, unpacker in packer_backends.values()}
+
+
+def available_packer_backends() -> list[str]:
+    """Return the names of the serialization backends that can be used."""
+    return [name for name, (module, _, _) in packer_backends.items() if module is not None]
+
+
+def select_packer_backend(name: str) -> tuple[t.Callable, t.Callable] | None:
+    """Return the (packer, unpacker) pair for a named backend.
+
+    'auto' selects the fastest installed JSON backend.
+    Returns None if `name` is not a named backend (i.e. it is an import string).
+    Raises ImportError if the named backend is not installed.
+    """
+    name = name.lower()
+    if name == "auto":
+        for candidate in _auto_json_backends:
+            module, packer, unpacker = packer_backends[candidate]
+            if module is not None:
+                return packer, unpacker
+    if name not in packer_backends:
+        return None
+    module, packer, unpacker = packer_backends[name]
+    if module is None:
+        msg = f"The {name!r} serialization backend requires the {name!r} package"
+        raise ImportError(msg)
+    return packer, unpacker
+
+
 default_packer = json_packer
 default_unpacker = json_unpacker
 
@@ -269,6 +394,77 @@ class Message:
         return self.__dict__[k]
 
 
+class _PackedPart:
+    """A message part that has not been unpacked yet."""
+
+    __slots__ = ("loader", "raw")
+
+    def __init__(self, raw: bytes | memoryview, loader: t.Callable[[t.Any], t.Any]) -> None:
+        self.raw = raw
+        self.loader = loader
+
+
+class LazyMessage(MutableMapping):
+    """A message dict whose packed parts are unpacked on first access.
+
+    Returned by ``Session.deserialize(msg_list, lazy=True)``.
+    It behaves like the nested message dict returned by ``deserialize``,
+    but parent_header, metadata and content are only unpacked
+    the first time they are looked up.
+    Routers and proxies that only look at the header
+    never pay for unpacking the rest of the message.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty lazy message."""
+        self._items: dict[str, t.Any] = {}
+
+    def set_packed(
+        self, key: str, raw: bytes | memoryview, loader: t.Callable[[t.Any], t.Any]
+    ) -> None:
+        """Store a packed part, to be unpacked with `loader` when `key` is first read."""
+        self._items[key] = _PackedPart(raw, loader)
+
+    def is_unpacked(self, key: str) -> bool:
+        """Whether `key` has been unpacked (or was never packed)."""
+        return not isinstance(self._items[key], _PackedPart)
+
+    def packed(self, key: str) -> bytes | memoryview | None:
+        """Return the still-packed bytes for `key`, or None if it has been unpacked."""
+        value = self._items.get(key)
+        if isinstance(value, _PackedPart):
+            return value.raw
+        return None
+
+    def __getitem__(self, key: str) -> t.Any:
+        value = self._items[key]
+        if isinstance(value, _PackedPart):
+            value = self._items[key] = value.loader(value.raw)
+        return value
+
+    def __setitem__(self, key: str, value: t.Any) -> None:
+        self._items[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._items[key]
+
+    def __iter__(self) -> t.Iterator[str]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._items
+
+    def copy(self) -> dict[str, t.Any]:
+        """Return a plain dict copy, unpacking every part."""
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return repr(self.copy())
+
+
 def msg_header(
     msg_id: str, msg_type: str, username: str, session: Session | str
 ) -> dict[str, t.Any]:
@@ -298,6 +494,46 @@ def extract_header(msg_or_header: dict[str, t.Any]) -> dict[str, t.Any]:
     return h
 
 
+class HMACSigner:
+    """Sign message parts with an HMAC digest, reusing precomputed key state.
+
+    The keyed inner and outer hash states are computed once per key,
+    so signing a message only copies two hash objects
+    instead of building a new :class:`hmac.HMAC` from ``HMAC.copy()``.
+    Message parts can be any bytes-like objects,
+    including :class:`zmq.Frame` buffers, which are hashed without copying.
+    """
+
+    def __init__(self, key: bytes, digest_mod: t.Callable) -> None:
+        """Precompute the inner and outer states for `key`."""
+        inner = digest_mod()
+        blocksize = getattr(inner, "block_size", 64)
+        if blocksize < 16:
+            # same fallback as hmac.HMAC for hashes with tiny block sizes
+            blocksize = 64
+        if len(key) > blocksize:
+            key = digest_mod(key).digest()
+        key = key.ljust(blocksize, b"\0")
+        inner.update(key.translate(hmac.trans_36))
+        outer = digest_mod()
+        outer.update(key.translate(hmac.trans_5C))
+        self._inner = inner
+        self._outer = outer
+
+    def digest(self, parts: t.Iterable[t.Any]) -> bytes:
+        """Return the raw HMAC digest of the concatenated `parts`."""
+        h = self._inner.copy()
+        for part in parts:
+            h.update(part)
+        outer = self._outer.copy()
+        outer.update(h.digest())
+        return outer.digest()
+
+    def sign(self, parts: t.Iterable[t.Any]) -> bytes:
+        """Return the hex-encoded HMAC digest of `parts`, as bytes."""
+        return b2a_hex(self.digest(parts))
+
+
 class Session(Configurable):
     """Object for handling serialization and sending of messages.
 
@@ -315,9 +551,11 @@ class Session(Configurable):
 
     debug : bool
         whether to trigger extra debugging statements
-    packer/unpacker : str : 'json', 'pickle' or import_string
+    packer/unpacker : str : 'json', 'pickle', 'orjson', 'msgspec', 'auto' or import_string
         importstrings for methods to serialize message parts.  If just
         'json' or 'pickle', predefined JSON and pickle packers will be used.
+        'orjson' and 'msgspec' use those packages for faster JSON,
+        and 'auto' picks the fastest one installed.
         Otherwise, the entire importstring must be used.
 
         The functions must accept at least valid JSON input, and output *bytes*.
@@ -354,20 +592,21 @@ class Session(Configurable):
         "json",
         config=True,
         help="""The name of the packer for serializing messages.
-            Should be one of 'json', 'pickle', or an import name
-            for a custom callable serializer.""",
+            Should be one of 'json', 'pickle', 'orjson', 'msgspec', 'auto',
+            or an import name for a custom callable serializer.
+
+            'orjson' and 'msgspec' are faster JSON backends that require the
+            corresponding package to be installed.
+            'auto' selects the fastest installed JSON backend,
+            falling back on 'json'.""",
     )
 
     @observe("packer")
     def _packer_changed(self, change: t.Any) -> None:
         new = change["new"]
-        if new.lower() == "json":
-            self.pack = json_packer
-            self.unpack = json_unpacker
-            self.unpacker = new
-        elif new.lower() == "pickle":
-            self.pack = pickle_packer
-            self.unpack = pickle_unpacker
+        backend = select_packer_backend(new)
+        if backend is not None:
+            self.pack, self.unpack = backend
             self.unpacker = new
         else:
             self.pack = import_item(str(new))
@@ -382,13 +621,9 @@ class Session(Configurable):
     @observe("unpacker")
     def _unpacker_changed(self, change: t.Any) -> None:
         new = change["new"]
-        if new.lower() == "json":
-            self.pack = json_packer
-            self.unpack = json_unpacker
-            self.packer = new
-        elif new.lower() == "pickle":
-            self.pack = pickle_packer
-            self.unpack = pickle_unpacker
+        backend = select_packer_backend(new)
+        if backend is not None:
+            self.pack, self.unpack = backend
             self.packer = new
         else:
             self.unpack = import_item(str(new))
@@ -460,9 +695,18 @@ class Session(Configurable):
 
     auth = Instance(hmac.HMAC, allow_none=True)
 
+    # the fast signer for auth, when auth was built from key.
+    # An auth assigned directly has no known key, so it signs via auth.copy().
+    _signer: HMACSigner | None = None
+
+    @observe("auth")
+    def _auth_changed(self, change: t.Any) -> None:
+        self._signer = None
+
     def _new_auth(self) -> None:
         if self.key:
             self.auth = hmac.HMAC(self.key, digestmod=self.digest_mod)
+            self._signer = HMACSigner(self.key, self.digest_mod)
         else:
             self.auth = None
 
@@ -472,10 +716,17 @@ class Session(Configurable):
         config=True,
         help="""The maximum number of digests to remember.
 
-        The digest history will be culled when it exceeds this value.
+        The oldest digests are forgotten when the history exceeds this value.
         """,
     )
 
+    # digests in digest_history, oldest first
+    _digest_order = Instance(deque, ())
+
+    @observe("digest_history")
+    def _digest_history_changed(self, change: t.Any) -> None:
+        self._digest_order = deque(change["new"])
+
     keyfile = Unicode("", config=True, help="""path to file containing execution key.""")
 
     @observe("keyfile")
@@ -505,6 +756,17 @@ class Session(Configurable):
         if not callable(new):
             raise TypeError("unpacker must be callable, not %s" % type(new))
 
+    zero_copy_recv = Bool(
+        False,
+        config=True,
+        help="""Whether channels receive messages without copying them.
+
+        Message parts are then unpacked straight from the zmq frames,
+        and binary buffers are memoryviews backed by the original frames,
+        which avoids copying large buffers.
+        """,
+    )
+
     # thresholds:
     copy_threshold = Integer(
         2**16,
@@ -533,9 +795,11 @@ class Session(Configurable):
 
         debug : bool
             whether to trigger extra debugging statements
-        packer/unpacker : str : 'json', 'pickle' or import_string
+        packer/unpacker : str : 'json', 'pickle', 'orjson', 'msgspec', 'auto' or import_string
             importstrings for methods to serialize message parts.  If just
             'json' or 'pickle', predefined JSON and pickle packers will be used.
+            'orjson' and 'msgspec' use those packages for faster JSON,
+            and 'auto' picks the fastest one installed.
             Otherwise, the entire importstring must be used.
 
             The functions must accept at least valid JSON input, and output
@@ -591,8 +855,8 @@ class Session(Configurable):
         for name in self.traits():
             setattr(new_session, name, getattr(self, name))
         # fork digest_history
-        new_session.digest_history = set()
-        new_session.digest_history.update(self.digest_history)
+        new_session.digest_history = set(self.digest_history)
+        new_session._digest_order = deque(self._digest_order)
         return new_session
 
     message_count = 0
@@ -682,6 +946,8 @@ class Session(Configurable):
         """
         if self.auth is None:
             return b""
+        if self._signer is not None:
+            return self._signer.sign(msg_list)
         h = self.auth.copy()
         for m in msg_list:
             h.update(m)
@@ -714,12 +980,17 @@ class Session(Configurable):
             In this list, the ``p_*`` entities are the packed or serialized
             versions, so if JSON is used, these are utf8 encoded JSON strings.
         """
-        content = msg.get("content", {})
+        content: t.Any = None
+        if isinstance(msg, LazyMessage):
+            # relaying a lazy message whose content was never unpacked
+            content = msg.packed("content")
+        if content is None:
+            content = msg.get("content", {})
         if content is None:
             content = self.none
         elif isinstance(content, dict):
             content = self.pack(content)
-        elif isinstance(content, bytes):
+        elif isinstance(content, (bytes, memoryview)):
             # content is already packed, as in a relayed message
             pass
         elif isinstance(content, str):
@@ -814,7 +1085,7 @@ class Session(Configurable):
             assert stream is not None  # type:ignore[unreachable]
             stream = zmq.Socket.shadow(stream.underlying)
 
-        if isinstance(msg_or_type, (Message, dict)):
+        if isinstance(msg_or_type, (Message, dict, LazyMessage)):
             # We got a Message or message dict, not a msg_type so don't
             # build a new Message.
             msg = msg_or_type
@@ -831,21 +1102,7 @@ class Session(Configurable):
             get_logger().warning("WARNING: attempted to send message from fork\n%s", msg)
             return None
         buffers = [] if buffers is None else buffers
-        for idx, buf in enumerate(buffers):
-            if isinstance(buf, memoryview):
-                view = buf
-            else:
-                try:
-                    # check to see if buf supports the buffer protocol.
-                    view = memoryview(buf)
-                except TypeError as e:
-                    emsg = "Buffer objects must support the buffer protocol."
-                    raise TypeError(emsg) from e
-            # memoryview.contiguous is new in 3.3,
-            # just skip the check on Python 2
-            if hasattr(view, "contiguous") and not view.contiguous:
-                # zmq requires memoryviews to be contiguous
-                raise ValueError("Buffer %i (%r) is not contiguous" % (idx, buf))
+        self._check_buffers(buffers)
 
         if self.adapt_version:
             msg = adapt(msg, self.adapt_version)
@@ -873,6 +1130,80 @@ class Session(Configurable):
 
         return msg
 
+    def send_many(
+        self,
+        stream: zmq.sugar.socket.Socket | ZMQStream | None,
+        msgs: t.Iterable[dict[str, t.Any]],
+        ident: bytes | list[bytes] | None = None,
+    ) -> list[dict[str, t.Any]]:
+        """Serialize and send a batch of messages.
+
+        This is equivalent to calling :meth:`send` for each message,
+        but the per-call checks are done once for the whole batch.
+        Messages are not tracked.
+
+        Parameters
+        ----------
+        stream : zmq.Socket or ZMQStream
+            The socket-like object used to send the data.
+        msgs : list of dicts
+            The messages to send, as returned by :meth:`msg`.
+            Each message's buffers are taken from its 'buffers' key.
+        ident : bytes or list of bytes
+            The zmq.IDENTITY routing path, for every message.
+
+        Returns
+        -------
+        msgs : list of dicts
+            The messages sent. Empty if they were not sent from a fork.
+
+        .. versionadded:: 8.7
+        """
+        msgs = list(msgs)
+        if self.check_pid and os.getpid() != self.pid:
+            get_logger().warning("WARNING: attempted to send %i messages from fork", len(msgs))
+            return []
+        if isinstance(stream, zmq.asyncio.Socket):
+            stream = zmq.Socket.shadow(stream.underlying)
+        serialize = self.serialize
+        copy_threshold = self.copy_threshold
+        adapt_version = self.adapt_version
+        sent = []
+        for msg in msgs:
+            buffers = msg.get("buffers")
+            if adapt_version:
+                msg = adapt(msg, adapt_version)  # noqa: PLW2901
+            to_send = serialize(msg, ident)
+            copy = True
+            if buffers:
+                self._check_buffers(buffers)
+                to_send.extend(buffers)
+                copy = max(len(buf) for buf in buffers) < copy_threshold
+            if stream is not None:
+                stream.send_multipart(to_send, copy=copy)
+            msg["tracker"] = DONE
+            sent.append(msg)
+        if self.debug:
+            pprint.pprint(sent)  # noqa
+        return sent
+
+    @staticmethod
+    def _check_buffers(buffers: list[t.Any]) -> None:
+        """Check that buffers can be sent without copying by zmq."""
+        for idx, buf in enumerate(buffers):
+            if isinstance(buf, memoryview):
+                view = buf
+            else:
+                try:
+                    # check to see if buf supports the buffer protocol.
+                    view = memoryview(buf)
+                except TypeError as e:
+                    emsg = "Buffer objects must support the buffer protocol."
+                    raise TypeError(emsg) from e
+            if not view.contiguous:
+                # zmq requires memoryviews to be contiguous
+                raise ValueError("Buffer %i (%r) is not contiguous" % (idx, buf))
+
     def send_raw(
         self,
         stream: zmq.sugar.socket.Socket,
@@ -910,12 +1241,42 @@ class Session(Configurable):
             stream = zmq.Socket.shadow(stream.underlying)
         stream.send_multipart(to_send, flags, copy=copy)
 
+    def message_template(
+        self,
+        msg_type: str,
+        parent: dict[str, t.Any] | None = None,
+        metadata: dict[str, t.Any] | None = None,
+    ) -> MessageTemplate:
+        """Create a template for sending many messages of one type.
+
+        Sending through the template skips rebuilding and repacking
+        the header, parent header and metadata for each message,
+        which is useful for high-rate messages such as ``stream`` or ``status``.
+
+        Parameters
+        ----------
+        msg_type : str
+            The type of the messages to send.
+        parent : Message or dict or None
+            The parent or parent header of the messages.
+        metadata : dict or None
+            Metadata for the messages, on top of this Session's metadata.
+
+        Returns
+        -------
+        template : MessageTemplate
+
+        .. versionadded:: 8.7
+        """
+        return MessageTemplate(self, msg_type, parent=parent, metadata=metadata)
+
     def recv(
         self,
         socket: zmq.sugar.socket.Socket,
         mode: int = zmq.NOBLOCK,
         content: bool = True,
         copy: bool = True,
+        lazy: bool = False,
     ) -> tuple[list[bytes] | None, dict[str, t.Any] | None]:
         """Receive and unpack a message.
 
@@ -923,6 +1284,9 @@ class Session(Configurable):
         ----------
         socket : ZMQStream or Socket
             The socket or stream to use in receiving.
+        lazy : bool (False)
+            Whether to return a LazyMessage instead of a dict,
+            see :meth:`deserialize`.
 
         Returns
         -------
@@ -948,6 +1312,10 @@ class Session(Configurable):
         # invalid large messages can cause very expensive string comparisons
         idents, msg_list = self.feed_identities(msg_list, copy)
         try:
+            if lazy:
+                return idents, self.deserialize(  # type:ignore[return-value]
+                    msg_list, content=content, copy=copy, lazy=True
+                )
             return idents, self.deserialize(msg_list, content=content, copy=copy)
         except Exception as e:
             # TODO: handle it
@@ -997,34 +1365,62 @@ class Session(Configurable):
 
     def _add_digest(self, signature: bytes) -> None:
         """add a digest to history to protect against replay attacks"""
-        if self.digest_history_size == 0:
+        size = self.digest_history_size
+        if size == 0:
             # no history, never add digests
             return
 
-        self.digest_history.add(signature)
-        if len(self.digest_history) > self.digest_history_size:
-            # threshold reached, cull 10%
+        history = self.digest_history
+        if signature in history:
+            return
+        history.add(signature)
+        self._digest_order.append(signature)
+        if len(history) > size:
+            # threshold reached, forget the oldest digest
             self._cull_digest_history()
 
     def _cull_digest_history(self) -> None:
         """cull the digest history
 
-        Removes a randomly selected 10% of the digest history
+        Removes the oldest digests until the history fits in digest_history_size.
+        This is O(1) per digest added.
         """
-        current = len(self.digest_history)
-        n_to_cull = max(int(current // 10), current - self.digest_history_size)
-        if n_to_cull >= current:
-            self.digest_history = set()
-            return
-        to_cull = random.sample(tuple(sorted(self.digest_history)), n_to_cull)
-        self.digest_history.difference_update(to_cull)
+        history = self.digest_history
+        order = self._digest_order
+        while len(history) > self.digest_history_size:
+            if not order:
+                # digest_history was modified in place, its order is unknown
+                order.extend(history)
+            history.discard(order.popleft())
+
+    @t.overload
+    def deserialize(
+        self,
+        msg_list: list[bytes] | list[zmq.Message],
+        content: bool = ...,
+        copy: bool = ...,
+        lazy: t.Literal[False] = ...,
+    ) -> dict[str, t.Any]:
+        ...
+
+    @t.overload
+    def deserialize(
+        self,
+        msg_list: list[bytes] | list[zmq.Message],
+        content: bool = ...,
+        copy: bool = ...,
+        *,
+        lazy: t.Literal[True],
+    ) -> LazyMessage:
+        ...
 
     def deserialize(
         self,
         msg_list: list[bytes] | list[zmq.Message],
         content: bool = True,
         copy: bool = True,
-    ) -> dict[str, t.Any]:
+        lazy: bool = False,
+    ) -> dict[str, t.Any] | LazyMessage:
         """Unserialize a msg_list to a nested message dict.
 
         This is roughly the inverse of serialize. The serialize/deserialize
@@ -1042,21 +1438,29 @@ class Session(Configurable):
         copy : bool (True)
             Whether msg_list contains bytes (True) or the non-copying Message
             objects in each place (False).
+            Non-copying Messages are unpacked from their buffers without copying,
+            and the buffers are memoryviews of the original Messages.
+        lazy : bool (False)
+            Whether to return a LazyMessage, which only unpacks
+            parent_header, metadata and content when they are first accessed.
+            The header is always unpacked and the signature always checked.
 
         Returns
         -------
-        msg : dict
+        msg : dict or LazyMessage
             The nested message dict with top-level keys [header, parent_header,
             content, buffers].  The buffers are returned as memoryviews.
         """
         minlen = 5
-        message = {}
+        message: dict[str, t.Any] | LazyMessage = LazyMessage() if lazy else {}
         if not copy:
-            # pyzmq didn't copy the first parts of the message, so we'll do it
-            msg_list = t.cast(t.List[zmq.Message], msg_list)
-            msg_list_beginning = [bytes(msg.bytes) for msg in msg_list[:minlen]]
-            msg_list = t.cast(t.List[bytes], msg_list)
-            msg_list = msg_list_beginning + msg_list[minlen:]
+            # pyzmq didn't copy the message, unpack straight from the frames' buffers
+            frames = t.cast(t.List[zmq.Message], msg_list)
+            parts: list[t.Any] = [frame.buffer for frame in frames]
+            if parts:
+                # the signature is small, and compared as bytes
+                parts[0] = frames[0].bytes
+            msg_list = parts
         msg_list = t.cast(t.List[bytes], msg_list)
         if self.auth is not None:
             signature = msg_list[0]
@@ -1075,26 +1479,39 @@ class Session(Configurable):
         if not len(msg_list) >= minlen:
             msg = "malformed message, must have at least %i elements" % minlen
             raise TypeError(msg)
-        header = self.unpack(msg_list[1])
-        message["header"] = extract_dates(header)
+        header = self._unpack_buffer(msg_list[1])
+        message["header"] = extract_header_dates(header)
         message["msg_id"] = header["msg_id"]
         message["msg_type"] = header["msg_type"]
-        message["parent_header"] = extract_dates(self.unpack(msg_list[2]))
-        message["metadata"] = self.unpack(msg_list[3])
-        if content:
-            message["content"] = self.unpack(msg_list[4])
+        if isinstance(message, LazyMessage):
+            message.set_packed("parent_header", msg_list[2], self._unpack_parent)
+            message.set_packed("metadata", msg_list[3], self._unpack_buffer)
         else:
-            message["content"] = msg_list[4]
-        buffers = [memoryview(b) for b in msg_list[5:]]
-        if buffers and buffers[0].shape is None:
-            # force copy to workaround pyzmq #646
-            msg_list = t.cast(t.List[zmq.Message], msg_list)
-            buffers = [memoryview(bytes(b.bytes)) for b in msg_list[5:]]
-        message["buffers"] = buffers
+            message["parent_header"] = self._unpack_parent(msg_list[2])
+            message["metadata"] = self._unpack_buffer(msg_list[3])
+        if not content:
+            message["content"] = bytes(msg_list[4])
+        elif isinstance(message, LazyMessage):
+            message.set_packed("content", msg_list[4], self._unpack_buffer)
+        else:
+            message["content"] = self._unpack_buffer(msg_list[4])
+        # with copy=False, these are views of the original zmq.Frames
+        message["buffers"] = [memoryview(b) for b in msg_list[5:]]
         if self.debug:
             pprint.pprint(message)  # noqa
         # adapt to the current version
-        return adapt(message)
+        return adapt(message)  # type:ignore[arg-type]
+
+    def _unpack_buffer(self, buf: bytes | memoryview) -> t.Any:
+        """Unpack a message part, which may be a view of a zmq.Frame."""
+        if isinstance(buf, memoryview) and self.unpack not in buffer_unpackers:
+            # custom unpackers may only accept bytes
+            buf = buf.tobytes()
+        return self.unpack(buf)
+
+    def _unpack_parent(self, p_parent: bytes | memoryview) -> dict[str, t.Any]:
+        """Unpack a parent header, extracting its dates."""
+        return extract_header_dates(self._unpack_buffer(p_parent))
 
     def unserialize(self, *args: t.Any, **kwargs: t.Any) -> dict[str, t.Any]:
         """**DEPRECATED** Use deserialize instead."""
@@ -1105,3 +1522,157 @@ class Session(Configurable):
             stacklevel=2,
         )
         return self.deserialize(*args, **kwargs)
+
+
+class MessageTemplate:
+    """A pre-serialized message skeleton, for sending many messages of one type.
+
+    Created by :meth:`Session.message_template`.
+    The header is packed once with placeholders for its msg_id and date,
+    which are patched into the packed bytes for each message.
+    The parent header and metadata are packed once and reused.
+    Only the content is packed on each :meth:`send`.
+
+    If the Session's packer does not produce JSON-like output
+    where the placeholders can be patched (e.g. pickle),
+    the header is packed for each message instead.
+    Create a new template after changing the Session's packer.
+    """
+
+    _id_placeholder = "__jupyter_msg_id__"
+    _date_placeholder = "__jupyter_msg_date__"
+
+    def __init__(
+        self,
+        session: Session,
+        msg_type: str,
+        parent: dict[str, t.Any] | None = None,
+        metadata: dict[str, t.Any] | None = None,
+    ) -> None:
+        """Pack the parts of the message that don't change."""
+        self.session = session
+        self.msg_type = msg_type
+        self.parent = {} if parent is None else extract_header(parent)
+        self.metadata = session.metadata.copy()
+        if metadata is not None:
+            self.metadata.update(metadata)
+        self._p_parent = session.pack(self.parent)
+        self._p_metadata = session.pack(self.metadata)
+        self._header_parts: list[bytes] | None = None
+        self._prepare_header()
+
+    def _prepare_header(self) -> None:
+        """Pack the header skeleton, for the current process."""
+        session = self.session
+        self._pid = os.getpid()
+        self._id_prefix = f"{session.session}_{self._pid}_"
+        self._header_parts = None
+        pack = session.pack
+        header = msg_header(
+            self._id_placeholder, self.msg_type, session.username, session.session
+        )
+        header["date"] = self._date_placeholder
+        packed = pack(header)
+        id_token = self._id_placeholder.encode()
+        date_token = self._date_placeholder.encode()
+        # the msg_id and date are only patched in if they don't need escaping
+        prefix = self._id_prefix.encode("utf8")
+        if pack(self._id_prefix) != b'"' + prefix + b'"':
+            return
+        if packed.count(id_token) != 1 or packed.count(date_token) != 1:
+            return
+        before_id, rest = packed.split(id_token)
+        if date_token not in rest:
+            # date comes first
+            return
+        between, after_date = rest.split(date_token)
+        self._header_parts = [before_id + prefix, between, after_date]
+
+    def send(
+        self,
+        stream: zmq.sugar.socket.Socket | ZMQStream | None,
+        content: dict[str, t.Any] | bytes | None = None,
+        buffers: list[t.Any] | None = None,
+        ident: bytes | list[bytes] | None = None,
+    ) -> str | None:
+        """Send a message with the given content.
+
+        Parameters
+        ----------
+        stream : zmq.Socket or ZMQStream
+            The socket-like object used to send the data.
+        content : dict or bytes or None
+            The content of the message, or already packed content.
+        buffers : list or None
+            The already-serialized buffers to be appended to the message.
+        ident : bytes or list of bytes
+            The zmq.IDENTITY routing path.
+
+        Returns
+        -------
+        msg_id : str
+            The id of the message sent,
+            or None if the message could not be sent from a forked process.
+        """
+        session = self.session
+        if session.adapt_version:
+            # adapting needs the full message dict;
+            # packed content is passed through, as Session.send does
+            msg = session.send(
+                stream,
+                self.msg_type,
+                content=content,  # type:ignore[arg-type]
+                parent=self.parent,
+                ident=ident,
+                buffers=buffers,
+                metadata=self.metadata,
+            )
+            return None if msg is None else msg["msg_id"]
+
+        if os.getpid() != self._pid:
+            if session.check_pid and os.getpid() != session.pid:
+                get_logger().warning("WARNING: attempted to send message from fork")
+                return None
+            self._prepare_header()
+
+        message_number = session.message_count
+        session.message_count += 1
+        msg_id = f"{self._id_prefix}{message_number}"
+        if self._header_parts is not None:
+            before_id, between, after_date = self._header_parts
+            # same format as json_default
+            date = utcnow().isoformat().replace("+00:00", "Z")
+            p_header = b"".join(
+                [before_id, str(message_number).encode(), between, date.encode(), after_date]
+            )
+        else:
+            header = msg_header(msg_id, self.msg_type, session.username, session.session)
+            p_header = session.pack(header)
+
+        if content is None:
+            p_content = session.none
+        elif isinstance(content, bytes):
+            p_content = content
+        else:
+            p_content = session.pack(content)
+
+        real_message = [p_header, self._p_parent, self._p_metadata, p_content]
+        to_send: list[t.Any] = []
+        if isinstance(ident, list):
+            to_send.extend(ident)
+        elif ident is not None:
+            to_send.append(ident)
+        to_send.append(DELIM)
+        to_send.append(session.sign(real_message))
+        to_send.extend(real_message)
+
+        copy = True
+        if buffers:
+            to_send.extend(buffers)
+            copy = max(len(buf) for buf in buffers) < session.copy_threshold
+
+        if isinstance(stream, zmq.asyncio.Socket):
+            stream = zmq.Socket.shadow(stream.underlying)
+        if stream is not None:
+            stream.send_multipart(to_send, copy=copy)
+        return msg_id
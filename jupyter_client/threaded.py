@@ -7,7 +7,7 @@ import time
 from concurrent.futures import Future
 from functools import partial
 from threading import Thread
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
 import zmq
 from tornado.ioloop import IOLoop
@@ -55,13 +55,14 @@ class ThreadedZMQSocketChannel:
         self.socket = socket
         self.session = session
         self.ioloop = loop
+        self._copy = session is None or not session.zero_copy_recv
         f: Future = Future()
 
         def setup_stream() -> None:
             try:
                 assert self.socket is not None
                 self.stream = zmqstream.ZMQStream(self.socket, self.ioloop)
-                self.stream.on_recv(self._handle_recv)
+                self.stream.on_recv(self._handle_recv, copy=self._copy)
             except Exception as e:
                 f.set_exception(e)
             else:
@@ -118,20 +119,24 @@ class ThreadedZMQSocketChannel:
                 pass
             self.socket = None
 
-    def send(self, msg: dict[str, Any]) -> None:
+    def send(self, msg: Union[dict[str, Any], list[dict[str, Any]]]) -> None:
         """Queue a message to be sent from the IOLoop's thread.
 
         Parameters
         ----------
-        msg : message to send
+        msg : message to send, or a list of messages to send as a batch
 
         This is threadsafe, as it uses IOLoop.add_callback to give the loop's
         thread control of the action.
+        A list of messages is sent with a single callback.
         """
 
         def thread_send() -> None:
             assert self.session is not None
-            self.session.send(self.stream, msg)
+            if isinstance(msg, list):
+                self.session.send_many(self.stream, msg)
+            else:
+                self.session.send(self.stream, msg)
 
         assert self.ioloop is not None
         self.ioloop.add_callback(thread_send)
@@ -143,8 +148,8 @@ class ThreadedZMQSocketChannel:
         """
         assert self.ioloop is not None
         assert self.session is not None
-        ident, smsg = self.session.feed_identities(msg_list)
-        msg = self.session.deserialize(smsg)
+        ident, smsg = self.session.feed_identities(msg_list, self._copy)
+        msg = self.session.deserialize(smsg, copy=self._copy)
         # let client inspect messages
         if self._inspect:
             self._inspect(msg)  # type:ignore[unreachable]
@@ -0,0 +1,37 @@
+"""Test kernel which binds ports of its choice and reports them to the manager"""
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+import json
+
+import zmq
+from ipykernel.kernelapp import IPKernelApp
+
+from jupyter_client.session import Session
+
+
+class HandshakeKernelApp(IPKernelApp):
+    def write_connection_file(self):
+        with open(self.abs_connection_file) as f:
+            info = json.load(f)
+        if "registration_port" not in info:
+            return super().write_connection_file()
+
+        ports = {name: getattr(self, name) for name in self.port_names}
+        session = Session(key=info["key"].encode(), signature_scheme=info["signature_scheme"])
+        context = zmq.Context()
+        socket = context.socket(zmq.DEALER)
+        socket.linger = 1000
+        socket.connect(f"tcp://{info['ip']}:{info['registration_port']}")
+        session.send(socket, "registration_request", ports)
+        if not socket.poll(10000):
+            raise RuntimeError("No registration reply")
+        _, reply = session.recv(socket)
+        assert reply["msg_type"] == "registration_reply"
+        socket.close()
+        context.term()
+
+    port_names = ["shell_port", "iopub_port", "stdin_port", "control_port", "hb_port"]
+
+
+if __name__ == "__main__":
+    HandshakeKernelApp.launch_instance()
@@ -1,17 +1,25 @@
 """Tests for the KernelClient"""
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
+import asyncio
+import gc
+import math
 import os
 import platform
 import sys
-from threading import Event
+import time
+import weakref
+from threading import Event, Thread
+from threading import enumerate as enumerate_threads
 from unittest import TestCase, mock
 
 import pytest
+import zmq
 from IPython.utils.capture import capture_output
 from traitlets import DottedObjectName, Type
 
-from jupyter_client.client import validate_string_dict
+from jupyter_client.channels import HBChannel, HeartbeatService, RTTStats, SharedHBChannel
+from jupyter_client.client import _OutputRouter, _ReplyRouter, validate_string_dict
 from jupyter_client.kernelspec import KernelSpecManager, NoSuchKernel
 from jupyter_client.manager import KernelManager, start_new_async_kernel, start_new_kernel
 from jupyter_client.threaded import ThreadedKernelClient, ThreadedZMQSocketChannel
@@ -68,6 +76,33 @@ class TestKernelClient(TestCase):
         reply = kc.complete("code", reply=True, timeout=TIMEOUT)
         self._check_reply("complete", reply)
 
+    def test_unclaimed_reply(self):
+        kc = self.kc
+        msg_id = kc.complete("code")
+        reply = kc.kernel_info(reply=True, timeout=TIMEOUT)
+        self._check_reply("kernel_info", reply)
+        # the complete reply arrived first and was kept for later
+        reply = kc._recv_reply(msg_id, timeout=TIMEOUT)
+        self._check_reply("complete", reply)
+        assert reply["parent_header"]["msg_id"] == msg_id
+
+    def test_freed_without_gc(self):
+        kc = self.km.client()
+        kc.start_channels()
+        with capture_output():
+            kc.execute_interactive("print('hello')", timeout=TIMEOUT)
+        kc.stop_channels()
+        context = kc.context
+        ref = weakref.ref(kc)
+        gc.disable()
+        try:
+            # no reference cycles, so the client destroys its context right away
+            del kc
+            assert ref() is None
+        finally:
+            gc.enable()
+        assert context.closed
+
     def test_kernel_info(self):
         kc = self.kc
         msg_id = kc.kernel_info()
@@ -146,6 +181,48 @@ class TestAsyncKernelClient:
         assert reply["content"]["status"] == "ok"
         assert called
 
+    async def test_concurrent_execute_interactive(self, kc):
+        outputs: dict = {}
+
+        async def run(code):
+            def output_hook(msg):
+                if msg["header"]["msg_type"] == "stream":
+                    outputs.setdefault(code, []).append(msg["content"]["text"])
+
+            return await kc.execute_interactive(code, timeout=TIMEOUT, output_hook=output_hook)
+
+        codes = [f"cell {i}" for i in range(10)]
+        replies = await asyncio.gather(*(run(code) for code in codes))
+        assert [reply["content"]["status"] for reply in replies] == ["ok"] * len(codes)
+        assert outputs == {code: [code] for code in codes}
+        assert not kc._output_routers["iopub"]._queues
+
+    async def test_iopub_handler(self, kc):
+        received = asyncio.Queue()
+        kc.add_iopub_handler(received.put_nowait)
+        try:
+            await kc.execute_interactive("mine", timeout=TIMEOUT, output_hook=lambda msg: None)
+            kc.execute("unsolicited")
+            while True:
+                msg = await asyncio.wait_for(received.get(), TIMEOUT)
+                if msg["header"]["msg_type"] == "stream":
+                    break
+            assert msg["content"]["text"] == "unsolicited"
+        finally:
+            kc.remove_iopub_handler(received.put_nowait)
+        assert kc._output_routers["iopub"]._reader is None
+
+    async def test_stop_channels_closes_routers(self, kc):
+        await kc.kernel_info(reply=True, timeout=TIMEOUT)
+        kc.add_iopub_handler(print)
+        reader = kc._output_routers["iopub"]._reader
+        assert reader is not None
+        kc.stop_channels()
+        assert not kc._reply_routers
+        assert not kc._output_routers
+        with pytest.raises(asyncio.CancelledError):
+            await reader
+
     async def test_history(self, kc):
         msg_id = kc.history(session=0)
         assert isinstance(msg_id, str)
@@ -164,6 +241,16 @@ class TestAsyncKernelClient:
         reply = await kc.complete("code", reply=True, timeout=TIMEOUT)
         self._check_reply("complete", reply)
 
+    async def test_concurrent_complete(self, kc):
+        n = 100
+        replies = await asyncio.gather(
+            *(kc.complete(f"code{i}", reply=True, timeout=TIMEOUT) for i in range(n))
+        )
+        for reply in replies:
+            self._check_reply("complete", reply)
+        assert len({reply["parent_header"]["msg_id"] for reply in replies}) == n
+        assert not kc._reply_routers["shell"]._waiters
+
     async def test_is_complete(self, kc):
         msg_id = kc.is_complete("who cares")
         assert isinstance(msg_id, str)
@@ -237,6 +324,12 @@ class TestThreadedKernelClient(TestKernelClient):
     def test_execute_interactive(self):
         pytest.skip("Not supported")
 
+    def test_unclaimed_reply(self):
+        pytest.skip("Not supported")
+
+    def test_freed_without_gc(self):
+        pytest.skip("Not supported")
+
     def test_history(self):
         kc = self.kc
         msg_id = kc.history(session=0)
@@ -299,3 +392,296 @@ def test_validate_string_dict():
         validate_string_dict(dict(a=1))  # type:ignore
     with pytest.raises(ValueError):
         validate_string_dict({1: "a"})  # type:ignore
+
+
+async def test_reply_router():
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def get_msg(timeout=None):
+        return await queue.get()
+
+    def reply(msg_id):
+        return {"parent_header": {"msg_id": msg_id}}
+
+    router = _ReplyRouter(get_msg, concurrent=True)
+    waiters = [asyncio.ensure_future(router.recv_reply(str(i), timeout=TIMEOUT)) for i in range(3)]
+    await asyncio.sleep(0)
+    # replies arrive out of order, with one nobody is waiting for yet
+    for msg_id in ("2", "late", "0", "1"):
+        queue.put_nowait(reply(msg_id))
+    results = await asyncio.gather(*waiters)
+    assert [r["parent_header"]["msg_id"] for r in results] == ["0", "1", "2"]
+    assert router._reader is None
+    assert (await router.recv_reply("late"))["parent_header"]["msg_id"] == "late"
+
+    with pytest.raises(TimeoutError):
+        await router.recv_reply("never", timeout=0.01)
+    assert not router._waiters
+    assert router._reader is None
+
+
+async def test_reply_router_cancel():
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def get_msg(timeout=None):
+        return await queue.get()
+
+    router = _ReplyRouter(get_msg, concurrent=True)
+    waiter = asyncio.ensure_future(router.recv_reply("a"))
+    while router._recv is None:
+        await asyncio.sleep(0)
+    # a reply is received just as its last waiter gives up,
+    # before the reader gets to dispatch it
+    queue.put_nowait({"parent_header": {"msg_id": "b"}})
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert router._reader is None
+    assert (await router.recv_reply("b", timeout=0.01))["parent_header"]["msg_id"] == "b"
+
+    # closing the router fails the requests still waiting
+    waiter = asyncio.ensure_future(router.recv_reply("c", timeout=TIMEOUT))
+    while router._reader is None:
+        await asyncio.sleep(0)
+    reader = router._reader
+    router.close()
+    with pytest.raises(RuntimeError, match="stopped"):
+        await waiter
+    assert reader.cancelled()
+
+
+async def test_output_router():
+    source: asyncio.Queue = asyncio.Queue()
+
+    async def get_msg(timeout=None):
+        return await source.get()
+
+    def output(msg_id, text):
+        return {"parent_header": {"msg_id": msg_id}, "content": {"text": text}}
+
+    router = _OutputRouter(get_msg)
+    unsolicited = []
+    router.add_handler(unsolicited.append)
+    a = router.subscribe("a")
+    b = router.subscribe("b")
+    for msg_id, text in [("a", "1"), ("b", "2"), ("c", "3"), ("a", "4")]:
+        source.put_nowait(output(msg_id, text))
+    texts = [(await asyncio.wait_for(a.get(), TIMEOUT))["content"]["text"] for _ in range(2)]
+    assert texts == ["1", "4"]
+    assert (await asyncio.wait_for(b.get(), TIMEOUT))["content"]["text"] == "2"
+    assert [msg["content"]["text"] for msg in unsolicited] == ["3"]
+    router.unsubscribe("a")
+    router.unsubscribe("b")
+    assert router._reader is not None
+    router.remove_handler(unsolicited.append)
+    assert router._reader is None
+
+
+class EchoHeart(Thread):
+    """A heartbeat that echoes pings until stopped"""
+
+    def __init__(self, context):
+        super().__init__(daemon=True)
+        self.socket = context.socket(zmq.ROUTER)
+        port = self.socket.bind_to_random_port("tcp://127.0.0.1")
+        self.url = f"tcp://127.0.0.1:{port}"
+        self.stopped = Event()
+
+    def run(self):
+        while not self.stopped.is_set():
+            if self.socket.poll(10):
+                self.socket.send_multipart(self.socket.recv_multipart())
+        self.socket.close(linger=0)
+
+
+class RecordingHBChannel(SharedHBChannel):
+    failures: list
+
+    def call_handlers(self, since_last_heartbeat):
+        self.failures.append(since_last_heartbeat)
+
+
+def test_shared_heartbeat():
+    context = zmq.Context()
+    heart = EchoHeart(context)
+    heart.start()
+    service = HeartbeatService()
+    channels = []
+    for _ in range(50):
+        channel = RecordingHBChannel(context, address=heart.url)
+        channel.service = service
+        channel.time_to_dead = 0.1
+        channel.failures = []
+        channel.start()
+        channels.append(channel)
+    time.sleep(0.5)
+    assert all(channel.is_beating() for channel in channels)
+    assert all(not channel.failures for channel in channels)
+    # one thread monitors every channel
+    assert [t.name for t in enumerate_threads()].count("HeartbeatService") == 1
+    assert all(channel.rtt_stats.count for channel in channels)
+
+    channels[0].pause()
+    heart.stopped.set()
+    heart.join()
+    deadline = time.monotonic() + TIMEOUT
+    while not all(channel.failures for channel in channels[1:]):
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+    assert not any(channel.is_beating() for channel in channels)
+    # a paused channel doesn't report failures
+    assert not channels[0].failures
+
+    for channel in channels:
+        channel.stop()
+        assert channel.socket is None
+        assert not channel.is_alive()
+    deadline = time.monotonic() + TIMEOUT
+    while service._thread is not None:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    context.term()
+
+
+def test_shared_heartbeat_closed_context():
+    context = zmq.Context()
+    heart = EchoHeart(context)
+    heart.start()
+    service = HeartbeatService()
+    channels = []
+    for _ in range(2):
+        channel = RecordingHBChannel(zmq.Context(), address=heart.url)
+        channel.service = service
+        channel.time_to_dead = 0.1
+        channel.failures = []
+        channel.start()
+        channels.append(channel)
+    time.sleep(0.3)
+    assert all(channel.is_beating() for channel in channels)
+    thread = service._thread
+
+    # terminating one channel's context under the service only drops that channel
+    closed, alive = channels
+    terminator = Thread(target=closed.context.term)
+    terminator.start()
+    terminator.join(TIMEOUT)
+    assert not terminator.is_alive()
+    assert not closed.is_beating()
+    count = alive.rtt_stats.count
+    time.sleep(0.3)
+    assert alive.rtt_stats.count > count
+    assert alive.is_beating()
+    assert not alive.failures
+    assert service._thread is thread
+
+    for channel in channels:
+        channel.stop()
+    deadline = time.monotonic() + TIMEOUT
+    while service._thread is not None:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    # the next registration starts a new thread
+    alive.start()
+    assert service._thread is not None
+    assert service._thread is not thread
+    alive.stop()
+    alive.context.term()
+    heart.stopped.set()
+    heart.join()
+    context.term()
+
+
+def test_rtt_stats():
+    stats = RTTStats()
+    assert stats.deadline(0.01, 1.0) == 1.0
+    for rtt in (0.0004, 0.0005, 0.003, 2.0, 10.0):
+        stats.record(rtt)
+    histogram = stats.histogram()
+    assert sum(histogram.values()) == stats.count == 5
+    assert histogram[0.0004] == 1
+    assert histogram[0.0008] == 1
+    assert histogram[0.0032] == 1
+    assert histogram[math.inf] == 1
+    assert stats.min == 0.0004
+    assert stats.max == 10.0
+    assert stats.deadline(0.01, 1.0) == 1.0
+
+    stats = RTTStats()
+    for _ in range(20):
+        stats.record(0.001)
+    assert stats.deadline(0.01, 1.0) == 0.01
+    assert stats.deadline(0.0001, 1.0) == pytest.approx(0.001, rel=0.1)
+
+    # the deadline follows the smoothed round-trip time and its variation
+    stats = RTTStats()
+    stats.record(0.2)
+    assert stats.srtt == 0.2
+    assert stats.rttvar == 0.1
+    assert stats.deadline(0.01, 10.0) == pytest.approx(0.2 + 4 * 0.1)
+    stats.record(0.4)
+    assert stats.rttvar == pytest.approx(0.75 * 0.1 + 0.25 * 0.2)
+    assert stats.srtt == pytest.approx(0.875 * 0.2 + 0.125 * 0.4)
+    assert stats.deadline(0.01, 10.0) == pytest.approx(stats.srtt + 4 * stats.rttvar)
+    # a jump in round-trip times widens the deadline before it moves the average
+    assert stats.deadline(0.01, 10.0) > 0.6
+
+
+class RecordingThreadHBChannel(HBChannel):
+    def call_handlers(self, since_last_heartbeat):
+        self.failures.append((time.monotonic(), since_last_heartbeat))
+
+
+def test_adaptive_heartbeat():
+    context = zmq.Context()
+    heart = EchoHeart(context)
+    heart.start()
+    channel = RecordingThreadHBChannel(context, address=heart.url)
+    channel.adaptive = True
+    channel.time_to_dead = 0.5
+    channel.failures = []
+    channel.start()
+    deadline = time.monotonic() + TIMEOUT
+    while channel.rtt_stats.count < 3:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert channel.is_beating()
+    assert not channel.failures
+
+    heart.stopped.set()
+    heart.join()
+    while not channel.failures:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    _, since = channel.failures[0]
+    # max_missed deadlines were missed, none of them shorter than min_deadline
+    assert since >= 0.8 * channel.max_missed * channel.min_deadline
+    assert not channel.is_beating()
+    channel.stop()
+    context.term()
+
+
+def test_shared_heartbeat_not_adaptive():
+    channel = RecordingHBChannel(zmq.Context.instance(), address="tcp://127.0.0.1:1")
+    channel.adaptive = True
+    with pytest.raises(ValueError, match="adaptive"):
+        channel.start()
+    assert not channel.is_alive()
+
+
+class LateHBChannel(RecordingThreadHBChannel):
+    def _create_socket(self):
+        # the thread gets going only after stop() was called
+        self._exit.wait(TIMEOUT)
+        super()._create_socket()
+
+
+def test_heartbeat_stop_before_thread_runs():
+    context = zmq.Context()
+    channel = LateHBChannel(context, address="tcp://127.0.0.1:1")
+    channel.failures = []
+    channel.start()
+    channel.stop()
+    assert not channel.is_alive()
+    assert channel.socket is None
+    assert not channel.failures
+    context.term()
@@ -1,8 +1,10 @@
 """Tests for kernel connection utilities"""
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
+import concurrent.futures
 import json
 import os
+import time
 from tempfile import TemporaryDirectory
 
 import pytest
@@ -83,6 +85,18 @@ def test_write_connection_file():
     assert info == sample_info
 
 
+def test_write_connection_file_registration():
+    with TemporaryDirectory() as d:
+        cf = os.path.join(d, "kernel.json")
+        _, cfg = connect.write_connection_file(cf, shell_port=1234, registration_port=5678)
+        with open(cf) as f:
+            info = json.load(f)
+    assert info["registration_port"] == 5678
+    assert info["shell_port"] == 1234
+    # left for the kernel to choose
+    assert info["iopub_port"] == info["stdin_port"] == info["hb_port"] == 0
+
+
 def test_load_connection_file_session():
     """test load_connection_file() after"""
     session = Session()
@@ -237,6 +251,33 @@ def test_mixin_cleanup_random_ports():
             assert getattr(dc, name) == 0
 
 
+def test_port_cache_pool(request):
+    lpc = connect.LocalPortCache(pool_size=20)
+    request.addfinalizer(lpc.clear_pool)
+    # the pool is filled in the background
+    ports = lpc.find_available_ports("127.0.0.1", 5)
+    assert len(set(ports)) == 5
+    deadline = time.monotonic() + 10
+    while len(lpc._pools["127.0.0.1"]) < 20 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(lpc._pools["127.0.0.1"]) == 20
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(lpc.find_available_ports, "127.0.0.1", 5) for _ in range(8)]
+        taken = [port for future in futures for port in future.result()]
+    assert len(set(taken + ports)) == 45
+    assert lpc.currently_used_ports == set(taken + ports)
+
+    # returned ports are reused, while the pool is not full
+    while lpc._refilling and time.monotonic() < deadline:
+        time.sleep(0.01)
+    lpc.pool_size = 30
+    lpc.return_port(ports[0])
+    assert ports[0] not in lpc.currently_used_ports
+    assert ports[0] in [port for port, _ in lpc._pools["127.0.0.1"]]
+    lpc.pool_size = 0
+
+
 param_values = [
     (True, True),
     (True, False),
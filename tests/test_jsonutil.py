@@ -186,3 +186,48 @@ def test_json_default():
         out = json.loads(json.dumps(val, default=jsonutil.json_default))
         # validate our cleanup
         assert out == jval
+
+
+@pytest.mark.parametrize(
+    "date",
+    [
+        "2013-07-03T16:34:52.249482Z",
+        "2013-07-03T16:34:52Z",
+        "2013-07-03T16:34:52.249482+02:00",
+        "2013-07-03T16:34:52.2494Z",
+        "not-a-date",
+    ],
+)
+def test_extract_header_dates(date):
+    header = {"msg_id": "2013-07-03T16:34:52Z", "date": date, "version": "5.3"}
+    extracted = jsonutil.extract_header_dates(header)
+    assert extracted is not header
+    assert header["date"] == date
+    # only the date field is parsed
+    assert extracted["msg_id"] == header["msg_id"]
+    assert extracted["date"] == jsonutil.parse_date(date)
+
+
+def test_extract_header_dates_naive():
+    header = {"date": "2013-07-03T16:34:52.249482"}
+    for _ in range(2):
+        with pytest.deprecated_call(match="Interpreting naive datetime as local"):
+            extracted = jsonutil.extract_header_dates(header)
+        assert extracted["date"] == REFERENCE_DATETIME
+
+
+def test_extract_header_dates_empty():
+    assert jsonutil.extract_header_dates({}) == {}
+    assert jsonutil.extract_header_dates({"date": None}) == {"date": None}
+
+
+def test_extract_header_dates_matches_extract_dates():
+    header = {
+        "msg_id": "a1b2c3d4-e5f6a7b8c9d0e1f2_1234_5",
+        "msg_type": "stream",
+        "username": "user",
+        "session": "a1b2c3d4-e5f6a7b8c9d0e1f2",
+        "date": utcnow().isoformat().replace("+00:00", "Z"),
+        "version": "5.3",
+    }
+    assert jsonutil.extract_header_dates(header) == jsonutil.extract_dates(header)
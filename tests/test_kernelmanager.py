@@ -9,12 +9,16 @@ import signal
 import sys
 import time
 from subprocess import PIPE
+from unittest import mock
 
 import pytest
 from jupyter_core import paths
+from jupyter_core.utils import ensure_event_loop
 from traitlets.config.loader import Config
 
 from jupyter_client import AsyncKernelManager, KernelManager
+from jupyter_client.connect import LocalIPCPathCache
+from jupyter_client.iopubhub import SubscriptionClosed
 from jupyter_client.manager import _ShutdownStatus, start_new_async_kernel, start_new_kernel
 
 from .utils import AsyncKMSubclass, SyncKMSubclass
@@ -334,8 +338,8 @@ class TestParallel:
         self._run_signaltest_lifecycle(config)
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=2) as thread_executor:
-            future1 = thread_executor.submit(self._run_signaltest_lifecycle, config)
-            future2 = thread_executor.submit(self._run_signaltest_lifecycle, config)
+            future1 = thread_executor.submit(self._run_signaltest_lifecycle_in_thread, config)
+            future2 = thread_executor.submit(self._run_signaltest_lifecycle_in_thread, config)
             future1.result()
             future2.result()
 
@@ -349,7 +353,7 @@ class TestParallel:
             pytest.skip("IPC transport is currently not working for this test!")
         self._run_signaltest_lifecycle(config)
         with concurrent.futures.ThreadPoolExecutor(max_workers=1) as thread_executor:
-            future1 = thread_executor.submit(self._run_signaltest_lifecycle, config)
+            future1 = thread_executor.submit(self._run_signaltest_lifecycle_in_thread, config)
             with concurrent.futures.ProcessPoolExecutor(max_workers=1) as process_executor:
                 future2 = process_executor.submit(self._run_signaltest_lifecycle, config)
                 future2.result()
@@ -368,6 +372,13 @@ class TestParallel:
             future = pool_executor.submit(self._run_signaltest_lifecycle, config)
             future.result()
 
+    def _run_signaltest_lifecycle_in_thread(self, config=None):
+        try:
+            self._run_signaltest_lifecycle(config)
+        finally:
+            # close the event loop the blocking calls made for this thread
+            ensure_event_loop().close()
+
     def _prepare_kernel(self, km, startup_timeout=TIMEOUT, **kwargs):
         km.start_kernel(**kwargs)
         kc = km.client()
@@ -444,6 +455,99 @@ class TestAsyncKernelManager:
         )
         assert keys == expected
 
+    @pytest.mark.skipif(sys.platform == "win32", reason="Transport 'ipc' not supported on Windows.")
+    async def test_auto_transport(self):
+        km = AsyncKernelManager(transport="auto")
+        await km.start_kernel(stdout=PIPE, stderr=PIPE)
+        try:
+            assert km.transport == "ipc"
+            ipc_path = km.ip
+            assert os.path.dirname(ipc_path) == paths.jupyter_runtime_dir()
+            kc = km.client()
+            kc.start_channels()
+            await kc.wait_for_ready(timeout=TIMEOUT)
+            kc.stop_channels()
+            ipc_files = [f"{ipc_path}-{port}" for port in km.ports]
+            assert all(os.path.exists(f) for f in ipc_files)
+            await km.restart_kernel(now=True)
+            assert km.ip == ipc_path
+        finally:
+            await km.shutdown_kernel(now=True)
+        assert km.transport == "auto"
+        assert not any(os.path.exists(f) for f in ipc_files)
+        assert ipc_path not in LocalIPCPathCache.instance().currently_used_paths
+
+    async def test_subscribe_iopub(self, async_km):
+        await async_km.start_kernel(stdout=PIPE, stderr=PIPE)
+        kc = async_km.client()
+        kc.start_channels()
+        try:
+            await kc.wait_for_ready(timeout=TIMEOUT)
+            sub = async_km.subscribe_iopub(maxsize=0)
+            # wait for the subscription to be connected
+            deadline = time.monotonic() + TIMEOUT
+            while not len(sub):
+                assert time.monotonic() < deadline
+                await kc.kernel_info(reply=True, timeout=TIMEOUT)
+                await asyncio.sleep(0.1)
+            while len(sub):
+                await sub.get()
+            newest = async_km.subscribe_iopub(maxsize=2, policy="drop_newest")
+            oldest = async_km.subscribe_iopub(maxsize=2)
+            disconnect = async_km.subscribe_iopub(maxsize=2, policy="disconnect")
+            with pytest.raises(ValueError):
+                async_km.subscribe_iopub(policy="unknown")
+
+            msg_id = kc.execute("for i in range(5): print(i, flush=True)")
+            received = []
+            async for msg in sub:
+                received.append(msg)
+                if msg["msg_type"] == "status" and msg["parent_header"]["msg_id"] == msg_id:
+                    if msg["content"]["execution_state"] == "idle":
+                        break
+            # messages are deserialized once, for all subscriptions
+            assert len(newest) == 2
+            assert newest._messages[0] is received[0]
+            assert newest.dropped == len(received) - 2
+            assert list(oldest._messages) == received[-2:]
+            assert oldest.dropped == len(received) - 2
+            assert disconnect.closed
+            assert len(disconnect) == 2
+            await disconnect.get()
+            await disconnect.get()
+            with pytest.raises(SubscriptionClosed):
+                await disconnect.get()
+
+            # the hub disconnects once it has no subscriptions
+            hub = async_km._iopub_hub
+            sub.close()
+            newest.close()
+            assert hub._socket is not None
+            oldest.close()
+            assert hub._socket is None
+            sub = async_km.subscribe_iopub()
+            assert hub._socket is not None
+
+            # a failing reader closes all subscriptions, rather than leaving them waiting
+            other = async_km.subscribe_iopub()
+            deadline = time.monotonic() + TIMEOUT
+            with mock.patch.object(sub, "_put", side_effect=RuntimeError("failed")):
+                while not other.closed:
+                    assert time.monotonic() < deadline
+                    await kc.kernel_info(reply=True, timeout=TIMEOUT)
+                    await asyncio.sleep(0.1)
+            assert sub.closed
+            assert hub._socket is None
+            with pytest.raises(SubscriptionClosed):
+                await other.get()
+        finally:
+            kc.stop_channels()
+            kc.context.destroy()
+            await async_km.shutdown_kernel(now=True)
+        assert sub.closed
+        async for _ in sub:
+            pass
+
     @pytest.mark.timeout(10)
     @pytest.mark.skipif(sys.platform == "win32", reason="Windows doesn't support signals")
     async def test_signal_kernel_subprocesses(self, install_kernel, jp_start_kernel):
@@ -4,6 +4,7 @@
 import copy
 import json
 import os
+import shutil
 import sys
 import tempfile
 import unittest
@@ -12,11 +13,13 @@ from logging import StreamHandler
 from os.path import join as pjoin
 from subprocess import PIPE, STDOUT, Popen
 from tempfile import TemporaryDirectory
+from unittest import mock
 
 import pytest
 from jupyter_core import paths
 
 from jupyter_client import kernelspec
+from jupyter_client._dirwatch import PollingWatcher
 
 from .utils import install_kernel, sample_kernel_json
 
@@ -142,6 +145,123 @@ class KernelSpecTests(unittest.TestCase):
         out, _ = p.communicate()
         self.assertEqual(p.returncode, 0, out.decode("utf8", "replace"))
 
+    def test_cache(self):
+        kernels_dir = pjoin(paths.jupyter_data_dir(), "kernels")
+        spec = self.ksm.get_kernel_spec("sample")
+        spec.env["FOO"] = "bar"
+        assert self.ksm.get_kernel_spec("sample").env == {}
+
+        # a changed kernel.json is read again
+        kernel_file = pjoin(self.sample_kernel_dir, "kernel.json")
+        with open(kernel_file, "w") as f:
+            json.dump(dict(sample_kernel_json, display_name="changed"), f)
+        st = os.stat(kernel_file)
+        os.utime(kernel_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        assert self.ksm.get_kernel_spec("sample").display_name == "changed"
+
+        # kernel.json appearing in an existing directory
+        os.mkdir(pjoin(kernels_dir, "later"))
+        assert "later" not in self.ksm.find_kernel_specs()
+        with open(pjoin(kernels_dir, "later", "kernel.json"), "w") as f:
+            json.dump(sample_kernel_json, f)
+        assert "later" in self.ksm.find_kernel_specs()
+        os.remove(pjoin(kernels_dir, "later", "kernel.json"))
+        assert "later" not in self.ksm.get_all_specs()
+
+        # unchanged specs are served from memory
+        key, text, kspec, spec = self.ksm._spec_cache[self.sample_kernel_dir]
+        self.ksm._spec_cache[self.sample_kernel_dir] = (
+            key,
+            text,
+            kspec,
+            dict(spec, display_name="cached"),
+        )
+        specs = self.ksm.get_all_specs()
+        assert specs["sample"]["spec"]["display_name"] == "cached"
+        # callers get their own copy
+        specs["sample"]["spec"]["argv"].append("--modified")
+        assert "--modified" not in self.ksm.get_all_specs()["sample"]["spec"]["argv"]
+        self.ksm.invalidate_cache()
+        assert self.ksm.get_all_specs()["sample"]["spec"]["display_name"] == "changed"
+
+    def test_cache_lookup(self):
+        kernels_dir = pjoin(paths.jupyter_data_dir(), "kernels")
+        for i in range(5):
+            install_kernel(kernels_dir, name=f"other{i}")
+        assert self.ksm.get_kernel_spec("sample").display_name == "Test kernel"
+
+        # looking up one kernel doesn't stat the other kernels' directories
+        with mock.patch.object(kernelspec, "_stat_key", wraps=kernelspec._stat_key) as stat_key:
+            assert self.ksm.get_kernel_spec("sample").display_name == "Test kernel"
+        statted = [call.args[0] for call in stat_key.call_args_list]
+        assert statted
+        assert not [path for path in statted if "other" in path]
+
+        # kernel.json appearing in an existing directory is still found
+        os.mkdir(pjoin(kernels_dir, "later"))
+        with pytest.raises(kernelspec.NoSuchKernel):
+            self.ksm.get_kernel_spec("later")
+        with open(pjoin(kernels_dir, "later", "kernel.json"), "w") as f:
+            json.dump(sample_kernel_json, f)
+        later_dir = pjoin(kernels_dir, "later")
+        st = os.stat(later_dir)
+        os.utime(later_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        assert self.ksm.get_kernel_spec("later").resource_dir == later_dir
+
+    def test_watch(self):
+        kernels_dir = pjoin(paths.jupyter_data_dir(), "kernels")
+        for polling in (False, True):
+            ksm = kernelspec.KernelSpecManager(watch_kernel_specs=True, kernel_spec_poll_interval=0)
+            if polling:
+                ksm._spec_watcher = PollingWatcher(ksm.kernel_dirs, 0, files=["kernel.json"])
+            assert ksm.get_all_specs()["sample"]["spec"]["display_name"] == "Test kernel"
+            # unchanged directories are not scanned again
+            index, specs = ksm._spec_index
+            ksm._spec_index = ({**index, "indexed": self.sample_kernel_dir}, specs)
+            assert ksm.find_kernel_specs()["indexed"] == self.sample_kernel_dir
+
+            other_dir = pjoin(paths.jupyter_data_dir(), "other_kernels")
+            install_kernel(other_dir, name="other")
+            ksm.kernel_dirs = [*ksm.kernel_dirs, other_dir]
+            if polling:
+                ksm._spec_watcher = PollingWatcher(ksm.kernel_dirs, 0, files=["kernel.json"])
+            assert "other" in ksm.get_all_specs()
+
+            # only the changed kernel directory is read again
+            with mock.patch.object(
+                ksm, "_list_kernels_in", wraps=ksm._list_kernels_in
+            ) as list_kernels, mock.patch.object(
+                ksm, "_load_kernel_spec", wraps=ksm._load_kernel_spec
+            ) as load_spec:
+                install_kernel(kernels_dir, name="added")
+                specs = ksm.get_all_specs()
+            assert "added" in specs
+            assert specs["other"]["resource_dir"] == pjoin(other_dir, "other")
+            assert [call.args[0] for call in list_kernels.call_args_list] == [kernels_dir]
+            assert "other" not in [call.args[0] for call in load_spec.call_args_list]
+            # callers get their own copy
+            specs["sample"]["spec"]["argv"].append("--modified")
+            assert "--modified" not in ksm.get_all_specs()["sample"]["spec"]["argv"]
+            assert "indexed" not in ksm.find_kernel_specs()
+
+            kernel_file = pjoin(self.sample_kernel_dir, "kernel.json")
+            with open(kernel_file, "w") as f:
+                json.dump(dict(sample_kernel_json, display_name="changed"), f)
+            st = os.stat(kernel_file)
+            os.utime(kernel_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            assert ksm.get_kernel_spec("sample").display_name == "changed"
+            assert ksm.get_all_specs()["sample"]["spec"]["display_name"] == "changed"
+
+            shutil.rmtree(pjoin(kernels_dir, "added"))
+            assert "added" not in ksm.get_all_specs()
+            with pytest.raises(kernelspec.NoSuchKernel):
+                ksm.get_kernel_spec("added")
+            ksm.watch_kernel_specs = False
+            assert ksm._spec_watcher is None
+            shutil.rmtree(other_dir)
+            with open(kernel_file, "w") as f:
+                json.dump(sample_kernel_json, f)
+
     def test_validate_kernel_name(self):
         for good in [
             "julia-0.4",
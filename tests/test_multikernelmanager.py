@@ -1,20 +1,26 @@
 """Tests for the notebook kernel and session manager."""
 import asyncio
 import concurrent.futures
+import logging
 import os
 import sys
+import time
 import uuid
 from asyncio import ensure_future
 from subprocess import PIPE
 from unittest import TestCase
 
 import pytest
+import zmq
 from jupyter_core import paths
+from jupyter_core.utils import ensure_event_loop
 from tornado.testing import AsyncTestCase, gen_test
 from traitlets.config.loader import Config
 
-from jupyter_client import AsyncKernelManager, KernelManager
+from jupyter_client import AsyncKernelManager, BlockingKernelClient, KernelManager
+from jupyter_client.kernelspec import NATIVE_KERNEL_NAME
 from jupyter_client.localinterfaces import localhost
+from jupyter_client.manager import _ShutdownStatus
 from jupyter_client.multikernelmanager import AsyncMultiKernelManager, MultiKernelManager
 
 from .utils import (
@@ -37,6 +43,18 @@ async def now(awaitable):
     return out
 
 
+class RecordingAsyncMultiKernelManager(AsyncMultiKernelManager):
+    """Records shutdown_kernel calls, as subclasses keeping their own bookkeeping see them"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.shutdowns = []
+
+    async def _async_shutdown_kernel(self, kernel_id, now=False, restart=False):
+        self.shutdowns.append(kernel_id)
+        await super()._async_shutdown_kernel(kernel_id, now=now, restart=restart)
+
+
 class TestKernelManager(TestCase):
     # static so picklable for multiprocessing on Windows
     @staticmethod
@@ -149,9 +167,8 @@ class TestKernelManager(TestCase):
         self._run_lifecycle(self._get_ipc_km())
 
     def tcp_lifecycle_with_loop(self):
-        # Ensure each thread has an event loop
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        # Ensure each thread has an event loop, and close it when done
+        loop = ensure_event_loop()
         self.test_tcp_lifecycle()
         loop.close()
 
@@ -236,6 +253,103 @@ class TestKernelManager(TestCase):
 
         assert kid not in km, f"{kid} not in {km}"
 
+    def test_bulk(self):
+        km = self._get_tcp_km()
+        kids = km.start_kernels([dict(stdout=PIPE, stderr=PIPE)] * 2, concurrency=1)
+        assert sorted(kids) == sorted(km.list_kernel_ids())
+        assert km.restart_kernels(kids, now=True) == dict.fromkeys(kids)
+        assert km.shutdown_kernels(kids, now=True) == dict.fromkeys(kids)
+        assert len(km) == 0
+
+    def test_background_options_unsupported(self):
+        c = Config()
+        c.MultiKernelManager.warm_pool_size = {NATIVE_KERNEL_NAME: 1}
+        c.MultiKernelManager.idle_kernel_timeout = 1
+        log = logging.getLogger("test_background_options_unsupported")
+        with self.assertLogs(log, "WARNING") as logs:
+            km = MultiKernelManager(config=c, log=log)
+        assert len(logs.output) == 2
+        assert all("AsyncMultiKernelManager" in line for line in logs.output)
+        # the blocking manager ignores warm_pool_size and idle_kernel_timeout
+        km.fill_warm_pool()
+        kid = km.start_kernel(stdout=PIPE, stderr=PIPE)
+        assert km.is_alive(kid)
+        assert km.warm_pool_stats()[NATIVE_KERNEL_NAME]["ready"] == 0
+        assert not km._activity_streams
+        km.shutdown_all()
+        assert kid not in km
+
+    def test_client_context(self):
+        # clients share a context the manager was given
+        context = zmq.Context()
+        mkm = MultiKernelManager(context=context)
+        kid = mkm.start_kernel(stdout=PIPE, stderr=PIPE)
+        client = mkm.get_kernel(kid).client()
+        assert client.context.underlying == context.underlying
+        client.start_channels()
+        client.wait_for_ready(timeout=TIMEOUT)
+        client.stop_channels()
+        mkm.shutdown_all()
+        assert not context.closed
+        context.term()
+
+    def test_socket_pool(self):
+        c = Config()
+        c.MultiKernelManager.socket_pool_size = 1
+        # plain sockets, rather than streams, to use them from this thread
+        c.MultiKernelManager.kernel_manager_class = "jupyter_client.manager.KernelManager"
+        mkm = MultiKernelManager(config=c)
+        kid = mkm.start_kernel(stdout=PIPE, stderr=PIPE)
+        km = mkm.get_kernel(kid)
+        # the manager destroys a context it created, so clients don't share it
+        client = km.client()
+        assert client.context.underlying != mkm.context.underlying
+        client.stop_channels()
+
+        def kernel_info(sock):
+            km.session.send(sock, "kernel_info_request")
+            assert sock.poll(TIMEOUT * 1000)
+            _, msg_list = km.session.feed_identities(sock.recv_multipart())
+            return km.session.deserialize(msg_list)
+
+        with mkm.leased_socket(kid, "shell") as shell:
+            assert kernel_info(shell)["msg_type"] == "kernel_info_reply"
+        with mkm.leased_socket(kid, "shell") as reused:
+            assert reused is shell
+            # messages left unread are dropped before the socket is handed out again
+            km.session.send(shell, "kernel_info_request")
+            assert shell.poll(TIMEOUT * 1000)
+        assert mkm.lease_socket(kid, "shell") is shell
+        assert kernel_info(shell)["msg_type"] == "kernel_info_reply"
+
+        # the pool has room for one socket per channel
+        other = mkm.lease_socket(kid, "shell")
+        mkm.release_socket(kid, "shell", shell)
+        mkm.release_socket(kid, "shell", other)
+        assert other.closed
+        # closed sockets are not handed out
+        shell.close()
+        new_shell = mkm.lease_socket(kid, "shell")
+        assert new_shell is not shell
+        new_shell.close()
+
+        mkm.socket_pool_idle_timeout = 0.1
+        iopub = mkm.lease_socket(kid, "iopub")
+        mkm.release_socket(kid, "iopub", iopub)
+        time.sleep(0.2)
+        new_iopub = mkm.lease_socket(kid, "iopub")
+        assert new_iopub is not iopub
+        assert iopub.closed
+        new_iopub.close()
+
+        with pytest.raises(ValueError):
+            mkm.lease_socket(kid, "hb")
+        stdin = mkm.lease_socket(kid, "stdin")
+        mkm.release_socket(kid, "stdin", stdin)
+        mkm.shutdown_all(now=True)
+        assert stdin.closed
+        assert not mkm._socket_pools
+
     def test_stream_on_recv(self):
         mkm = self._get_tcp_km()
         kid = mkm.start_kernel(stdout=PIPE, stderr=PIPE)
@@ -614,6 +728,219 @@ class TestAsyncKernelManager(AsyncTestCase):
         await ensure_future(km.shutdown_kernel(kernel_id))
         assert kernel_id not in km.list_kernel_ids()
 
+    @gen_test(timeout=60)
+    async def test_warm_pool(self):
+        c = Config()
+        c.MultiKernelManager.warm_pool_size = {NATIVE_KERNEL_NAME: 1}
+        km = AsyncMultiKernelManager(config=c)
+        await km.fill_warm_pool()
+        stats = km.warm_pool_stats()[NATIVE_KERNEL_NAME]
+        assert stats["ready"] == stats["started"] == 1
+        warm_km = km._warm_kernels[NATIVE_KERNEL_NAME][0].km
+
+        warm_file = warm_km.connection_file
+        kid = await km.start_kernel(kernel_id="warm", env=dict(os.environ, JPY_SESSION_NAME="a"))
+        assert kid == "warm"
+        assert km.get_kernel(kid) is warm_km
+        # the connection file is named after the new kernel id
+        assert os.path.basename(warm_km.connection_file) == "kernel-warm.json"
+        assert os.path.exists(warm_km.connection_file)
+        assert not os.path.exists(warm_file)
+        assert warm_km.provisioner.kernel_id == kid
+        assert warm_km._launch_args["env"]["JPY_SESSION_NAME"] == "a"
+        # a replacement is started in the background
+        assert km.warm_pool_stats()[NATIVE_KERNEL_NAME]["starting"] == 1
+        await km.fill_warm_pool()
+        assert km.warm_pool_stats()[NATIVE_KERNEL_NAME]["ready"] == 1
+
+        # the working directory of a warm kernel cannot be changed
+        cold_kid = await km.start_kernel(cwd=os.path.dirname(os.getcwd()))
+        assert km.get_kernel(cold_kid) not in {k.km for k in km._warm_kernels[NATIVE_KERNEL_NAME]}
+        stats = km.warm_pool_stats()[NATIVE_KERNEL_NAME]
+        assert stats["hits"] == stats["misses"] == 1
+
+        pooled_km = km._warm_kernels[NATIVE_KERNEL_NAME][0].km
+        await km.shutdown_all(now=True)
+        assert len(km) == 0
+        assert not pooled_km.has_kernel
+        assert km.warm_pool_stats()[NATIVE_KERNEL_NAME]["ready"] == 0
+
+    @gen_test(timeout=60)
+    async def test_warm_pool_ttl(self):
+        c = Config()
+        c.MultiKernelManager.warm_pool_size = {NATIVE_KERNEL_NAME: 1}
+        c.MultiKernelManager.warm_kernel_ttl = 0.5
+        km = AsyncMultiKernelManager(config=c)
+        await km.fill_warm_pool()
+        expired_km = km._warm_kernels[NATIVE_KERNEL_NAME][0].km
+        while not km.warm_pool_stats()[NATIVE_KERNEL_NAME]["expired"]:
+            await asyncio.sleep(0.1)
+        await km.fill_warm_pool()
+        assert km._warm_kernels[NATIVE_KERNEL_NAME][0].km is not expired_km
+        await km.shutdown_all(now=True)
+        assert not expired_km.has_kernel
+
+    @gen_test(timeout=60)
+    async def test_bulk(self):
+        km = self._get_tcp_km()
+        progress = []
+        kids = await km.start_kernels(
+            [dict(stdout=PIPE, stderr=PIPE)] * 3,
+            concurrency=2,
+            progress=lambda done, total: progress.append((done, total)),
+        )
+        assert progress == [(1, 3), (2, 3), (3, 3)]
+        assert sorted(kids) == sorted(km.list_kernel_ids())
+
+        results = await km.restart_kernels(kids, now=True, concurrency=2)
+        assert results == dict.fromkeys(kids)
+        for kid in kids:
+            assert await km.is_alive(kid)
+
+        in_flight = max_in_flight = 0
+        shutdown_kernel = km._async_shutdown_kernel
+
+        async def counting_shutdown_kernel(kernel_id, now=False):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(in_flight, max_in_flight)
+            try:
+                await shutdown_kernel(kernel_id, now=now)
+            finally:
+                in_flight -= 1
+
+        km._async_shutdown_kernel = counting_shutdown_kernel
+        results = await km.shutdown_kernels([*kids, "missing"], now=True, concurrency=2)
+        assert max_in_flight == 2
+        assert isinstance(results.pop("missing"), KeyError)
+        assert results == dict.fromkeys(kids)
+        assert len(km) == 0
+
+        # shutdown_all isn't limited by bulk_concurrency
+        km.bulk_concurrency = 1
+        await km.start_kernels([dict(stdout=PIPE, stderr=PIPE)] * 3)
+        max_in_flight = 0
+        await km.shutdown_all(now=True)
+        assert max_in_flight == 3
+        assert len(km) == 0
+
+    @gen_test(timeout=60)
+    async def test_shutdown_group(self):
+        install_kernel(
+            os.path.join(paths.jupyter_data_dir(), "kernels"),
+            argv=[sys.executable, "-m", "tests.signalkernel", "-f", "{connection_file}"],
+            name="signaltest",
+        )
+        c = Config()
+        c.KernelManager.shutdown_wait_time = 2
+        km = RecordingAsyncMultiKernelManager(config=c)
+        assert not km.group_shutdown
+        stubborn_env = dict(os.environ, NO_SHUTDOWN_REPLY="1", NO_SIGTERM_REPLY="1")
+        kids = await km.start_kernels(
+            [dict(kernel_name="signaltest", env=stubborn_env)] * 4
+            + [dict(kernel_name="signaltest")] * 2,
+        )
+        kms = [km.get_kernel(kid) for kid in kids]
+        for k in kms:
+            kc = k.client()
+            kc.start_channels()
+            await kc.wait_for_ready(timeout=TIMEOUT)
+            kc.stop_channels()
+
+        progress = []
+        start = time.monotonic()
+        results = await km.shutdown_kernels(
+            kids, group=True, progress=lambda done, total: progress.append(done)
+        )
+        # stubborn kernels are killed after shutdown_wait_time, all at the same time
+        assert time.monotonic() - start < 4
+        assert results == dict.fromkeys(kids)
+        assert progress == list(range(1, 7))
+        assert len(km) == 0
+        # every kernel went through the overridable shutdown_kernel
+        assert sorted(km.shutdowns) == sorted(kids)
+        assert [k._shutdown_status for k in kms[:4]] == [_ShutdownStatus.SigkillRequest] * 4
+        for k in kms[4:]:
+            assert k._shutdown_status == _ShutdownStatus.ShutdownRequest
+            assert not k.has_kernel
+
+    @gen_test(timeout=60)
+    async def test_cull_idle(self):
+        c = Config()
+        c.MultiKernelManager.idle_kernel_timeout = 2
+        km = AsyncMultiKernelManager(config=c)
+        busy_kid = await km.start_kernel(stdout=PIPE, stderr=PIPE)
+        busy_km = km.get_kernel(busy_kid)
+        # a client using the kernel manager's own session, which blocks the event loop
+        # so that it receives the kernel's messages before the culler does
+        info = busy_km.get_connection_info(session=True)
+        info["session"] = busy_km.session
+        kc = BlockingKernelClient(**info)
+        kc.start_channels()
+        kc.wait_for_ready(timeout=TIMEOUT)
+        msg_id = kc.execute("import time; time.sleep(6)")
+        while True:
+            msg = kc.get_iopub_msg(timeout=TIMEOUT)
+            if msg["parent_header"].get("msg_id") == msg_id and msg["msg_type"] == "status":
+                break
+        deadline = time.monotonic() + TIMEOUT
+        while km._execution_states[busy_kid] != "busy":
+            assert time.monotonic() < deadline
+            await asyncio.sleep(0.1)
+        idle_kid = await km.start_kernel(stdout=PIPE, stderr=PIPE)
+        connected_kid = await km.start_kernel(stdout=PIPE, stderr=PIPE)
+        km.get_kernel(connected_kid).connections = 1
+
+        while idle_kid in km:
+            await asyncio.sleep(0.1)
+        assert busy_kid in km
+        assert km._execution_states[busy_kid] == "busy"
+        # culled once it is done and idle for another timeout
+        while busy_kid in km:
+            await asyncio.sleep(0.1)
+        assert busy_kid not in km._execution_states
+        # the kernel manager's own activity attributes are left alone
+        assert not hasattr(busy_km, "execution_state")
+        kc.stop_channels()
+        assert connected_kid in km
+        await km.shutdown_all(now=True)
+
+    @gen_test(timeout=60)
+    async def test_cull_idle_subscribed(self):
+        c = Config()
+        c.MultiKernelManager.idle_kernel_timeout = 60
+        mkm = AsyncMultiKernelManager(config=c)
+        kid = await mkm.start_kernel(stdout=PIPE, stderr=PIPE)
+        km = mkm.get_kernel(kid)
+        sub = km.subscribe_iopub(maxsize=0)
+        # a client using the kernel manager's own session, which blocks the event loop
+        # so that it receives the kernel's messages before the hub and the culler do
+        info = km.get_connection_info(session=True)
+        info["session"] = km.session
+        kc = BlockingKernelClient(**info)
+        kc.start_channels()
+        try:
+            kc.wait_for_ready(timeout=TIMEOUT)
+            msg_id = kc.execute("import time; time.sleep(5)")
+            while True:
+                msg = kc.get_iopub_msg(timeout=TIMEOUT)
+                if msg["parent_header"].get("msg_id") == msg_id and msg["msg_type"] == "status":
+                    break
+            # the hub and the culler each get the kernel's messages
+            while True:
+                msg = await asyncio.wait_for(sub.get(), TIMEOUT)
+                if msg["parent_header"].get("msg_id") == msg_id and msg["msg_type"] == "status":
+                    break
+            assert msg["content"]["execution_state"] == "busy"
+            deadline = time.monotonic() + TIMEOUT
+            while mkm._execution_states[kid] != "busy":
+                assert time.monotonic() < deadline
+                await asyncio.sleep(0.1)
+        finally:
+            kc.stop_channels()
+            await mkm.shutdown_all(now=True)
+        assert sub.closed
+
     @gen_test
     async def test_stream_on_recv(self):
         mkm = self._get_tcp_km()
@@ -13,7 +13,7 @@ import pytest
 from jupyter_core import paths
 from traitlets import Int, Unicode
 
-from jupyter_client.connect import KernelConnectionInfo
+from jupyter_client.connect import KernelConnectionInfo, port_names
 from jupyter_client.kernelspec import KernelSpecManager, NoSuchKernel
 from jupyter_client.launcher import launch_kernel
 from jupyter_client.manager import AsyncKernelManager
@@ -257,6 +257,45 @@ class TestDiscovery:
         kernel = ksm.get_kernel_spec("new_provisioner")
         assert kernel.metadata["kernel_provisioner"]["provisioner_name"] == "new-test-provisioner"
 
+    def test_entry_point_cache(self, monkeypatch):
+        calls = []
+
+        def get_all_provisioners():
+            calls.append("all")
+            return mock_get_all_provisioners()
+
+        def get_provisioner(_, name):
+            calls.append(name)
+            return mock_get_provisioner(_, name)
+
+        monkeypatch.setattr(KernelProvisionerFactory, "_get_all_provisioners", get_all_provisioners)
+        monkeypatch.setattr(KernelProvisionerFactory, "_get_provisioner", get_provisioner)
+        KernelProvisionerFactory()
+        # found in the cache file by later instances
+        factory = KernelProvisionerFactory()
+        assert calls == ["all"]
+        assert set(initial_provisioner_map) <= set(factory.get_provisioner_entries())
+
+        # missing provisioners are looked up once
+        assert not factory._check_availability("missing-provisioner")
+        assert not factory._check_availability("missing-provisioner")
+        assert calls == ["all", "missing-provisioner"]
+
+        # until the environment changes
+        monkeypatch.setattr(sys, "path", [*sys.path, "changed"])
+        assert not factory._check_availability("missing-provisioner")
+        assert calls == ["all", "missing-provisioner", "missing-provisioner"]
+        KernelProvisionerFactory()
+        assert calls[-1] == "all"
+
+    def test_entry_point_cache_file(self, monkeypatch):
+        cache_file = KernelProvisionerFactory().entry_point_cache_file
+        assert os.path.dirname(cache_file) == paths.jupyter_data_dir()
+        assert KernelProvisionerFactory().entry_point_cache_file == cache_file
+        # environments sharing the Jupyter data directory have their own file
+        monkeypatch.setattr(sys, "prefix", pjoin(sys.prefix, "other-env"))
+        assert KernelProvisionerFactory().entry_point_cache_file != cache_file
+
 
 class TestRuntime:
     async def akm_test(self, kernel_mgr):
@@ -314,6 +353,70 @@ class TestRuntime:
         assert is_alive is False
         assert async_km.context.closed
 
+    async def test_handshake(self):
+        kernel_dir = pjoin(paths.jupyter_data_dir(), "kernels", "handshake")
+        os.makedirs(kernel_dir)
+        with open(pjoin(kernel_dir, "kernel.json"), "w") as f:
+            spec = {
+                "argv": [sys.executable, "-m", "tests.handshakekernel", "-f", "{connection_file}"],
+                "display_name": "Handshake Test Kernel",
+                "metadata": {
+                    "kernel_provisioner": {
+                        "provisioner_name": "local-provisioner",
+                        "config": {"handshake": True},
+                    }
+                },
+            }
+            f.write(json.dumps(spec))
+        async_km = AsyncKernelManager(kernel_name="handshake")
+        await async_km.start_kernel(stdout=PIPE, stderr=PIPE)
+        try:
+            for newports in (False, True):
+                info = async_km.get_connection_info()
+                assert all(info[name] > 0 for name in port_names)
+                with open(async_km.connection_file) as f:
+                    file_info = json.load(f)
+                assert "registration_port" not in file_info
+                assert {name: file_info[name] for name in port_names} == {
+                    name: info[name] for name in port_names
+                }
+                kc = async_km.client()
+                kc.start_channels()
+                await kc.wait_for_ready(timeout=60)
+                kc.stop_channels()
+                await async_km.restart_kernel(now=True, newports=newports)
+                assert async_km.provisioner._registration_socket is None
+        finally:
+            await async_km.shutdown_kernel(now=True)
+
+    async def test_handshake_timeout(self):
+        kernel_dir = pjoin(paths.jupyter_data_dir(), "kernels", "silent")
+        os.makedirs(kernel_dir)
+        with open(pjoin(kernel_dir, "kernel.json"), "w") as f:
+            spec = {
+                "argv": [sys.executable, "-c", "import time; time.sleep(60)"],
+                "display_name": "Silent Test Kernel",
+                "metadata": {
+                    "kernel_provisioner": {
+                        "provisioner_name": "local-provisioner",
+                        "config": {"handshake": True, "handshake_timeout": 0.5},
+                    }
+                },
+            }
+            f.write(json.dumps(spec))
+        async_km = AsyncKernelManager(kernel_name="silent")
+        with pytest.raises(TimeoutError):
+            await async_km.start_kernel()
+        provisioner = async_km.provisioner
+        assert provisioner is not None
+        # the kernel that never reported its ports was killed and reaped
+        assert provisioner.process is None
+        assert provisioner._registration_socket is None
+        if sys.platform != "win32":
+            with pytest.raises(ProcessLookupError):
+                os.kill(provisioner.pid, 0)
+        await async_km.cleanup_resources()
+
     @staticmethod
     def validate_provisioner(akm: AsyncKernelManager) -> None:
         # Ensure the provisioner is managing a process at this point
@@ -6,13 +6,21 @@ import json
 import os
 import sys
 from concurrent.futures import Future
+from unittest import mock
 
 import pytest
 from jupyter_core import paths
+from tornado.ioloop import IOLoop
 from traitlets.config.loader import Config
 from traitlets.log import get_logger
 
-from jupyter_client.ioloop import AsyncIOLoopKernelManager, IOLoopKernelManager
+from jupyter_client.ioloop import (
+    AsyncIOLoopKernelManager,
+    AsyncIOLoopKernelRestarter,
+    IOLoopKernelManager,
+    IOLoopKernelRestarter,
+)
+from jupyter_client.manager import KernelManager
 
 pjoin = os.path.join
 
@@ -283,3 +291,80 @@ async def test_async_restarter_gives_up(config, install_slow_fail_kernel, debug_
     finally:
         await km.shutdown_kernel(now=True)
         assert km.context.closed
+
+
+@pytest.mark.skipif(not hasattr(os, "pidfd_open"), reason="requires pidfd")
+async def test_async_restart_on_exit(config, install_kernel, debug_logging):
+    """Test that the kernel is restarted as soon as it dies, without polling"""
+    config.KernelRestarter.time_to_dead = 30.0
+    km = AsyncIOLoopKernelManager(kernel_name=install_kernel, config=config)
+    restarted: asyncio.Future = asyncio.Future()
+
+    def cb():
+        restarted.set_result(True)
+
+    try:
+        await km.start_kernel()
+        km.add_restart_callback(cb, "restart")
+    except BaseException:
+        if km.has_kernel:
+            await km.shutdown_kernel()
+        raise
+
+    try:
+        restarter = km._restarter
+        if restarter._exit_fd is None:
+            pytest.skip("pidfd not supported by the running kernel")
+        assert restarter._pcallback is None
+        # Kill without cleanup to simulate crash:
+        assert km.provisioner is not None
+        await km.provisioner.kill()
+        # well before the first poll would happen
+        await asyncio.wait_for(restarted, 10)
+        max_wait = 10.0
+        waited = 0.0
+        while waited < max_wait and not await km.is_alive():
+            await asyncio.sleep(0.1)
+            waited += 0.1
+        assert await km.is_alive()
+        # the restarted kernel is watched too
+        assert restarter._exit_fd is not None
+        assert restarter._pcallback is None
+
+        restarter.stop()
+        restarter.exit_notification = False
+        restarter.start()
+        assert restarter._exit_fd is None
+        assert restarter._pcallback is not None
+    finally:
+        await km.shutdown_kernel(now=True)
+        assert km.context.closed
+
+
+def test_restarter_exit_notification_default():
+    assert AsyncIOLoopKernelRestarter().exit_notification
+    assert not IOLoopKernelRestarter().exit_notification
+
+
+async def test_restarter_replaces_stable_timeout():
+    r, w = os.pipe()
+    km = KernelManager()
+    km.provisioner = mock.Mock()
+    km.provisioner.get_exit_fd.side_effect = lambda: os.dup(r)
+    km.provisioner.get_stable_start_time.return_value = 10.0
+    loop = IOLoop.current()
+    restarter = AsyncIOLoopKernelRestarter(kernel_manager=km, loop=loop)
+    with mock.patch.object(loop, "remove_timeout", wraps=loop.remove_timeout) as remove_timeout:
+        restarter.start()
+        assert restarter._exit_fd is not None
+        # the kernel exits, and is started again before the poll runs
+        restarter._on_exit(restarter._exit_fd, IOLoop.READ)
+        pending = restarter._stable_timeout
+        restarter.start()
+        remove_timeout.assert_called_with(pending)
+        assert restarter._stable_timeout is not pending
+        restarter.stop()
+    assert restarter._stable_timeout is None
+    assert restarter._exit_fd is None
+    os.close(r)
+    os.close(w)
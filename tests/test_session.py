@@ -1,10 +1,13 @@
 """test building messages with Session"""
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
+import hashlib
 import hmac
 import math
 import os
 import platform
+import threading
+import tracemalloc
 import uuid
 import warnings
 from datetime import datetime
@@ -18,6 +21,8 @@ from zmq.eventloop.zmqstream import ZMQStream
 
 from jupyter_client import jsonutil
 from jupyter_client import session as ss
+from jupyter_client.channels import ZMQSocketChannel
+from jupyter_client.threaded import IOLoopThread, ThreadedZMQSocketChannel
 
 
 def _bad_packer(obj):
@@ -350,16 +355,25 @@ class TestSession:
 
     def test_cull_digest_history(self):
         session = ss.Session(digest_history_size=100)
-        for i in range(100):
-            session._add_digest(uuid.uuid4().bytes)
+        digests = [uuid.uuid4().bytes for i in range(110)]
+        for digest in digests[:100]:
+            session._add_digest(digest)
         self.assertTrue(len(session.digest_history) == 100)
-        session._add_digest(uuid.uuid4().bytes)
-        self.assertTrue(len(session.digest_history) == 91)
-        for i in range(9):
-            session._add_digest(uuid.uuid4().bytes)
+        session._add_digest(digests[100])
+        self.assertTrue(len(session.digest_history) == 100)
+        # the oldest digest is forgotten first
+        assert digests[0] not in session.digest_history
+        assert digests[1] in session.digest_history
+        for digest in digests[101:]:
+            session._add_digest(digest)
         self.assertTrue(len(session.digest_history) == 100)
+        assert session.digest_history == set(digests[10:])
+
+    def test_cull_modified_digest_history(self):
+        session = ss.Session(digest_history_size=10)
+        session.digest_history.update(uuid.uuid4().bytes for i in range(20))
         session._add_digest(uuid.uuid4().bytes)
-        self.assertTrue(len(session.digest_history) == 91)
+        self.assertTrue(len(session.digest_history) == 10)
 
     def assertIn(self, a, b):
         assert a in b
@@ -537,3 +551,421 @@ def test_session_factory():
     s = ss.SessionFactory()
     s.log.info(str(s.context))
     s.context.destroy()
+
+
+# messages covering the json_default cases: datetimes, bytes, sets, numbers, unicode
+_packer_test_objects = [
+    {},
+    {"a": [1, "hi"], "b": None, "c": True, "d": 1.5, "e": -3},
+    {"date": datetime(2021, 4, 1, 12, 30, 15, 123456, tzinfo=ss.utc)},
+    {"date": datetime(2021, 4, 1, 12, tzinfo=tzlocal())},
+    {"data": b"\x00\x01binary", "items": {1, 2, 3}, "tuple": (1, "two")},
+    {"text": "unicode: é ü 中文 🎉", "nested": {"list": [{"x": [1.25, {"y": "z"}]}]}},
+    {1: "non-str key"},
+    {"surrogate": "\udce9"},
+]
+
+
+@pytest.mark.parametrize("backend", ["orjson", "msgspec"])
+@pytest.mark.parametrize("obj", _packer_test_objects)
+def test_fast_packer_equivalence(backend, obj):
+    pytest.importorskip(backend)
+    pack, unpack = ss.select_packer_backend(backend)
+    expected = ss.json_packer(obj)
+    packed = pack(obj)
+    assert isinstance(packed, bytes)
+    # both packers' output must decode to the same object with either unpacker
+    assert unpack(packed) == ss.json_unpacker(expected)
+    assert ss.json_unpacker(packed) == unpack(expected)
+
+
+@pytest.mark.parametrize("backend", ["orjson", "msgspec"])
+@pytest.mark.parametrize(
+    "obj", [{"a": math.nan}, {"a": [1.0, math.inf]}, {"a": {"b": -math.inf}, "c": None}]
+)
+def test_fast_packer_nonfinite(backend, obj):
+    pytest.importorskip(backend)
+    pack, unpack = ss.select_packer_backend(backend)
+    with pytest.warns(UserWarning):
+        expected = ss.json_packer(obj)
+    with pytest.warns(UserWarning):
+        packed = pack(obj)
+    # nan and inf aren't turned into null
+    assert packed == expected
+    assert unpack(packed) == ss.json_unpacker(expected)
+
+
+@pytest.mark.parametrize("backend", ["orjson", "msgspec"])
+def test_fast_packer_wire_compat(backend):
+    pytest.importorskip(backend)
+    key = b"secret"
+    fast = ss.Session(key=key, packer=backend)
+    std = ss.Session(key=key)
+    assert fast.unpacker == backend
+    content = {"data": {"text/plain": "hi"}, "t": ss.utcnow()}
+    for sender, receiver in [(fast, std), (std, fast)]:
+        msg = sender.msg("display_data", content=content)
+        msg_list = sender.serialize(msg)
+        new_msg = receiver.deserialize(receiver.feed_identities(msg_list)[1])
+        assert new_msg["header"] == msg["header"]
+        assert new_msg["content"] == ss.json_unpacker(ss.json_packer(content))
+
+
+def test_auto_packer():
+    session = ss.Session(packer="auto")
+    available = ss.available_packer_backends()
+    assert "json" in available
+    for name in ("orjson", "msgspec", "json"):
+        if name in available:
+            break
+    assert session.pack is ss.packer_backends[name][1]
+    assert session.unpack is ss.packer_backends[name][2]
+
+
+def test_missing_packer_backend():
+    with mock.patch.dict(ss.packer_backends, {"orjson": (None, ss.json_packer, ss.json_unpacker)}):
+        assert "orjson" not in ss.available_packer_backends()
+        with pytest.raises(ImportError):
+            ss.Session(packer="orjson")
+
+
+def test_lazy_deserialize():
+    session = ss.Session(digest_history_size=0)
+    parent = session.msg("execute_request")
+    msg = session.msg("display_data", content={"data": {"text/plain": "x" * 1000}}, parent=parent)
+    msg_list = session.feed_identities(session.serialize(msg))[1]
+    expected = session.deserialize(msg_list)
+
+    unpacked = []
+    unpack = session.unpack
+    session.unpack = lambda s: unpacked.append(s) or unpack(s)
+    lazy = session.deserialize(msg_list, lazy=True)
+    assert isinstance(lazy, ss.LazyMessage)
+    # only the header has been unpacked
+    assert unpacked == [msg_list[1]]
+    assert lazy["msg_type"] == "display_data"
+    assert set(lazy) == set(expected)
+    assert not lazy.is_unpacked("content")
+
+    assert lazy["parent_header"]["msg_id"] == parent["header"]["msg_id"]
+    assert lazy["parent_header"] == expected["parent_header"]
+    assert lazy.is_unpacked("parent_header")
+    assert not lazy.is_unpacked("content")
+    assert len(unpacked) == 2
+
+    assert lazy["content"] == expected["content"]
+    lazy["content"]
+    assert len(unpacked) == 3
+    assert lazy == expected
+    assert lazy.copy() == expected
+
+
+def test_lazy_deserialize_no_content():
+    session = ss.Session()
+    msg = session.msg("execute_request", content={"code": "1"})
+    msg_list = session.feed_identities(session.serialize(msg))[1]
+    lazy = session.deserialize(msg_list, content=False, lazy=True)
+    assert lazy["content"] == msg_list[4]
+
+
+def test_lazy_relay():
+    session = ss.Session(digest_history_size=0)
+    msg = session.msg("display_data", content={"data": {"text/plain": "hi"}})
+    msg_list = session.feed_identities(session.serialize(msg))[1]
+    lazy = session.deserialize(msg_list, lazy=True)
+    relayed = session.serialize(lazy)
+    # content is forwarded without being unpacked
+    assert not lazy.is_unpacked("content")
+    assert relayed[-1] == msg_list[4]
+    new_msg = session.deserialize(session.feed_identities(relayed)[1])
+    assert new_msg["content"] == msg["content"]
+
+
+_hmac_digests = sorted(
+    name
+    for name in hashlib.algorithms_guaranteed
+    # shake digests need a length, they can't be used for HMAC
+    if not name.startswith("shake_")
+)
+
+
+@pytest.mark.parametrize("hash_name", _hmac_digests)
+@pytest.mark.parametrize("key", [b"", b"secret", b"k" * 200])
+def test_hmac_signer(hash_name, key):
+    digest_mod = getattr(hashlib, hash_name)
+    parts = [b"header", b"", b"metadata", b"x" * 100_000]
+    expected = hmac.HMAC(key, digestmod=digest_mod)
+    for part in parts:
+        expected.update(part)
+    signer = ss.HMACSigner(key, digest_mod)
+    assert signer.sign(parts) == expected.hexdigest().encode()
+    # zero-copy frames are signed without converting them to bytes
+    frames = [zmq.Frame(part) for part in parts]
+    assert signer.sign(frames) == expected.hexdigest().encode()
+
+
+@pytest.mark.parametrize("hash_name", _hmac_digests)
+def test_signature_scheme(hash_name):
+    key = b"secret"
+    session = ss.Session(key=key, signature_scheme=f"hmac-{hash_name}")
+    msg = session.msg("execute_request", content={"code": "1"})
+    msg_list = session.serialize(msg)
+    expected = hmac.HMAC(key, digestmod=getattr(hashlib, hash_name))
+    for part in msg_list[2:6]:
+        expected.update(part)
+    assert msg_list[1] == expected.hexdigest().encode()
+    new_msg = session.deserialize(session.feed_identities(msg_list)[1])
+    assert new_msg["content"] == msg["content"]
+
+
+def test_sign_with_assigned_auth():
+    key = b"secret"
+    session = ss.Session(key=b"other")
+    # an auth assigned directly, without key, still signs and checks messages
+    session.auth = hmac.HMAC(key, digestmod=hashlib.sha256)
+    msg = session.msg("execute_request", content={"code": "1"})
+    msg_list = session.serialize(msg)
+    expected = hmac.HMAC(key, digestmod=hashlib.sha256)
+    for part in msg_list[2:6]:
+        expected.update(part)
+    assert msg_list[1] == expected.hexdigest().encode()
+    new_msg = session.deserialize(session.feed_identities(msg_list)[1])
+    assert new_msg["content"] == msg["content"]
+    # setting key again goes back to signing with key
+    session.key = key
+    assert session.sign(msg_list[2:6]) == expected.hexdigest().encode()
+    session.auth = None
+    assert session.sign(msg_list[2:6]) == b""
+
+
+def test_digest_history_cap():
+    session = ss.Session(key=b"secret", digest_history_size=100)
+    signatures = [b"%064x" % i for i in range(250)]
+    for signature in signatures:
+        session._add_digest(signature)
+        assert len(session.digest_history) <= 100
+        assert set(session._digest_order) == session.digest_history
+    # the oldest digests are forgotten first
+    assert session.digest_history == set(signatures[-100:])
+    assert list(session._digest_order) == signatures[-100:]
+    # a digest already in the history doesn't move
+    session._add_digest(signatures[-100])
+    assert session._digest_order[0] == signatures[-100]
+    session._add_digest(b"%064x" % 250)
+    assert signatures[-100] not in session.digest_history
+    assert len(session._digest_order) == len(session.digest_history) == 100
+
+
+def test_receive_signed_stress():
+    session = ss.Session(key=b"secret", digest_history_size=1000)
+    n = 20_000
+    msg_lists = []
+    for i in range(n):
+        msg = session.msg("stream", content={"name": "stdout", "text": str(i)})
+        msg_lists.append(session.serialize(msg)[1:])
+    for msg_list in msg_lists:
+        session.deserialize(msg_list)
+    assert len(session.digest_history) == 1000
+    with pytest.raises(ValueError, match="Duplicate Signature"):
+        session.deserialize(msg_lists[-1])
+
+
+@pytest.mark.parametrize("packer", ["json", "pickle", __name__ + "._bytes_json_packer"])
+def test_deserialize_zero_copy(packer):
+    ctx = zmq.Context()
+    A = ctx.socket(zmq.PAIR)
+    B = ctx.socket(zmq.PAIR)
+    A.bind("inproc://zero-copy")
+    B.connect("inproc://zero-copy")
+    session = ss.Session(packer=packer, unpacker=packer.replace("packer", "unpacker"))
+    buf = os.urandom(1024)
+    msg = session.send(A, "comm_msg", content={"data": {"a": 1}}, buffers=[buf], ident=b"id")
+    assert msg is not None
+    frames = B.recv_multipart(copy=False)
+    idents, frames = session.feed_identities(frames, copy=False)
+    assert idents == [b"id"]
+    new_msg = session.deserialize(frames, copy=False)
+    assert new_msg["header"] == msg["header"]
+    assert new_msg["content"] == msg["content"]
+    assert new_msg["buffers"][0] == buf
+    # the buffer is a view of the received frame, not a copy
+    assert new_msg["buffers"][0].obj is frames[5]
+    A.close()
+    B.close()
+    ctx.term()
+
+
+def _bytes_json_packer(obj):
+    return ss.json_packer(obj)
+
+
+def _bytes_json_unpacker(s):
+    # custom unpackers only have to handle bytes
+    assert isinstance(s, bytes)
+    return ss.json_unpacker(s)
+
+
+def test_zero_copy_channel():
+    ctx = zmq.Context()
+    A = ctx.socket(zmq.PAIR)
+    B = ctx.socket(zmq.PAIR)
+    A.bind("inproc://zero-copy-channel")
+    B.connect("inproc://zero-copy-channel")
+    session = ss.Session(zero_copy_recv=True)
+    channel = ZMQSocketChannel(B, session)
+    session.send(A, "comm_msg", content={"data": {}}, buffers=[b"x" * 100])
+    msg = channel.get_msg(timeout=5)
+    assert isinstance(msg["buffers"][0].obj, zmq.Frame)
+    channel.close()
+    A.close()
+    ctx.term()
+
+
+@pytest.mark.parametrize("copy", [True, False])
+def test_deserialize_large_buffer_memory(copy):
+    size = 100 * 1024 * 1024
+    ctx = zmq.Context()
+    A = ctx.socket(zmq.PAIR)
+    B = ctx.socket(zmq.PAIR)
+    A.bind("inproc://large-buffer")
+    B.connect("inproc://large-buffer")
+    session = ss.Session()
+    session.send(A, "comm_msg", content={"data": {}}, buffers=[bytearray(size)])
+    tracemalloc.start()
+    try:
+        frames = B.recv_multipart(copy=copy)
+        _, frames = session.feed_identities(frames, copy=copy)
+        msg = session.deserialize(frames, copy=copy)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(msg["buffers"][0]) == size
+    if copy:
+        assert peak >= size
+    else:
+        assert peak < size // 100
+    del msg, frames
+    A.close()
+    B.close()
+    ctx.term()
+
+
+@pytest.mark.parametrize("packer", ["json", "pickle", "orjson"])
+def test_message_template(packer):
+    if packer == "orjson":
+        pytest.importorskip("orjson")
+    ctx = zmq.Context()
+    A = ctx.socket(zmq.PAIR)
+    B = ctx.socket(zmq.PAIR)
+    A.bind("inproc://template")
+    B.connect("inproc://template")
+    session = ss.Session(packer=packer, metadata={"a": 1})
+    parent = session.msg("execute_request")
+    template = session.message_template("stream", parent=parent, metadata={"b": 2})
+    assert (template._header_parts is not None) == (packer != "pickle")
+    msg_ids = []
+    for text in ("hello", "world"):
+        content = {"name": "stdout", "text": text}
+        msg_ids.append(template.send(A, content, buffers=[b"buf"], ident=b"id"))
+        idents, new_msg = session.recv(B, mode=0)
+        assert idents == [b"id"]
+        expected = session.msg("stream", content=content, parent=parent, metadata={"b": 2})
+        assert new_msg["msg_id"] == msg_ids[-1]
+        assert new_msg["msg_type"] == "stream"
+        header = new_msg["header"]
+        assert isinstance(header["date"], datetime)
+        assert header["date"].tzinfo is not None
+        for key in ("msg_type", "username", "session", "version"):
+            assert header[key] == expected["header"][key]
+        assert new_msg["parent_header"] == jsonutil.extract_dates(expected["parent_header"])
+        assert new_msg["metadata"] == {"a": 1, "b": 2}
+        assert new_msg["content"] == content
+        assert new_msg["buffers"][0].tobytes() == b"buf"
+    # msg_ids are shared with the Session's msg_id sequence
+    assert len(set(msg_ids)) == 2
+    assert session.msg_id not in msg_ids
+    A.close()
+    B.close()
+    ctx.term()
+
+
+@pytest.mark.parametrize("content", [{"name": "stdout", "text": "hi"}, b'{"name": "stdout"}', None])
+def test_message_template_adapt_version(content):
+    ctx = zmq.Context()
+    A = ctx.socket(zmq.PAIR)
+    B = ctx.socket(zmq.PAIR)
+    A.bind("inproc://template-adapt")
+    B.connect("inproc://template-adapt")
+    session = ss.Session(adapt_version=5)
+    template = session.message_template("stream", parent=session.msg("execute_request"))
+    msg_id = template.send(A, content)
+    _, new_msg = session.recv(B, mode=0, content=False)
+    assert new_msg["msg_id"] == msg_id
+    if isinstance(content, bytes):
+        # already packed content is sent as-is, as with Session.send
+        assert new_msg["content"] == content
+    else:
+        assert session.unpack(new_msg["content"]) == (content or {})
+    A.close()
+    B.close()
+    ctx.term()
+
+
+def test_send_many():
+    ctx = zmq.Context()
+    A = ctx.socket(zmq.PAIR)
+    B = ctx.socket(zmq.PAIR)
+    A.bind("inproc://send-many")
+    B.connect("inproc://send-many")
+    session = ss.Session()
+    msgs = [session.msg("stream", content={"text": str(i)}) for i in range(10)]
+    msgs[3]["buffers"] = [b"buf"]
+    sent = session.send_many(A, msgs, ident=b"id")
+    assert sent == msgs
+    for msg in msgs:
+        idents, new_msg = session.recv(B, mode=0)
+        assert idents == [b"id"]
+        assert new_msg["msg_id"] == msg["msg_id"]
+        assert new_msg["content"] == msg["content"]
+        assert msg["tracker"] is ss.DONE
+    assert new_msg["content"] == {"text": "9"}
+    assert len(session.digest_history) == 10
+    assert not B.poll(0)
+
+    with pytest.raises(TypeError):
+        session.send_many(A, [session.msg("stream", content={}) | {"buffers": [1]}])
+    A.close()
+    B.close()
+    ctx.term()
+
+
+def test_threaded_send_many():
+    ctx = zmq.Context()
+    A = ctx.socket(zmq.PAIR)
+    B = ctx.socket(zmq.PAIR)
+    A.bind("inproc://threaded-send-many")
+    B.connect("inproc://threaded-send-many")
+    thread = IOLoopThread()
+    thread.start()
+    session = ss.Session()
+    channel = ThreadedZMQSocketChannel(A, session, thread.ioloop)
+    msgs = [session.msg("stream", content={"text": str(i)}) for i in range(100)]
+    add_callback = thread.ioloop.add_callback
+    callers = []
+
+    def counting_add_callback(*args, **kwargs):
+        callers.append(threading.get_ident())
+        return add_callback(*args, **kwargs)
+
+    with mock.patch.object(thread.ioloop, "add_callback", counting_add_callback):
+        channel.send(msgs)
+        # only one callback is scheduled from the sending thread
+        assert callers.count(threading.get_ident()) == 1
+    for msg in msgs:
+        assert B.poll(5000)
+        _, new_msg = session.recv(B, mode=0)
+        assert new_msg["msg_id"] == msg["msg_id"]
+    channel.close()
+    thread.stop()
+    B.close()
+    ctx.term()